@@ -1,29 +1,15 @@
 import asyncio
-import os
-from agents import Agent, ItemHelpers, MessageOutputItem, OpenAIChatCompletionsModel, RunConfig, Runner, trace
-from dotenv import load_dotenv
-from openai import AsyncOpenAI
-load_dotenv()
-
-gemini_api = os.getenv('GEMINI_API_KEY')
-if not gemini_api:
-    raise ValueError("api key not set")
-
-external_client = AsyncOpenAI(
-    api_key=gemini_api,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
+import sys
+from agents import Agent, ItemHelpers, MessageOutputItem, Runner, TResponseInputItem, trace
+from response_cache import CachedModel
+from fan_out import fan_out
+from provider import get_model, get_run_config
 
-model= OpenAIChatCompletionsModel(
-    openai_client=external_client,
-    model="gemini-2.0-flash"
-)
+model = get_model("gemini-2.0-flash")
+# translators see the same prompts over and over, serve repeats from memory
+cached_model = CachedModel(model)
 
-config=RunConfig(
-    model=model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
+config = get_run_config(model, tracing_disabled=True)
 """
 This example shows the agents-as-tools pattern. The frontline agent receives a user message and
 then picks which agents to call, as tools. In this case, it picks from a set of translation
@@ -34,14 +20,14 @@ spanish_agent = Agent(
     name="spanish_agent",
     instructions="You translate the user's message to Spanish",
     handoff_description="An english to spanish translator",
-    model=model
+    model=cached_model
 )
 
 french_agent = Agent(
     name="french_agent",
     instructions="You translate the user's message to French",
     handoff_description="An english to french translator",
-    model=model
+    model=cached_model
 
 )
 
@@ -49,7 +35,7 @@ italian_agent = Agent(
     name="italian_agent",
     instructions="You translate the user's message to Italian",
     handoff_description="An english to italian translator",
-    model=model
+    model=cached_model
 
 )
 
@@ -85,8 +71,49 @@ synthesizer_agent = Agent(
 )
 
 
-async def main():
-    msg = input("Hi! What would you like translated, and to which languages? ")
+translators = {
+    "spanish": spanish_agent,
+    "french": french_agent,
+    "italian": italian_agent,
+}
+
+
+def requested_translators(msg: str) -> dict[str, Agent]:
+    """Translators whose language is named in the message, e.g. "to Spanish and French"."""
+    lowered = msg.lower()
+    return {language: agent for language, agent in translators.items() if language in lowered}
+
+
+async def fan_out_translations(
+    msg: str,
+    selected: dict[str, Agent],
+    max_concurrency: int = 3,
+    timeout: float | None = 60.0,
+) -> str:
+    """
+    Fan-out mode: run the selected translators concurrently instead of letting the
+    orchestrator call them one per turn. Each translation is appended to the
+    synthesizer input as soon as it finishes, so the total wait is close to the
+    slowest translator rather than the sum of all of them.
+    """
+    synthesizer_input: list[TResponseInputItem] = []
+    branches = {language: (agent, msg) for language, agent in selected.items()}
+    async for branch in fan_out(branches, max_concurrency=max_concurrency, timeout=timeout):
+        if not branch.ok:
+            print(f"  - {branch.name} translation failed: {branch.error!r}")
+            continue
+        print(f"  - Translation step ({branch.name}, {branch.elapsed:.2f}s): {branch.output}")
+        synthesizer_input.append({"content": f"{branch.name}: {branch.output}", "role": "user"})
+
+    synthesizer_result = await Runner.run(synthesizer_agent, synthesizer_input)
+    return synthesizer_result.final_output
+
+
+async def translate(msg: str, fan_out_mode: bool = False) -> str:
+    selected = requested_translators(msg) if fan_out_mode else {}
+    if selected:
+        with trace("Orchestrator fan-out"):
+            return await fan_out_translations(msg, selected)
 
     # Run the entire orchestration in a single trace
     with trace("Orchestrator evaluator"):
@@ -108,10 +135,15 @@ async def main():
             synthesizer_agent,
             translations_text
         )
+    return synthesizer_result.final_output
 
 
-    print(f"\n\nFinal response:\n{synthesizer_result.final_output}")
+async def main(fan_out_mode: bool = False):
+    msg = input("Hi! What would you like translated, and to which languages? ")
+    final_output = await translate(msg, fan_out_mode)
+    print(f"\n\nFinal response:\n{final_output}")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    # python agent_as_tool.py --fan-out  runs the named translators concurrently
+    asyncio.run(main(fan_out_mode="--fan-out" in sys.argv))
\ No newline at end of file
@@ -0,0 +1,98 @@
+"""
+First-token latency: one client per call (the old per-script setup) vs the shared pooled client.
+
+The stub server sleeps `--handshake-ms` on every new connection to stand in for
+TCP+TLS setup, so a fresh client pays it on every call while the pool pays it once
+per connection.
+
+    python -m benchmarks.client_pool --requests 200 --concurrency 8
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from agents import AsyncOpenAI
+
+import provider
+from benchmarks.stub_server import StubServer
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def first_token(client: AsyncOpenAI) -> float:
+    start = time.perf_counter()
+    stream = await client.chat.completions.create(
+        model="stub",
+        messages=[{"role": "user", "content": "hi"}],
+        stream=True,
+    )
+    elapsed = None
+    async for chunk in stream:
+        if elapsed is None and chunk.choices and chunk.choices[0].delta.content:
+            elapsed = time.perf_counter() - start
+    return elapsed if elapsed is not None else time.perf_counter() - start
+
+
+async def run_fresh(base_url: str, requests: int, concurrency: int) -> list[float]:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one() -> float:
+        async with sem:
+            client = AsyncOpenAI(api_key="stub", base_url=base_url)
+            try:
+                return await first_token(client)
+            finally:
+                await client.close()
+
+    return await asyncio.gather(*(one() for _ in range(requests)))
+
+
+async def run_pooled(base_url: str, requests: int, concurrency: int, warm: bool) -> list[float]:
+    client = provider.get_client(base_url, "stub")
+    if warm:
+        await provider.warm_up(client, connections=concurrency)
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one() -> float:
+        async with sem:
+            return await first_token(client)
+
+    try:
+        return await asyncio.gather(*(one() for _ in range(requests)))
+    finally:
+        await provider.aclose_clients()
+
+
+def report(name: str, latencies: list[float], connections: int) -> None:
+    ms = [x * 1000 for x in latencies]
+    print(
+        f"{name:<16} p50={statistics.median(ms):7.2f}ms  p99={percentile(ms, 99):7.2f}ms  "
+        f"max={max(ms):7.2f}ms  connections={connections}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--handshake-ms", type=float, default=30.0)
+    args = parser.parse_args()
+
+    scenarios = [
+        ("fresh client", lambda url: run_fresh(url, args.requests, args.concurrency)),
+        ("pooled", lambda url: run_pooled(url, args.requests, args.concurrency, warm=False)),
+        ("pooled + warm", lambda url: run_pooled(url, args.requests, args.concurrency, warm=True)),
+    ]
+    for name, scenario in scenarios:
+        with StubServer(handshake_delay=args.handshake_ms / 1000) as server:
+            latencies = asyncio.run(scenario(server.base_url))
+            report(name, latencies, server.connections)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Downloading many large files from a local Range-capable server: image_gen.py's
+old per-call requests.get with 1 KiB chunks vs downloader.download (shared
+pool, adaptive chunks) sequentially and in parallel, plus a resume after the
+server hangs up halfway through every file.
+
+`--handshake-ms` is slept per new connection to stand in for TCP+TLS setup and
+`--mbps` caps each connection's bandwidth, as a remote CDN would.
+
+    python -m benchmarks.downloader --files 16 --size-mb 8
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import requests
+
+from benchmarks.stub_server import FileServer
+from downloader import DownloadResult, download, download_many
+
+
+def legacy_download(url: str, filename: str) -> None:
+    resp = requests.get(url, stream=True, timeout=30)
+    resp.raise_for_status()
+    with open(filename, "wb") as f:
+        for chunk in resp.iter_content(1024):
+            f.write(chunk)
+
+
+def main(files: int, size_mb: int, handshake_ms: float, mbps: float, workers: int) -> None:
+    with tempfile.TemporaryDirectory() as src, tempfile.TemporaryDirectory() as dst:
+        names = [f"image{i}.bin" for i in range(files)]
+        for name in names:
+            with open(os.path.join(src, name), "wb") as f:
+                f.write(os.urandom(size_mb * 1024 * 1024))
+        total_mb = files * size_mb
+
+        def run(label: str, fn, drop_after: int = 0) -> FileServer:
+            for name in os.listdir(dst):
+                os.remove(os.path.join(dst, name))
+            with FileServer(src, handshake_delay=handshake_ms / 1000, drop_after=drop_after, bytes_per_second=mbps * 2**20) as server:
+                items = [(server.base_url + name, os.path.join(dst, name)) for name in names]
+                start = time.perf_counter()
+                results = [r for r in fn(items) if isinstance(r, DownloadResult)]
+                elapsed = time.perf_counter() - start
+            ok = all(os.path.getsize(path) == size_mb * 1024 * 1024 for _, path in items)
+            reported = f"  reported ok={sum(r.ok for r in results)}/{len(results)}" if results else ""
+            print(
+                f"{label:<28} {elapsed:6.2f}s  {total_mb / elapsed:7.1f} MB/s  connections={server.connections:<3} "
+                f"sent={server.bytes_sent / 2**20:7.1f}MB  complete={ok}{reported}"
+            )
+            return server
+
+        run("requests.get, 1KiB chunks", lambda items: [legacy_download(url, path) for url, path in items])
+        run("pooled session, sequential", lambda items: [download(url, path) for url, path in items])
+        run(f"pooled session, {workers} workers", lambda items: download_many(items, max_workers=workers))
+        run(
+            f"drop at 50%, {workers} workers",
+            lambda items: download_many(items, max_workers=workers),
+            drop_after=size_mb * 1024 * 1024 // 2,
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=16)
+    parser.add_argument("--size-mb", type=int, default=8)
+    parser.add_argument("--handshake-ms", type=float, default=30.0)
+    parser.add_argument("--mbps", type=float, default=100.0, help="MB/s per connection")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+    main(args.files, args.size_mb, args.handshake_ms, args.mbps, args.workers)
@@ -0,0 +1,83 @@
+"""
+Agents-as-tools translation: sequential orchestrator (one tool call per turn, as
+`orchestrator_agent` is instructed) vs fan-out mode, with fake models that inject
+per-call latency.
+
+    python -m benchmarks.fan_out --rounds 5
+"""
+import argparse
+import asyncio
+import time
+
+from agents import Agent, Runner, TResponseInputItem, set_tracing_disabled
+
+from fake_model import FakeModel, function_call
+from fan_out import fan_out
+
+set_tracing_disabled(True)
+
+LATENCIES = {"spanish": 0.30, "french": 0.45, "italian": 0.35}
+ORCHESTRATOR_LATENCY = 0.10
+SYNTHESIZER_LATENCY = 0.20
+MSG = "Translate 'good morning' to Spanish, French and Italian"
+
+
+def build_translators() -> dict[str, Agent]:
+    return {
+        language: Agent(name=f"{language}_agent", model=FakeModel(f"[{language}] good morning", latency=latency))
+        for language, latency in LATENCIES.items()
+    }
+
+
+async def sequential() -> str:
+    translators = build_translators()
+    # one tool call per orchestrator turn, then a final message
+    script = [[function_call(f"translate_to_{language}", {"input": MSG})] for language in translators]
+    orchestrator = Agent(
+        name="orchestrator_agent",
+        model=FakeModel(script + ["done"], latency=ORCHESTRATOR_LATENCY),
+        tools=[
+            agent.as_tool(tool_name=f"translate_to_{language}", tool_description=f"Translate to {language}")
+            for language, agent in translators.items()
+        ],
+    )
+    synthesizer = Agent(name="synthesizer_agent", model=FakeModel("final", latency=SYNTHESIZER_LATENCY))
+    orchestrator_result = await Runner.run(orchestrator, MSG)
+    result = await Runner.run(synthesizer, str(orchestrator_result.final_output))
+    return result.final_output
+
+
+async def fanned_out(max_concurrency: int) -> str:
+    translators = build_translators()
+    synthesizer = Agent(name="synthesizer_agent", model=FakeModel("final", latency=SYNTHESIZER_LATENCY))
+    synthesizer_input: list[TResponseInputItem] = []
+    branches = {language: (agent, MSG) for language, agent in translators.items()}
+    async for branch in fan_out(branches, max_concurrency=max_concurrency, timeout=5.0):
+        synthesizer_input.append({"content": f"{branch.name}: {branch.output}", "role": "user"})
+    result = await Runner.run(synthesizer, synthesizer_input)
+    return result.final_output
+
+
+async def timed(make_run, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await make_run()
+    return (time.perf_counter() - start) / rounds
+
+
+async def main(rounds: int) -> None:
+    translators = sum(LATENCIES.values())
+    slowest = max(LATENCIES.values())
+    print(f"translator latencies: {LATENCIES} (sum={translators:.2f}s, slowest={slowest:.2f}s)")
+    seq = await timed(sequential, rounds)
+    print(f"sequential orchestrator      {seq:6.3f}s/request")
+    for cap in (1, 2, 3):
+        par = await timed(lambda: fanned_out(cap), rounds)
+        print(f"fan-out (max_concurrency={cap})  {par:6.3f}s/request  speedup x{seq / par:.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.rounds))
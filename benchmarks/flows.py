@@ -0,0 +1,134 @@
+"""
+Per-request overhead of `pro_1 serve` against starting a script per request.
+Both sides run the same flow on the offline FakeModel (MODEL_BACKEND=fake), so
+what is measured is start-up, imports and agent construction versus one JSONL
+round trip over a Unix socket to a warm daemon. Then a burst of concurrent
+requests to the daemon, one event loop serving all of them.
+
+    python -m benchmarks.flows --spawns 5 --requests 200 --concurrency 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def environment(latency: float) -> dict[str, str]:
+    env = dict(os.environ, MODEL_BACKEND="fake", FAKE_MODEL_LATENCY=str(latency), FAKE_MODEL_TEXT="ok")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT), env.get("PYTHONPATH")]))
+    return env
+
+
+def spawned(flow: str, text: str, runs: int, env: dict[str, str]) -> list[float]:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, str(ROOT / "flows.py"), "run", flow, text],
+            env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def start_daemon(path: str, env: dict[str, str]) -> asyncio.subprocess.Process:
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, str(ROOT / "flows.py"), "serve", "--socket", path,
+        env=env, stderr=asyncio.subprocess.PIPE,
+    )
+    while True:  # "serving ..." is printed once the flows are preloaded and the socket is up
+        line = await process.stderr.readline()
+        if not line:
+            raise RuntimeError("the daemon exited before serving")
+        if line.startswith(b"serving"):
+            break
+    asyncio.create_task(process.stderr.read())  # keep draining what the flows print
+    return process
+
+
+async def sequential(path: str, flow: str, text: str, requests: int) -> list[float]:
+    reader, writer = await asyncio.open_unix_connection(path)
+    timings = []
+    for i in range(requests):
+        start = time.perf_counter()
+        writer.write(json.dumps({"id": i, "flow": flow, "input": text}).encode() + b"\n")
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        assert response["ok"], response
+        timings.append(time.perf_counter() - start)
+    writer.close()
+    return timings
+
+
+async def burst(path: str, flow: str, text: str, requests: int, concurrency: int) -> tuple[float, int]:
+    """`requests` requests spread over `concurrency` connections, all in flight at once."""
+
+    async def client(ids: range) -> int:
+        reader, writer = await asyncio.open_unix_connection(path)
+        writer.write(b"".join(json.dumps({"id": i, "flow": flow, "input": text}).encode() + b"\n" for i in ids))
+        await writer.drain()
+        ok = 0
+        for _ in ids:
+            ok += json.loads(await reader.readline())["ok"]
+        writer.close()
+        return ok
+
+    per_client = -(-requests // concurrency)
+    start = time.perf_counter()
+    results = await asyncio.gather(*(
+        client(range(i, min(i + per_client, requests))) for i in range(0, requests, per_client)
+    ))
+    return time.perf_counter() - start, sum(results)
+
+
+def describe(label: str, timings: list[float]) -> None:
+    print(
+        f"{label:<34} p50={statistics.median(timings) * 1000:8.1f} ms  "
+        f"mean={statistics.mean(timings) * 1000:8.1f} ms  (n={len(timings)})"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    env = environment(args.latency_ms / 1000)
+    spawn_times = spawned(args.flow, args.text, args.spawns, env)
+    describe(f"spawn `flows.py run {args.flow}`", spawn_times)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "pro_1.sock")
+        start = time.perf_counter()
+        daemon = await start_daemon(path, env)
+        print(f"{'daemon start-up (all flows preloaded)':<34} {(time.perf_counter() - start) * 1000:8.1f} ms, once")
+        try:
+            await sequential(path, args.flow, args.text, 5)  # first-call setup, e.g. the fake model
+            warm = await sequential(path, args.flow, args.text, args.requests)
+            describe("warm daemon, one at a time", warm)
+            print(
+                f"{'':<34} {statistics.median(spawn_times) / statistics.median(warm):.0f}x less per request than spawning"
+            )
+            elapsed, ok = await burst(path, args.flow, args.text, args.requests, args.concurrency)
+            print(
+                f"{f'warm daemon, {args.concurrency} connections':<34} {args.requests / elapsed:8.1f} req/s  "
+                f"ok={ok}/{args.requests} in {elapsed:.2f}s"
+            )
+        finally:
+            daemon.terminate()
+            await daemon.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--flow", default="guardrail")
+    parser.add_argument("--text", default="What is the capital of Pakistan?")
+    parser.add_argument("--spawns", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="fake model latency per call")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,83 @@
+"""
+Offline evaluation of the tiered guardrails on the labelled fixtures in fixtures/.
+
+The LLM judge is a fake that answers with the fixture label after `--judge-ms`, so
+accuracy numbers measure the mistakes of the local tiers and latency shows what
+skipping the judge saves. The n-gram model is scored with k-fold cross-validation.
+
+    python -m benchmarks.guardrail_eval --folds 4 --judge-ms 300
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from tiered_guardrail import MATH_HOMEWORK_RULES, PAKISTAN_RULES, HashedNgramModel, RuleClassifier, TieredClassifier
+
+FIXTURES = {
+    "math_guardrail": ("fixtures/guardrail_math.jsonl", MATH_HOMEWORK_RULES),
+    "pak_guardrail": ("fixtures/guardrail_pak.jsonl", PAKISTAN_RULES),
+}
+
+
+def load(path: str) -> list[tuple[str, bool]]:
+    with open(path, encoding="utf-8") as f:
+        return [(row["text"], bool(row["label"])) for row in map(json.loads, f) if row]
+
+
+async def evaluate(tiers: TieredClassifier, rows: list[tuple[str, bool]], judge_latency: float) -> tuple[int, list[float]]:
+    labels = dict(rows)
+
+    async def judge(text: str) -> tuple[bool, object]:
+        await asyncio.sleep(judge_latency)
+        return labels[text], None
+
+    correct, latencies = 0, []
+    for text, label in rows:
+        start = time.perf_counter()
+        verdict = await tiers.classify(text, judge)
+        latencies.append(time.perf_counter() - start)
+        correct += verdict.positive == label
+    return correct, latencies
+
+
+async def run(name: str, rows: list[tuple[str, bool]], rules: RuleClassifier, folds: int, judge_latency: float) -> None:
+    llm_only = RuleClassifier([], default=0.5)
+    setups = {
+        "llm only": lambda train: TieredClassifier(llm_only),
+        "rules + llm": lambda train: TieredClassifier(rules),
+        "rules + ngram + llm": lambda train: TieredClassifier(
+            rules, HashedNgramModel(n_features=2**14).fit([t for t, _ in train], [y for _, y in train])
+        ),
+    }
+    print(f"{name}: {len(rows)} labelled examples, {folds}-fold, judge {judge_latency * 1000:.0f}ms")
+    for setup, build in setups.items():
+        correct, latencies, resolved = 0, [], {"rules": 0, "model": 0, "llm": 0}
+        for k in range(folds):
+            test = rows[k::folds]
+            train = [row for i, row in enumerate(rows) if i % folds != k]
+            tiers = build(train)
+            fold_correct, fold_latencies = await evaluate(tiers, test, judge_latency)
+            correct += fold_correct
+            latencies += fold_latencies
+            for tier, count in tiers.stats.resolved.items():
+                resolved[tier] += count
+        shares = "  ".join(f"{tier}={count / len(rows):5.1%}" for tier, count in resolved.items())
+        print(
+            f"  {setup:<20} accuracy={correct / len(rows):6.1%}  mean={statistics.mean(latencies) * 1000:7.2f}ms  "
+            f"p50={statistics.median(latencies) * 1000:7.3f}ms  {shares}"
+        )
+
+
+async def main(folds: int, judge_latency: float) -> None:
+    for name, (path, rules) in FIXTURES.items():
+        await run(name, load(path), rules, folds, judge_latency)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--folds", type=int, default=4)
+    parser.add_argument("--judge-ms", type=float, default=300.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.folds, args.judge_ms / 1000))
@@ -0,0 +1,170 @@
+"""
+Latency saved by speculative input guardrails and incremental output guardrails,
+on fake models shaped like guardrail.py (police/guard judges in front of and behind
+the main agent).
+
+    python -m benchmarks.guardrails --rounds 5
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from agents import (
+    Agent,
+    GuardrailFunctionOutput,
+    InputGuardrailTripwireTriggered,
+    OutputGuardrailTripwireTriggered,
+    RunContextWrapper,
+    Runner,
+    input_guardrail,
+    output_guardrail,
+    set_tracing_disabled,
+)
+from pydantic import BaseModel
+
+from fake_model import FakeModel
+from speculative_guardrails import run_speculative, stream_with_output_guardrails
+
+set_tracing_disabled(True)
+
+GUARD_LATENCY = 0.30
+MAIN_LATENCY = 0.50
+
+
+class math_output(BaseModel):
+    is_math_homework: bool
+    reasoning: str
+
+
+class pak_output(BaseModel):
+    is_relevant: bool
+    reasoning: str
+
+
+class CountingModel(FakeModel):
+    """FakeModel that also counts calls that ran to completion (i.e. were not cancelled)."""
+
+    completed = 0
+
+    async def get_response(self, *args, **kwargs):
+        response = await super().get_response(*args, **kwargs)
+        self.completed += 1
+        return response
+
+
+def police_reply(system_instructions, input) -> math_output:
+    text = input if isinstance(input, str) else str(input)
+    return math_output(is_math_homework="solve" in text, reasoning="fake")
+
+
+def guard_reply(system_instructions, input) -> pak_output:
+    text = input if isinstance(input, str) else str(input)
+    return pak_output(is_relevant="India" not in text, reasoning="fake")
+
+
+police = Agent(name="police", output_type=math_output, model=FakeModel(police_reply, latency=GUARD_LATENCY))
+guard = Agent(name="guard", output_type=pak_output, model=FakeModel(guard_reply, latency=0.10))
+
+
+@input_guardrail
+async def math_guardrail(ctx: RunContextWrapper, agent: Agent, input) -> GuardrailFunctionOutput:
+    result = await Runner.run(police, input, context=ctx.context)
+    return GuardrailFunctionOutput(output_info=result.final_output, tripwire_triggered=result.final_output.is_math_homework)
+
+
+@output_guardrail
+async def pak_stream_guardrail(ctx: RunContextWrapper, agent: Agent, output: str) -> GuardrailFunctionOutput:
+    result = await Runner.run(guard, output, context=ctx.context)
+    return GuardrailFunctionOutput(output_info=result.final_output, tripwire_triggered=not result.final_output.is_relevant)
+
+
+def customer_agent() -> Agent:
+    return Agent(
+        name="Customer Support Agent",
+        model=CountingModel("happy to help", latency=MAIN_LATENCY),
+        input_guardrails=[math_guardrail],
+    )
+
+
+async def serial(agent: Agent, msg: str) -> None:
+    # the flow as described: input guardrail, then the main agent
+    result = await math_guardrail.run(agent, msg, RunContextWrapper(context=None))
+    if result.output.tripwire_triggered:
+        raise InputGuardrailTripwireTriggered(result)
+    await Runner.run(agent.clone(input_guardrails=[]), msg)
+
+
+async def runner_default(agent: Agent, msg: str) -> None:
+    await Runner.run(agent, msg)
+
+
+async def speculative(agent: Agent, msg: str) -> None:
+    await run_speculative(agent, msg)
+
+
+async def input_scenario(name: str, run, msg: str, rounds: int) -> float:
+    timings, wasted = [], 0
+    for _ in range(rounds):
+        agent = customer_agent()
+        start = time.perf_counter()
+        try:
+            await run(agent, msg)
+        except InputGuardrailTripwireTriggered:
+            pass
+        timings.append(time.perf_counter() - start)
+        await asyncio.sleep(MAIN_LATENCY)  # let anything left running in the background finish
+        if "solve" in msg:
+            wasted += agent.model.completed
+    median = statistics.median(timings)
+    print(f"  {name:<16} {median * 1000:7.1f}ms  main model calls completed after tripwire: {wasted}")
+    return median
+
+
+async def output_scenario(rounds: int) -> None:
+    words = ("Pakistan's capital is Islamabad. " * 8 + "But let us talk about India instead. " * 30).split(" ")
+    answer = " ".join(words)
+
+    def pakistan_agent() -> Agent:
+        return Agent(name="Pakistan Agent", model=FakeModel(answer, stream_delay=0.005))
+
+    full, cut = [], []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = Runner.run_streamed(pakistan_agent(), "what is the capital of Pakistan?")
+        async for _event in result.stream_events():
+            pass
+        verdict = await pak_stream_guardrail.run(RunContextWrapper(context=None), pakistan_agent(), result.final_output)
+        assert verdict.output.tripwire_triggered
+        full.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        streamed = 0
+        try:
+            async for delta in stream_with_output_guardrails(
+                pakistan_agent(), "what is the capital of Pakistan?", [pak_stream_guardrail], check_every=100
+            ):
+                streamed += len(delta)
+        except OutputGuardrailTripwireTriggered:
+            pass
+        cut.append(time.perf_counter() - start)
+    print(f"  stream then check  {statistics.median(full) * 1000:7.1f}ms  ({len(answer)} chars streamed)")
+    print(f"  incremental check  {statistics.median(cut) * 1000:7.1f}ms  ({streamed} chars streamed before cut-off)")
+
+
+async def main(rounds: int) -> None:
+    for label, msg in (("allowed input", "my order is late"), ("tripwire input", "solve 2x + 3 = 7")):
+        print(f"{label} (guardrail {GUARD_LATENCY * 1000:.0f}ms, main model {MAIN_LATENCY * 1000:.0f}ms):")
+        base = await input_scenario("serial", serial, msg, rounds)
+        await input_scenario("Runner.run", runner_default, msg, rounds)
+        spec = await input_scenario("run_speculative", speculative, msg, rounds)
+        print(f"  saved per request vs serial: {(base - spec) * 1000:.1f}ms")
+    print("off-topic streamed answer:")
+    await output_scenario(rounds)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main(args.rounds))
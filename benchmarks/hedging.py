@@ -0,0 +1,154 @@
+"""
+Tail latency with hedged requests, against two offline FakeModel backends
+whose latency is mostly `--base-ms` (lognormal) with a `--spike-rate` share of
+`--spike-ms` spikes, drawn independently per backend.
+
+- spikes: `--calls` calls, `--concurrency` at a time, to the primary alone and
+  through HedgedModel([primary, secondary]). Reports p50/p95/p99/max and the
+  extra load hedging costs (backend calls per request).
+- outage: the same, but the primary fails every call for the middle third of
+  the run. Reports failed calls, how many calls still reached the dead primary
+  (the circuit breaker keeps most of them away) and the latency while it was
+  down.
+
+    python -m benchmarks.hedging --calls 2000 --spike-rate 0.05
+"""
+import argparse
+import asyncio
+import math
+import random
+import statistics
+import time
+
+from agents import ModelSettings, set_tracing_disabled
+from agents.models.interface import ModelTracing
+
+from fake_model import FakeModel
+from hedging import HedgedModel
+
+set_tracing_disabled(True)
+
+
+def percentile(values: list[float], p: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def spiky(args: argparse.Namespace, seed: int):
+    rng = random.Random(seed)
+
+    def latency() -> float:
+        if rng.random() < args.spike_rate:
+            return args.spike_ms / 1000
+        return rng.lognormvariate(math.log(args.base_ms / 1000), 0.25)
+
+    return latency
+
+
+def backends(args: argparse.Namespace) -> tuple[FakeModel, FakeModel]:
+    return (
+        FakeModel(latency=spiky(args, args.seed), text="primary", seed=args.seed),
+        FakeModel(latency=spiky(args, args.seed + 1), text="secondary", seed=args.seed + 1),
+    )
+
+
+async def run(model, args: argparse.Namespace, on_call=None) -> tuple[list[tuple[int, float]], int]:
+    """Latency of every successful call (with its index) and the number of failures."""
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies: list[tuple[int, float]] = []
+    failed = 0
+
+    async def call(i: int) -> None:
+        nonlocal failed
+        async with semaphore:
+            if on_call is not None:
+                on_call(i)
+            start = time.perf_counter()
+            try:
+                await model.get_response(
+                    "You are a helpful assistant.", f"question {i}", ModelSettings(), [], None, [],
+                    ModelTracing.DISABLED, previous_response_id=None, prompt=None,
+                )
+            except Exception:
+                failed += 1
+                return
+            latencies.append((i, time.perf_counter() - start))
+
+    await asyncio.gather(*(call(i) for i in range(args.calls)))
+    return latencies, failed
+
+
+def report(label: str, latencies: list[float], extra: str = "") -> None:
+    print(
+        f"  {label:<26} p50={statistics.median(latencies) * 1000:7.1f} ms  p95={percentile(latencies, 0.95) * 1000:7.1f} ms  "
+        f"p99={percentile(latencies, 0.99) * 1000:7.1f} ms  max={max(latencies) * 1000:7.1f} ms  {extra}"
+    )
+
+
+async def spikes(args: argparse.Namespace) -> None:
+    print(
+        f"spikes: {args.calls} calls, {args.concurrency} concurrent; each backend {args.base_ms:.0f} ms typical, "
+        f"{args.spike_rate:.0%} spikes to {args.spike_ms:.0f} ms"
+    )
+    primary, _ = backends(args)
+    latencies, _ = await run(primary, args)
+    report("primary only", [seconds for _, seconds in latencies])
+
+    primary, secondary = backends(args)
+    hedged = HedgedModel([primary, secondary], hedge_quantile=args.quantile)
+    latencies, _ = await run(hedged, args)
+    stats = hedged.stats
+    report(
+        "hedged (primary, secondary)",
+        [seconds for _, seconds in latencies],
+        f"hedged={stats.hedged / stats.calls:.1%} (won {stats.hedge_wins})  "
+        f"backend calls/request={(primary.calls + secondary.calls) / stats.calls:.3f}",
+    )
+    print(f"  hedge delay settled at {hedged.hedge_delay(hedged.backends[0]) * 1000:.1f} ms")
+
+
+async def outage(args: argparse.Namespace) -> None:
+    start, end = args.calls // 3, 2 * args.calls // 3
+    print(f"\noutage: the primary fails calls {start}..{end - 1} (after its usual latency)")
+
+    def toggle(primary: FakeModel):
+        def on_call(i: int) -> None:
+            primary.error_rate = 1.0 if start <= i < end else 0.0
+
+        return on_call
+
+    primary, _ = backends(args)
+    latencies, failed = await run(primary, args, toggle(primary))
+    print(f"  {'primary only':<26} failed={failed}")
+
+    primary, secondary = backends(args)
+    hedged = HedgedModel([primary, secondary], hedge_quantile=args.quantile, reset_timeout=args.reset_timeout)
+    latencies, failed = await run(hedged, args, toggle(primary))
+    during = [seconds for i, seconds in latencies if start <= i < end]
+    stats = hedged.stats
+    report(
+        "hedged, during the outage",
+        during,
+        f"failed={failed}  failovers={stats.failovers}  breaker opened {hedged.backends[0].breaker.opens}x, "
+        f"skipped the primary {stats.skipped}x; primary saw {primary.errors} of {end - start} outage calls",
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    await spikes(args)
+    await outage(args)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--base-ms", type=float, default=50.0)
+    parser.add_argument("--spike-ms", type=float, default=1000.0)
+    parser.add_argument("--spike-rate", type=float, default=0.03)
+    parser.add_argument("--quantile", type=float, default=0.95, help="hedge after this latency quantile")
+    parser.add_argument("--reset-timeout", type=float, default=0.5, help="seconds a breaker stays open")
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,97 @@
+"""
+Input tokens and latency per turn over a long synthetic conversation: resending
+`result.to_input_list()` (routing.py today) vs ConversationHistory's bounded window.
+
+The fake model's latency grows with the prompt (`--ms-per-1k-tokens`) like a real
+provider's prefill does.
+
+    python -m benchmarks.history --turns 200 --budget 2000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from agents import Agent, Runner, TResponseInputItem, set_tracing_disabled
+
+from fake_model import FakeModel, count_tokens
+from history import ConversationHistory
+
+set_tracing_disabled(True)
+
+
+class PrefillModel(FakeModel):
+    """FakeModel whose latency is proportional to the input size."""
+
+    def __init__(self, replies, ms_per_1k_tokens: float):
+        super().__init__(replies)
+        self.ms_per_1k_tokens = ms_per_1k_tokens
+        self.input_tokens: list[int] = []
+
+    async def get_response(self, system_instructions, input, *args, **kwargs):
+        tokens = count_tokens(input if isinstance(input, str) else json.dumps(input, default=str))
+        self.input_tokens.append(tokens)
+        await asyncio.sleep(tokens / 1000 * self.ms_per_1k_tokens / 1000)
+        return await super().get_response(system_instructions, input, *args, **kwargs)
+
+
+def user_message(turn: int) -> str:
+    return f"Turn {turn}: tell me something new about the history of the Spanish language, please. " * 2
+
+
+def assistant_reply(system_instructions, input) -> str:
+    return "Claro. El español viene del latín vulgar hablado en la península ibérica. " * 3
+
+
+async def baseline(turns: int, ms_per_1k: float) -> tuple[list[int], list[float]]:
+    model = PrefillModel(assistant_reply, ms_per_1k)
+    agent = Agent(name="spanish_agent", model=model)
+    inputs: list[TResponseInputItem] = []
+    latencies = []
+    for turn in range(turns):
+        inputs.append({"content": user_message(turn), "role": "user"})
+        start = time.perf_counter()
+        result = await Runner.run(agent, inputs)
+        latencies.append(time.perf_counter() - start)
+        inputs = result.to_input_list()
+    return model.input_tokens, latencies
+
+
+async def managed(turns: int, ms_per_1k: float, budget: int) -> tuple[list[int], list[float], ConversationHistory]:
+    model = PrefillModel(assistant_reply, ms_per_1k)
+    agent = Agent(name="spanish_agent", model=model)
+    summarizer = Agent(name="summarizer", model=FakeModel("The user keeps asking about the history of Spanish.", latency=0.02))
+    history = ConversationHistory(budget_tokens=budget, summarizer=summarizer)
+    latencies = []
+    for turn in range(turns):
+        history.append({"content": user_message(turn), "role": "user"})
+        start = time.perf_counter()
+        result = await Runner.run(agent, history.window())
+        latencies.append(time.perf_counter() - start)
+        history.extend_from_result(result)
+    await history.flush()
+    return model.input_tokens, latencies, history
+
+
+def curve(name: str, tokens: list[int], latencies: list[float], turns: int) -> None:
+    marks = sorted({0, 9, 49, 99, turns // 2, turns - 1} & set(range(turns)))
+    points = "  ".join(f"t{m + 1}={tokens[m]}tok/{latencies[m] * 1000:.1f}ms" for m in marks)
+    print(f"{name:<10} total_input_tokens={sum(tokens):>9}  total_time={sum(latencies):6.2f}s")
+    print(f"           {points}")
+
+
+async def main(turns: int, budget: int, ms_per_1k: float) -> None:
+    tokens, latencies = await baseline(turns, ms_per_1k)
+    curve("baseline", tokens, latencies, turns)
+    tokens, latencies, history = await managed(turns, ms_per_1k, budget)
+    curve("managed", tokens, latencies, turns)
+    print(f"           items held={len(history.items)}  summary={'yes' if history.summary else 'no'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--budget", type=int, default=2000)
+    parser.add_argument("--ms-per-1k-tokens", type=float, default=20.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.turns, args.budget, args.ms_per_1k_tokens))
@@ -0,0 +1,78 @@
+"""
+Peak memory (tracemalloc) and time to write a base64 image to disk: whole-string
+b64decode + write (image_gen.py before) vs image_io.decode_base64_to_file.
+
+The base64 text is allocated before tracing starts, so the peaks are what each
+approach adds on top of the payload it was handed. The concurrent rows decode
+`--workers` images at once from a thread pool, like a batch of generations.
+
+    python -m benchmarks.image_decode --workers 8
+"""
+import argparse
+import base64
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+
+from image_io import decode_base64_to_file
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def legacy_write(b64: str, filename: str) -> None:
+    data = base64.b64decode(b64)
+    with open(filename, "wb") as f:
+        f.write(data)
+
+
+def streaming_write(b64: str, filename: str, verify: bool | None = None) -> None:
+    decode_base64_to_file(b64, filename, verify=verify)
+
+
+def measure(fn, b64: str, workers: int, directory: str, repeat: int = 3) -> tuple[float, int]:
+    paths = [os.path.join(directory, f"img{i}.png") for i in range(workers)]
+    times = []
+    peak = 0
+    for _ in range(repeat):
+        tracemalloc.start()
+        start = time.perf_counter()
+        if workers == 1:
+            fn(b64, paths[0])
+        else:
+            with ThreadPoolExecutor(workers) as pool:
+                list(pool.map(fn, [b64] * workers, paths))
+        times.append(time.perf_counter() - start)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return statistics.median(times), peak
+
+
+def main(workers: int) -> None:
+    image = (ROOT / "otter.png").read_bytes()
+    payloads = {
+        "otter.png 3.0MB": base64.b64encode(image).decode(),
+        "4x otter 12MB (no PNG check)": base64.b64encode(image * 4).decode(),
+    }
+    verify = {"otter.png 3.0MB": None, "4x otter 12MB (no PNG check)": False}
+    with tempfile.TemporaryDirectory() as directory:
+        for name, b64 in payloads.items():
+            for count in (1, workers):
+                old_time, old_peak = measure(legacy_write, b64, count, directory)
+                new_time, new_peak = measure(partial(streaming_write, verify=verify[name]), b64, count, directory)
+                label = f"{name} x{count}"
+                print(
+                    f"{label:<36} b64decode {old_time * 1000:7.1f}ms {old_peak / 2**20:7.2f}MiB peak   "
+                    f"streaming {new_time * 1000:7.1f}ms {new_peak / 2**20:7.2f}MiB peak"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+    main(args.workers)
@@ -0,0 +1,154 @@
+"""
+Time and peak memory to locate the image in a Responses API result: image_gen.py's
+previous to_dict()/regex/str() path vs image_payload.find_image_payload.
+
+Responses are built from fixtures/image_response.json with base64 slices of
+otter.png of several sizes, in two shapes: an `image_generation_call` item, and
+a data URI embedded in message text (which the old code only found through its
+str(response) fallback).
+
+    python -m benchmarks.image_payload --repeat 20
+"""
+import argparse
+import base64
+import binascii
+import copy
+import json
+import re
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+from openai.types.responses import Response
+
+from image_payload import find_image_payload
+
+ROOT = Path(__file__).resolve().parent.parent
+SIZES = {"64KB": 64 * 1024, "512KB": 512 * 1024, "3MB": None}
+
+
+def legacy_extract(item):
+    """image_gen.extract_image_payload before this change."""
+    if item is None:
+        return (None, None)
+    if isinstance(item, str):
+        s = item.strip()
+        m = re.match(r"data:(image/\w+);base64,(.*)", s, re.DOTALL)
+        if m:
+            return ("base64", m.group(2))
+        if s.startswith("http"):
+            return ("url", s)
+        if re.fullmatch(r"[A-Za-z0-9+/=\s]+", s) and len(s) % 4 == 0:
+            return ("base64", s)
+        return (None, None)
+    if isinstance(item, dict):
+        for key in ("url", "image_url", "image", "data", "result", "content", "b64", "base64"):
+            v = item.get(key)
+            if not v:
+                continue
+            if isinstance(v, str):
+                s = v.strip()
+                m = re.match(r"data:(image/\w+);base64,(.*)", s, re.DOTALL)
+                if m:
+                    return ("base64", m.group(2))
+                if s.startswith("http"):
+                    return ("url", s)
+                if re.fullmatch(r"[A-Za-z0-9+/=\s]+", s) and len(s) % 4 == 0:
+                    return ("base64", s)
+            if isinstance(v, dict):
+                kind, val = legacy_extract(v)
+                if kind:
+                    return (kind, val)
+    return (None, None)
+
+
+def legacy_find(response):
+    """image_gen.save_image_from_response's search before this change, minus the file write."""
+    resp_dict = response.to_dict()
+    outputs = resp_dict.get("output") or resp_dict.get("choices") or []
+    if isinstance(outputs, dict):
+        outputs = [outputs]
+    for out in outputs:
+        candidates = []
+        if isinstance(out, dict):
+            if out.get("type") == "image_generation_call":
+                candidates.append(out.get("result") or out.get("image") or out.get("content") or out.get("data"))
+            for key in ("content", "message", "result", "tool_call", "tool"):
+                if key in out:
+                    candidates.append(out[key])
+            for key in ("items", "parts"):
+                if key in out:
+                    candidates.extend(out[key])
+        candidates.append(out)
+        for cand in candidates:
+            kind, val = legacy_extract(cand)
+            if kind:
+                return kind, val
+    text = str(resp_dict)
+    m = re.search(r"(data:image/\w+;base64,[A-Za-z0-9+/=\s]+)", text)
+    if m:
+        return "base64", re.sub(r"^data:image/\w+;base64,", "", m.group(1))
+    return None, None
+
+
+def legacy_find_and_decode(response) -> bytes:
+    return base64.b64decode(legacy_find(response)[1])
+
+
+def find_and_decode(response) -> bytes:
+    return binascii.a2b_base64(find_image_payload(response).data)
+
+
+def build_responses() -> dict[str, Response]:
+    template = json.loads((ROOT / "fixtures" / "image_response.json").read_text())
+    image = (ROOT / "otter.png").read_bytes()
+    responses = {}
+    for label, size in SIZES.items():
+        b64 = base64.b64encode(image[:size]).decode()
+        as_call = copy.deepcopy(template)
+        as_call["output"][1]["result"] = b64
+        responses[f"{label} image_generation_call"] = Response.model_validate(as_call)
+
+        as_text = copy.deepcopy(template)
+        del as_text["output"][1]
+        as_text["output"][1]["content"][0]["text"] = f"Here it is: ![otter](data:image/png;base64,{b64})"
+        responses[f"{label} data URI in text"] = Response.model_validate(as_text)
+    return responses
+
+
+def measure(fn, response, repeat: int) -> tuple[float, int]:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(response)
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn(response)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(times), peak
+
+
+def main(repeat: int) -> None:
+    responses = build_responses()
+    # find only: the new path pays for its one ASCII encode here, the old one later in b64decode
+    for title, old, new in (
+        ("find", legacy_find, find_image_payload),
+        ("find + decode", legacy_find_and_decode, find_and_decode),
+    ):
+        print(f"{title:<36}{'legacy':>24}{'image_payload':>30}")
+        for name, response in responses.items():
+            old_time, old_peak = measure(old, response, repeat)
+            new_time, new_peak = measure(new, response, repeat)
+            print(
+                f"  {name:<34}{old_time * 1000:9.2f}ms {old_peak / 2**20:8.2f}MiB peak"
+                f"{new_time * 1000:13.2f}ms {new_peak / 2**20:8.2f}MiB peak"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    main(args.repeat)
@@ -0,0 +1,103 @@
+"""
+Post-processing a folder of PNGs like otter.png into WebP renditions: Pillow
+inline on the event loop vs PostProcessor's process pool, measuring images/s
+and how late a 10ms heartbeat task runs (event loop stalls), then a second pass
+over the same content to show the hash cache.
+
+    python -m benchmarks.image_postprocess --images 12 --workers 2
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image
+
+from image_postprocess import DEFAULT_RENDITIONS, PostProcessor, file_digest, render
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def make_folder(directory: str, count: int, unique: int) -> list[str]:
+    """`count` PNGs with `unique` distinct contents (the rest are duplicates)."""
+    base = Image.open(ROOT / "otter.png").convert("RGB")
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f"img{i:03d}.png")
+        if i < unique:
+            base.rotate(i * 3).save(path)
+        else:
+            shutil.copyfile(paths[i % unique], path)
+        paths.append(path)
+    return paths
+
+
+async def heartbeat(lags: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        lags.append(time.perf_counter() - start - 0.01)
+
+
+async def timed(label: str, work) -> None:
+    lags: list[float] = []
+    stop = asyncio.Event()
+    beat = asyncio.create_task(heartbeat(lags, stop))
+    start = time.perf_counter()
+    count = await work()
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await beat
+    print(f"{label:<34} {count / elapsed:6.2f} images/s  max loop stall={max(lags, default=0) * 1000:7.1f}ms")
+
+
+async def main(count: int, unique: int, workers: int) -> None:
+    with tempfile.TemporaryDirectory() as src, tempfile.TemporaryDirectory() as out:
+        paths = make_folder(src, count, unique)
+
+        async def naive():
+            # what image_gemini.py-style code would do: open + resize from full size per rendition
+            for i, path in enumerate(paths):
+                for rendition in DEFAULT_RENDITIONS:
+                    with Image.open(path) as img:
+                        img = img.convert("RGB")
+                        if rendition.max_size:
+                            img.thumbnail(rendition.max_size, Image.Resampling.LANCZOS)
+                        img.save(os.path.join(out, "naive", f"{i}-{rendition.name}.webp"), "WEBP", quality=rendition.quality)
+                await asyncio.sleep(0)
+            return len(paths)
+
+        async def inline():
+            for i, path in enumerate(paths):
+                render(path, DEFAULT_RENDITIONS, os.path.join(out, "inline"), file_digest(path) + str(i))
+                await asyncio.sleep(0)
+            return len(paths)
+
+        os.makedirs(os.path.join(out, "naive"))
+        os.makedirs(os.path.join(out, "inline"))
+        await timed("naive, decode per rendition", naive)
+        await timed("render() inline on the event loop", inline)
+
+        processor = PostProcessor(os.path.join(out, "pool"), max_workers=workers)
+
+        async def pooled():
+            await asyncio.gather(*(processor.process(path) for path in paths))
+            return len(paths)
+
+        await timed(f"process pool ({workers} workers)", pooled)
+        print(f"  processed={processor.stats.processed} coalesced={processor.stats.coalesced} cache_hits={processor.stats.cache_hits}")
+        await timed("process pool, second pass (cached)", pooled)
+        print(f"  processed={processor.stats.processed} coalesced={processor.stats.coalesced} cache_hits={processor.stats.cache_hits}")
+        processor.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images", type=int, default=12)
+    parser.add_argument("--unique", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    args = parser.parse_args()
+    asyncio.run(main(args.images, args.unique, args.workers))
@@ -0,0 +1,143 @@
+"""
+Cold-start cost of every entry point: each module is imported in a fresh
+interpreter with `-X importtime` and API keys removed from the environment, so
+a module that builds clients, reads keys or runs an agent at import shows up as
+a failure rather than a slow import. Reports the best of `--repeat` wall times
+(minus a bare interpreter's start-up) and the heaviest top-level imports.
+
+    python -m benchmarks.importtime
+    python -m benchmarks.importtime --save baseline.json
+    python -m benchmarks.importtime --compare baseline.json --tolerance 0.2
+
+With --compare, exits 1 when an entry point got slower than the baseline by
+more than `--tolerance` (relative) and `--slack-ms` (absolute), or stopped
+importing cleanly.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+KEY_VARIABLES = ("OPENAI_API_KEY", "GEMINI_API_KEY", "MODEL_BACKEND")
+
+
+@dataclass
+class ImportTiming:
+    module: str
+    ms: float | None  # None when the import failed
+    error: str = ""
+    heaviest: list[tuple[str, float]] = field(default_factory=list)  # (top-level import, cumulative ms)
+
+
+def entry_points() -> list[str]:
+    return sorted(path.stem for path in ROOT.glob("*.py"))
+
+
+def _environment() -> dict[str, str]:
+    env = {key: value for key, value in os.environ.items() if key not in KEY_VARIABLES}
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT), env.get("PYTHONPATH")]))
+    return env
+
+
+def _run(code: str, env: dict[str, str]) -> tuple[float, subprocess.CompletedProcess]:
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    return (time.perf_counter() - start) * 1000, process
+
+
+def _top_level(stderr: str) -> list[tuple[str, float]]:
+    """Top-level imports and their cumulative ms, from `-X importtime` output."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if name.startswith("  ") or not cumulative.strip().isdigit():
+            continue  # nested import, or the header line
+        imports.append((name.strip(), int(cumulative) / 1000))
+    return imports
+
+
+def measure(modules: list[str], repeat: int = 3, top: int = 3) -> tuple[float, list[ImportTiming]]:
+    env = _environment()
+    runs = [_run("pass", env) for _ in range(repeat)]
+    baseline = min(elapsed for elapsed, _ in runs)
+    startup = {name for name, _ in _top_level(runs[0][1].stderr)}  # site, encodings, ...
+    timings = []
+    for module in modules:
+        code = f"import importlib; importlib.import_module({module!r})"
+        best, process = None, None
+        for _ in range(repeat):
+            elapsed, process = _run(code, env)
+            if process.returncode != 0:
+                break
+            best = elapsed if best is None else min(best, elapsed)
+        if process.returncode != 0:
+            lines = [line for line in process.stderr.splitlines() if not line.startswith("import time:")]
+            timings.append(ImportTiming(module, None, lines[-1] if lines else f"exit code {process.returncode}"))
+        else:
+            imports = [item for item in _top_level(process.stderr) if item[0] not in startup]
+            heaviest = sorted(imports, key=lambda item: -item[1])[:top]
+            timings.append(ImportTiming(module, max(0.0, best - baseline), heaviest=heaviest))
+    return baseline, timings
+
+
+def compare(timings: list[ImportTiming], baseline_path: str, tolerance: float, slack_ms: float) -> list[str]:
+    with open(baseline_path, encoding="utf-8") as f:
+        before = {entry["module"]: entry for entry in json.load(f)["timings"]}
+    regressions = []
+    for timing in timings:
+        old = before.get(timing.module)
+        if old is None:
+            continue
+        if timing.ms is None and old["ms"] is not None:
+            regressions.append(f"{timing.module}: no longer imports ({timing.error})")
+        elif timing.ms is not None and old["ms"] is not None:
+            if timing.ms > old["ms"] * (1 + tolerance) and timing.ms - old["ms"] > slack_ms:
+                regressions.append(f"{timing.module}: {old['ms']:.0f} ms -> {timing.ms:.0f} ms")
+    return regressions
+
+
+def main(args: argparse.Namespace) -> int:
+    modules = args.modules or entry_points()
+    baseline, timings = measure(modules, args.repeat)
+    print(f"bare interpreter: {baseline:.0f} ms (subtracted below)")
+    for timing in sorted(timings, key=lambda t: -1 if t.ms is None else t.ms):
+        if timing.ms is None:
+            print(f"{timing.module:<24} FAILED  {timing.error[:100]}")
+        else:
+            heaviest = ", ".join(f"{name} {ms:.0f}" for name, ms in timing.heaviest)
+            print(f"{timing.module:<24} {timing.ms:7.0f} ms   heaviest: {heaviest}")
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version, "baseline_ms": baseline, "timings": [asdict(t) for t in timings]}, f, indent=2)
+        print(f"saved to {args.save}")
+    if args.compare:
+        regressions = compare(timings, args.compare, args.tolerance, args.slack_ms)
+        for line in regressions:
+            print("REGRESSION", line)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", help="modules to import (default: every top-level module)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", default=None, help="write the timings to this JSON file")
+    parser.add_argument("--compare", default=None, help="a JSON file written by --save")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--slack-ms", type=float, default=50.0)
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,104 @@
+"""
+Rounds, tokens and wall time per story session: story.py's original loop (one
+outline per round, full transcript resent) vs judge_loop (parallel candidates,
+early exit, latest outline + feedback only), on scripted fake models.
+
+Each generated outline gets a random quality; the evaluator passes it when the
+quality reaches `--pass-at`, so both loops face the same odds per outline.
+
+    python -m benchmarks.judge_loop --sessions 20 --candidates 3
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Literal
+
+from agents import Agent, ItemHelpers, Runner, TResponseInputItem, Usage, set_tracing_disabled
+
+from fake_model import FakeModel
+from judge_loop import judge_loop
+
+set_tracing_disabled(True)
+
+MODEL_LATENCY = 0.1
+_quality = re.compile(r"quality=(\d\.\d+)")
+
+
+@dataclass
+class EvaluationFeedback:
+    feedback: str
+    score: Literal["pass", "needs improvement", "fail"]
+
+
+def build_agents(seed: int, pass_at: float) -> tuple[Agent, Agent]:
+    rng = random.Random(seed)
+
+    def outline(system_instructions, input) -> str:
+        beats = " ".join(f"Beat {i}: the hero faces a new and harder trial in the old forest." for i in range(6))
+        return f"Outline quality={rng.random():.3f}. {beats}"
+
+    def evaluate(system_instructions, input) -> dict:
+        # non-pydantic output types like story.py's dataclass go over the wire as {"response": ...}
+        text = input if isinstance(input, str) else json.dumps(input)
+        quality = float(_quality.findall(text)[-1])
+        if quality >= pass_at:
+            return {"response": {"feedback": "good enough", "score": "pass"}}
+        return {"response": {"feedback": "raise the stakes and give the ending a twist", "score": "needs improvement"}}
+
+    generator = Agent(name="Story outline generator", model=FakeModel(outline, latency=MODEL_LATENCY))
+    evaluator = Agent(name="Evaluator", model=FakeModel(evaluate, latency=MODEL_LATENCY), output_type=EvaluationFeedback)
+    return generator, evaluator
+
+
+async def original_loop(generator: Agent, evaluator: Agent, msg: str, max_rounds: int) -> tuple[int, Usage, bool]:
+    """story.py's loop, capped at `max_rounds` so the benchmark terminates."""
+    usage = Usage()
+    input_items: list[TResponseInputItem] = [{"content": msg, "role": "user"}]
+    for rounds in range(1, max_rounds + 1):
+        outline_result = await Runner.run(generator, input_items)
+        usage.add(outline_result.context_wrapper.usage)
+        input_items = outline_result.to_input_list()
+        ItemHelpers.text_message_outputs(outline_result.new_items)
+
+        evaluator_result = await Runner.run(evaluator, input_items)
+        usage.add(evaluator_result.context_wrapper.usage)
+        if evaluator_result.final_output.score == "pass":
+            return rounds, usage, True
+        input_items.append({"content": f"feedback: {evaluator_result.final_output.feedback}", "role": "user"})
+    return max_rounds, usage, False
+
+
+async def main(sessions: int, candidates: int, max_rounds: int, pass_at: float) -> None:
+    msg = "A short fantasy story about a lost knight"
+    rows = {"original": [], f"judge_loop x{candidates}": []}
+    for seed in range(sessions):
+        generator, evaluator = build_agents(seed, pass_at)
+        start = time.perf_counter()
+        rounds, usage, passed = await original_loop(generator, evaluator, msg, max_rounds)
+        rows["original"].append((rounds, usage.total_tokens, time.perf_counter() - start, passed))
+
+        generator, evaluator = build_agents(seed, pass_at)
+        session = await judge_loop(generator, evaluator, msg, candidates=candidates, max_rounds=max_rounds)
+        rows[f"judge_loop x{candidates}"].append((session.rounds, session.usage.total_tokens, session.elapsed, session.passed))
+
+    for name, results in rows.items():
+        rounds, tokens, elapsed, passed = zip(*results)
+        print(
+            f"{name:<14} rounds mean={statistics.mean(rounds):5.2f}  tokens mean={statistics.mean(tokens):8.0f}  "
+            f"time mean={statistics.mean(elapsed) * 1000:7.1f}ms  passed={sum(passed)}/{len(results)}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--candidates", type=int, default=3)
+    parser.add_argument("--max-rounds", type=int, default=10)
+    parser.add_argument("--pass-at", type=float, default=0.8)
+    args = parser.parse_args()
+    asyncio.run(main(args.sessions, args.candidates, args.max_rounds, args.pass_at))
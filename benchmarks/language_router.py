@@ -0,0 +1,95 @@
+"""
+Triage round-trips avoided by StickyRouter, on fake models shaped like routing.py.
+
+Every turn arrives as if state was lost (a new request to a stateless worker), so
+the baseline starts at triage_agent each time; the router detects the language
+locally or reuses the conversation's sticky agent.
+
+    python -m benchmarks.language_router --conversations 30 --turns 5
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from agents import Agent, Runner, set_tracing_disabled
+
+from fake_model import FakeModel, function_call
+from language_router import StickyRouter
+
+set_tracing_disabled(True)
+
+MODEL_LATENCY = 0.15
+
+MESSAGES = {
+    "en": ["Hello, can you help me with my order?", "What time does the shop open tomorrow?", "thanks", "ok", "Tell me a joke about cats"],
+    "fr": ["Bonjour, pouvez-vous m'aider avec ma commande ?", "À quelle heure ouvre le magasin demain ?", "merci", "ok", "Raconte-moi une blague sur les chats"],
+    "es": ["Hola, ¿puedes ayudarme con mi pedido?", "¿A qué hora abre la tienda mañana?", "gracias", "ok", "Cuéntame un chiste sobre gatos"],
+}
+NAMES = {"en": "english_agent", "fr": "french_agent", "es": "spanish_agent"}
+
+
+def build_agents() -> tuple[Agent, dict[str, Agent]]:
+    agents = {
+        language: Agent(name=name, model=FakeModel(f"[{language}] answer", latency=MODEL_LATENCY))
+        for language, name in NAMES.items()
+    }
+    language_of = {msg: language for language, msgs in MESSAGES.items() for msg in msgs}
+
+    def triage_reply(system_instructions, input):
+        last = input if isinstance(input, str) else input[-1]["content"]
+        language = language_of.get(last, "en")
+        return [function_call(f"transfer_to_{NAMES[language]}")]
+
+    triage = Agent(
+        name="triage_agent",
+        handoffs=list(agents.values()),
+        model=FakeModel(triage_reply, latency=MODEL_LATENCY),
+    )
+    return triage, agents
+
+
+def conversations(count: int, turns: int, seed: int = 7) -> list[list[str]]:
+    rng = random.Random(seed)
+    result = []
+    for _ in range(count):
+        language = rng.choice(list(MESSAGES))
+        result.append([rng.choice(MESSAGES[language]) for _ in range(turns)])
+    return result
+
+
+async def run(convos: list[list[str]], use_router: bool) -> tuple[list[float], int, StickyRouter | None]:
+    triage, agents = build_agents()
+    router = StickyRouter(agents, triage) if use_router else None
+    latencies = []
+    for cid, messages in enumerate(convos):
+        for msg in messages:
+            agent = router.route(str(cid), msg) if router else triage
+            start = time.perf_counter()
+            result = await Runner.run(agent, msg)
+            latencies.append(time.perf_counter() - start)
+            if router:
+                router.remember(str(cid), result.last_agent)
+    return latencies, triage.model.calls, router
+
+
+async def main(count: int, turns: int) -> None:
+    convos = conversations(count, turns)
+    for name, use_router in (("always triage", False), ("sticky router", True)):
+        latencies, triage_calls, router = await run(convos, use_router)
+        line = (
+            f"{name:<14} turns={len(latencies)}  triage model calls={triage_calls:4d}  "
+            f"p50={statistics.median(latencies) * 1000:6.1f}ms  mean={statistics.mean(latencies) * 1000:6.1f}ms"
+        )
+        if router:
+            line += f"  ({router.stats.detected} detected, {router.stats.sticky} sticky, {router.stats.triage_avoided} avoided)"
+        print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--conversations", type=int, default=30)
+    parser.add_argument("--turns", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.conversations, args.turns))
@@ -0,0 +1,174 @@
+"""
+Open-loop load generator for the repo's agents, on the offline fake model backend.
+
+Requests are started at a fixed rate (or with Poisson arrivals) regardless of how
+many are still in flight, so latency under load shows up instead of being hidden
+by a closed loop. Every model in the target module is a FakeModel (MODEL_BACKEND
+=fake, plus agents that name a model by string), improvising handoffs, tool calls
+and structured output from what each agent offers.
+
+    python -m benchmarks.loadgen triage_agent --rps 50 --duration 10 --latency lognormal:0.3,0.5
+    python -m benchmarks.loadgen guardrail:customer_agent --rps 20 --error-rate 0.02
+"""
+import argparse
+import asyncio
+import contextlib
+import importlib
+import io
+import os
+import random
+import statistics
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+AGENTS = {
+    "orchestrator_agent": "agent_as_tool:orchestrator_agent",
+    "triage_agent": "routing:triage_agent",
+    "pakistan_agent": "guardrail:pakistan_agent",
+    "customer_agent": "guardrail:customer_agent",
+    "math_agent": "local_context:math_agent",
+}
+
+INPUTS = {
+    "orchestrator_agent": "Translate 'good morning' to Spanish and French",
+    "triage_agent": "Bonjour, pouvez-vous m'aider avec ma commande ?",
+    "pakistan_agent": "What is the capital of Pakistan?",
+    "customer_agent": "My order has not arrived yet, can you help?",
+    "math_agent": "what is 12 multiplied by 15?",
+}
+
+# what the fake model says in text / string fields, so output guardrails see plausible answers
+TEXTS = {
+    "pakistan_agent": "Islamabad is the capital of Pakistan.",
+}
+
+CONTEXTS = {
+    "math_agent": lambda module: module.UserContext(username="Alice", email="alice@example.com"),
+}
+
+
+@dataclass
+class LoadReport:
+    started: int = 0
+    completed: int = 0
+    dropped: int = 0
+    latencies: list[float] = field(default_factory=list)
+    outcomes: Counter = field(default_factory=Counter)
+    elapsed: float = 0.0
+
+    def percentile(self, p: float) -> float:
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p))] if ordered else float("nan")
+
+    def print(self, model_calls: int) -> None:
+        ok = self.outcomes["ok"]
+        print(
+            f"started={self.started} completed={self.completed} dropped={self.dropped} "
+            f"elapsed={self.elapsed:.2f}s throughput={self.completed / self.elapsed:.1f} req/s "
+            f"goodput={ok / self.elapsed:.1f} req/s model_calls={model_calls}"
+        )
+        if self.latencies:
+            print(
+                f"latency ms: p50={self.percentile(0.50) * 1000:.1f} p90={self.percentile(0.90) * 1000:.1f} "
+                f"p99={self.percentile(0.99) * 1000:.1f} max={max(self.latencies) * 1000:.1f} "
+                f"mean={statistics.mean(self.latencies) * 1000:.1f}"
+            )
+        print("outcomes: " + ", ".join(f"{name}={count}" for name, count in self.outcomes.most_common()))
+
+
+def configure_backend(args: argparse.Namespace) -> None:
+    # must happen before the target module is imported: its models are built at import time
+    os.environ["MODEL_BACKEND"] = "fake"
+    os.environ["FAKE_MODEL_LATENCY"] = args.latency
+    os.environ["FAKE_MODEL_ERROR_RATE"] = str(args.error_rate)
+    os.environ["FAKE_MODEL_SEED"] = str(args.seed)
+    os.environ["FAKE_MODEL_TEXT"] = args.text or TEXTS.get(args.agent, "ok")
+    if args.tokens_per_second:
+        os.environ["FAKE_MODEL_TOKENS_PER_SECOND"] = str(args.tokens_per_second)
+
+
+def load_agent(target: str):
+    from agents import Agent, Model
+
+    from provider import get_model
+
+    module_name, _, attr = AGENTS.get(target, target).partition(":")
+    with contextlib.redirect_stdout(io.StringIO()):
+        module = importlib.import_module(module_name)
+    fake = get_model()
+    for value in vars(module).values():
+        # agents that name a model by string ("gpt-4o-mini") would go to the default OpenAI provider
+        if isinstance(value, Agent) and not isinstance(value.model, Model):
+            value.model = fake
+    context = CONTEXTS[target](module) if target in CONTEXTS else None
+    return getattr(module, attr), context, fake
+
+
+async def run_load(agent, message: str, context, args: argparse.Namespace) -> LoadReport:
+    from agents import InputGuardrailTripwireTriggered, OutputGuardrailTripwireTriggered, RunConfig, Runner
+
+    run_config = RunConfig(tracing_disabled=True)
+    report = LoadReport()
+    rng = random.Random(args.seed)
+    in_flight: set[asyncio.Task] = set()
+
+    async def one_request() -> None:
+        start = time.perf_counter()
+        try:
+            await Runner.run(agent, message, context=context, run_config=run_config, max_turns=args.max_turns)
+            outcome = "ok"
+        except InputGuardrailTripwireTriggered:
+            outcome = "input_tripwire"
+        except OutputGuardrailTripwireTriggered:
+            outcome = "output_tripwire"
+        except Exception as e:
+            outcome = type(e).__name__
+        report.latencies.append(time.perf_counter() - start)
+        report.completed += 1
+        report.outcomes[outcome] += 1
+
+    loop_start = time.perf_counter()
+    next_at = loop_start
+    with contextlib.redirect_stdout(io.StringIO()) if args.quiet else contextlib.nullcontext():
+        while next_at - loop_start < args.duration:
+            await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+            if len(in_flight) >= args.max_in_flight:
+                report.dropped += 1
+            else:
+                task = asyncio.create_task(one_request())
+                in_flight.add(task)
+                task.add_done_callback(in_flight.discard)
+                report.started += 1
+            next_at += rng.expovariate(args.rps) if args.poisson else 1 / args.rps
+        if in_flight:
+            await asyncio.wait(in_flight)
+    report.elapsed = time.perf_counter() - loop_start
+    return report
+
+
+async def main(args: argparse.Namespace) -> None:
+    configure_backend(args)
+    agent, context, fake = load_agent(args.agent)
+    message = args.input or INPUTS.get(args.agent, "Hello")
+    print(f"agent={agent.name} rps={args.rps} duration={args.duration}s latency={args.latency} error_rate={args.error_rate}")
+    report = await run_load(agent, message, context, args)
+    report.print(fake.calls)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("agent", help=f"one of {', '.join(AGENTS)} or module:attribute")
+    parser.add_argument("--rps", type=float, default=20.0)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--latency", default="lognormal:0.3,0.5", help="fake model latency spec (see fake_model.parse_latency)")
+    parser.add_argument("--tokens-per-second", type=float, default=None)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--input", default=None)
+    parser.add_argument("--text", default=None, help="text the fake model answers with")
+    parser.add_argument("--max-in-flight", type=int, default=1000)
+    parser.add_argument("--max-turns", type=int, default=10)
+    parser.add_argument("--poisson", action="store_true", help="exponential inter-arrival times instead of a fixed interval")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-quiet", dest="quiet", action="store_false", help="let the agents' own prints through")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,135 @@
+"""
+Cost per hook call of MetricsHooks vs agent_hook.py's old printing hooks and a
+no-op AgentHooks, then a few hundred FakeModel runs (tool calls, handoffs,
+injected model errors) through MetricsCollector.run with the resulting JSON
+snapshot and Prometheus export.
+
+    python -m benchmarks.metrics_hooks --calls 100000 --runs 50
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Any
+
+from agents import Agent, AgentHooks, RunContextWrapper, function_tool, handoff, set_tracing_disabled
+from agents.tool_context import ToolContext
+
+from fake_model import FakeModel, function_call
+from metrics_hooks import MetricsCollector, MetricsHooks
+
+set_tracing_disabled(True)
+
+
+class PrintingHooks(AgentHooks):
+    """agent_hook.py's TestAgHooks before this change."""
+
+    def __init__(self, ag_display_name):
+        self.event_counter = 0
+        self.ag_display_name = ag_display_name
+
+    async def on_start(self, context: RunContextWrapper, agent: Agent) -> None:
+        self.event_counter += 1
+        print(f"### {self.ag_display_name} {self.event_counter}: Agent {agent.name} started. Usage: {context.usage}")
+
+    async def on_end(self, context: RunContextWrapper, agent: Agent, output: Any) -> None:
+        self.event_counter += 1
+        print(f"### {self.ag_display_name} {self.event_counter}: Agent {agent.name} ended. Usage: {context.usage}, Output: {output}")
+
+
+async def per_call(hooks: AgentHooks, calls: int) -> tuple[float, float]:
+    """Microseconds per agent hook call and per tool hook call."""
+    agent = Agent(name="bench")
+    context = RunContextWrapper(context=None)
+    tool = function_tool(lambda: "ok", name_override="noop")
+    tool_context = ToolContext(context=None, tool_call_id="call_1")
+    start = time.perf_counter_ns()
+    for _ in range(calls):
+        await hooks.on_start(context, agent)
+        await hooks.on_end(context, agent, "done")
+    agent_ns = (time.perf_counter_ns() - start) / calls / 2
+    start = time.perf_counter_ns()
+    for _ in range(calls):
+        await hooks.on_tool_start(tool_context, agent, tool)
+        await hooks.on_tool_end(tool_context, agent, tool, "ok")
+    tool_ns = (time.perf_counter_ns() - start) / calls / 2
+    return agent_ns / 1000, tool_ns / 1000
+
+
+@function_tool
+def lookup(city: str) -> str:
+    return f"weather of {city} is cloudy"
+
+
+@function_tool
+def flaky(city: str) -> str:
+    raise ConnectionError("upstream down")
+
+
+def specialist_reply(system_instructions: str | None, input: Any):
+    # after the handoff the last item is the transfer's output, so call the tool once explicitly
+    called = any(isinstance(item, dict) and item.get("name") == "lookup" for item in input)
+    return "cloudy" if called else [function_call("lookup", {"city": "Lahore"})]
+
+
+async def end_to_end(runs: int) -> MetricsCollector:
+    collector = MetricsCollector()
+    hooks = MetricsHooks(collector)
+    specialist = Agent(
+        name="weather_specialist",
+        model=FakeModel(specialist_reply, latency=0.002),
+        tools=[lookup],
+        hooks=hooks,
+    )
+    triage = Agent(
+        name="triage",
+        model=FakeModel(latency=0.001, error_rate=0.05, seed=1),
+        handoffs=[handoff(specialist)],
+        hooks=hooks,
+    )
+    flaky_agent = Agent(
+        name="flaky_tools",
+        model=FakeModel(latency=0.001, text="Lahore", seed=2),
+        tools=[flaky],
+        hooks=hooks,
+    )
+
+    async def one(i: int) -> None:
+        agent = flaky_agent if i % 10 == 0 else triage
+        try:
+            await collector.run(agent, "what is the weather in Lahore?", max_turns=4)
+        except Exception:
+            pass
+
+    for i in range(runs):
+        await asyncio.gather(*(one(i * 4 + j) for j in range(4)))
+    return collector
+
+
+async def main(calls: int, runs: int) -> None:
+    timings = {"AgentHooks (no-op)": await per_call(AgentHooks(), calls)}
+    with open(os.devnull, "w") as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            timings["printing hooks (to /dev/null)"] = await per_call(PrintingHooks("bench"), calls)
+        finally:
+            sys.stdout = stdout
+    timings["MetricsHooks"] = await per_call(MetricsHooks(MetricsCollector()), calls)
+    for label, (agent_us, tool_us) in timings.items():
+        print(f"{label:<30} agent hooks {agent_us:6.2f} us/call   tool hooks {tool_us:6.2f} us/call")
+
+    collector = await end_to_end(runs)
+    start = time.perf_counter()
+    exported = collector.to_prometheus()
+    print(f"\nexport: {(time.perf_counter() - start) * 1000:.2f} ms, {len(exported.splitlines())} lines")
+    print(collector.to_json(indent=2))
+    print(exported)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=50, help="batches of 4 concurrent runs")
+    args = parser.parse_args()
+    asyncio.run(main(args.calls, args.runs))
@@ -0,0 +1,114 @@
+"""
+Overhead of ProfilingRunner on FakeModel runs that exercise every phase (input
+and output guardrails, a handoff, a tool call): plain AgentRunner vs profiling
+off, sampling 1% and profiling every run (with and without stack sampling).
+Then one profiled run's phase breakdown and output files.
+
+    python -m benchmarks.profiling_runner --runs 300 --latency-ms 2
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+from agents import (
+    Agent,
+    GuardrailFunctionOutput,
+    handoff,
+    function_tool,
+    input_guardrail,
+    output_guardrail,
+    set_tracing_disabled,
+)
+from agents.run import AgentRunner
+
+from fake_model import FakeModel, function_call
+from profiling_runner import ProfilingRunner
+
+set_tracing_disabled(True)
+
+
+@function_tool
+def lookup(city: str) -> str:
+    # a little CPU work on the loop, so the stack samples have something to show
+    return f"weather of {city} is " + ("cloudy" if sum(i * i for i in range(20_000)) % 2 else "sunny")
+
+
+@input_guardrail
+async def polite(ctx, agent, input) -> GuardrailFunctionOutput:
+    await asyncio.sleep(0.001)
+    return GuardrailFunctionOutput(output_info=None, tripwire_triggered=False)
+
+
+@output_guardrail
+async def short(ctx, agent, output) -> GuardrailFunctionOutput:
+    return GuardrailFunctionOutput(output_info=None, tripwire_triggered=len(str(output)) > 10_000)
+
+
+def build_agents(latency: float) -> Agent:
+    def specialist_reply(system_instructions, input):
+        called = any(isinstance(item, dict) and item.get("name") == "lookup" for item in input)
+        return "cloudy" if called else [function_call("lookup", {"city": "Lahore"})]
+
+    specialist = Agent(
+        name="weather_specialist",
+        model=FakeModel(specialist_reply, latency=latency),
+        tools=[lookup],
+        output_guardrails=[short],
+    )
+    return Agent(
+        name="triage",
+        model=FakeModel(latency=latency, seed=1),
+        handoffs=[handoff(specialist)],
+        input_guardrails=[polite],
+    )
+
+
+async def timed(runners: dict[str, AgentRunner], agent: Agent, runs: int) -> dict[str, list[float]]:
+    """Round-robin over the runners, so drift in machine load hits them all alike."""
+    timings: dict[str, list[float]] = {label: [] for label in runners}
+    for _ in range(runs):
+        for label, runner in runners.items():
+            start = time.perf_counter()
+            await runner.run(agent, "what is the weather in Lahore?", max_turns=5)
+            timings[label].append(time.perf_counter() - start)
+    return timings
+
+
+async def main(runs: int, latency: float) -> None:
+    agent = build_agents(latency)
+    with tempfile.TemporaryDirectory() as out_dir:
+        runners = {
+            "AgentRunner": AgentRunner(),
+            "ProfilingRunner, off": ProfilingRunner(),
+            "ProfilingRunner, 1% sampled": ProfilingRunner(0.01, out_dir, seed=0),
+            "ProfilingRunner, all, phases only": ProfilingRunner(1.0, out_dir, stack_interval=None),
+            "ProfilingRunner, all, 5ms stacks": ProfilingRunner(1.0, out_dir, stack_interval=0.005),
+        }
+        await timed({"warm-up": AgentRunner()}, agent, 20)
+        timings = await timed(runners, agent, runs)
+        baseline = statistics.median(timings["AgentRunner"])
+        for label, times in timings.items():
+            median = statistics.median(times)
+            print(f"{label:<36} {median * 1000:7.3f} ms/run median  ({(median / baseline - 1) * 100:+5.1f}%)")
+
+        for runner in runners.values():
+            if isinstance(runner, ProfilingRunner):
+                runner.flush()
+        profile = runners["ProfilingRunner, all, 5ms stacks"].last_profile
+        print(f"\nlast profiled run: {profile.seconds * 1000:.2f} ms")
+        for phase, seconds in sorted(profile.totals().items(), key=lambda item: -item[1]):
+            print(f"  {phase:<18} {seconds * 1000:7.2f} ms")
+        files = sorted(os.listdir(out_dir))
+        print(f"{len(files)} files written, e.g. {files[-2]} and {files[-1]}")
+        print("hottest stack:", (profile.collapsed().splitlines() or ["(no samples)"])[0][-160:])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=300)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.runs, args.latency_ms / 1000))
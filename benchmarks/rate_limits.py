@@ -0,0 +1,128 @@
+"""
+Rate-limit simulation against the stub server enforcing per-model request and
+token limits (a compressed "minute" of `--window` seconds). A burst of batch
+calls (story generation, BATCH priority) lands at t=0 while interactive calls
+(routing turns) keep arriving at `--interactive-rps`. Three clients:
+
+- no scheduler: the SDK model as the flows use it today, openai's own 2
+  retries on 429;
+- scheduler, configured limits: RateLimitScheduler with the stub's limits,
+  client retries off, 429s retried through the queue;
+- scheduler, learned limits: no limits configured, only what the x-ratelimit-*
+  headers and retry-after tell it.
+
+Reports goodput, failures, 429s the stub sent and latency per class.
+
+    python -m benchmarks.rate_limits --batch 150 --interactive-rps 4 --duration 10
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from agents import AsyncOpenAI, ModelSettings, OpenAIChatCompletionsModel, set_tracing_disabled
+from agents.models.interface import ModelTracing
+
+from benchmarks.stub_server import StubServer
+from provider import PoolSettings
+from rate_limits import BATCH, INTERACTIVE, Limits, RateLimitScheduler, ScheduledModel, observe_response, request_priority
+
+set_tracing_disabled(True)
+MODEL = "gpt-4o-mini"
+
+
+def percentile(values: list[float], p: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+async def call(model, priority: int, text: str, results: dict[str, list]) -> None:
+    label = "interactive" if priority == INTERACTIVE else "batch"
+    start = time.perf_counter()
+    try:
+        with request_priority(priority):
+            await model.get_response(
+                "You are a helpful assistant.", text, ModelSettings(max_tokens=64), [], None, [],
+                ModelTracing.DISABLED, previous_response_id=None, prompt=None,
+            )
+        results[label].append(time.perf_counter() - start)
+    except Exception:
+        results[label + " failed"].append(time.perf_counter() - start)
+
+
+async def workload(model, args: argparse.Namespace) -> tuple[dict[str, list], float]:
+    results: dict[str, list] = {"interactive": [], "batch": [], "interactive failed": [], "batch failed": []}
+    rng = random.Random(args.seed)
+    start = time.perf_counter()
+    tasks = [
+        asyncio.create_task(call(model, BATCH, f"Write story outline #{i} about a lighthouse keeper. " * 4, results))
+        for i in range(args.batch)
+    ]
+    elapsed = 0.0
+    while elapsed < args.duration:
+        await asyncio.sleep(rng.expovariate(args.interactive_rps))
+        tasks.append(asyncio.create_task(call(model, INTERACTIVE, "Bonjour, ma commande n'est pas arrivée.", results)))
+        elapsed = time.perf_counter() - start
+    await asyncio.gather(*tasks)
+    return results, time.perf_counter() - start
+
+
+def build(stub: StubServer, scheduler: RateLimitScheduler | None):
+    hooks = {"response": [observe_response]} if scheduler is not None else None
+    client = AsyncOpenAI(
+        api_key="stub",
+        base_url=stub.base_url,
+        http_client=PoolSettings().build_http_client(hooks),
+        **({"max_retries": 0} if scheduler is not None else {}),
+    )
+    model = OpenAIChatCompletionsModel(model=MODEL, openai_client=client)
+    if scheduler is not None:
+        model = ScheduledModel(model, scheduler, f"stub/{MODEL}", max_attempts=6)
+    return client, model
+
+
+async def main(args: argparse.Namespace) -> None:
+    limits = (args.rpw, args.tpw)
+    modes = {
+        "no scheduler (SDK retries)": None,
+        "scheduler, configured limits": RateLimitScheduler(default=Limits(*limits, per=args.window)),
+        "scheduler, learned from headers": RateLimitScheduler(default=Limits(per=args.window)),
+    }
+    print(
+        f"stub limits: {args.rpw:.0f} requests / {args.tpw:.0f} tokens per {args.window}s; "
+        f"{args.batch} batch calls at t=0, {args.interactive_rps}/s interactive for {args.duration}s\n"
+    )
+    for label, scheduler in modes.items():
+        with StubServer(response_delay=args.latency_ms / 1000, rate_limits={MODEL: limits}, rate_window=args.window) as stub:
+            client, model = build(stub, scheduler)
+            results, elapsed = await workload(model, args)
+            await client.close()
+            ok = len(results["interactive"]) + len(results["batch"])
+            print(
+                f"{label:<32} goodput={ok / elapsed:5.1f}/s  ok={ok} "
+                f"failed={len(results['interactive failed']) + len(results['batch failed'])}  "
+                f"429s={stub.rate_limited} of {stub.requests} requests  in {elapsed:.1f}s"
+            )
+            for kind in ("interactive", "batch"):
+                times = results[kind]
+                print(
+                    f"  {kind:<12} p50={statistics.median(times) if times else float('nan'):6.2f}s  "
+                    f"p99={percentile(times, 0.99):6.2f}s  max={max(times, default=float('nan')):6.2f}s  "
+                    f"failed={len(results[kind + ' failed'])}"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rpw", type=float, default=20, help="requests per window the stub allows")
+    parser.add_argument("--tpw", type=float, default=4000, help="tokens per window the stub allows")
+    parser.add_argument("--window", type=float, default=1.0, help="seconds standing in for a minute")
+    parser.add_argument("--batch", type=int, default=150)
+    parser.add_argument("--interactive-rps", type=float, default=4.0)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
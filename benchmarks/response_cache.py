@@ -0,0 +1,78 @@
+"""
+Repeated identical Runner.run calls with and without CachedModel, against a fake model
+with `--latency-ms` of simulated round-trip.
+
+    python -m benchmarks.response_cache --runs 50
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+from agents import Agent, ModelSettings, Runner, set_tracing_disabled
+
+from response_cache import CachedModel, MemoryCache, SQLiteCache
+from fake_model import FakeModel
+
+
+set_tracing_disabled(True)
+
+
+async def timed_runs(agent: Agent, runs: int) -> list[float]:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await Runner.run(agent, "Translate 'good morning' to Spanish")
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+async def timed_lookups(model: CachedModel, runs: int) -> list[float]:
+    """Time the model call alone (what the cache actually replaces), not the whole agent loop."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await model.get_response(
+            "You translate the user's message to Spanish", "good morning", ModelSettings(), [], None, [], None,
+            previous_response_id=None,
+        )
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(name: str, timings: list[float]) -> None:
+    us = [t * 1e6 for t in timings]
+    print(f"{name:<28} first={us[0]:10.1f}us  median(rest)={statistics.median(us[1:]):10.1f}us")
+
+
+async def main(runs: int, latency: float) -> None:
+    plain = FakeModel("buenos días", latency=latency)
+    report("no cache (Runner.run)", await timed_runs(Agent(name="spanish_agent", model=plain), runs))
+
+    memory = CachedModel(FakeModel("buenos días", latency=latency), MemoryCache(maxsize=128, ttl=600))
+    report("memory LRU (Runner.run)", await timed_runs(Agent(name="spanish_agent", model=memory), runs))
+    report("memory LRU (model call)", await timed_lookups(memory, runs))
+    print(f"  stats: {memory.stats} hit_rate={memory.stats.hit_rate:.2%}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite_cache = SQLiteCache(os.path.join(tmp, "cache.sqlite3"), ttl=600)
+        disk = CachedModel(FakeModel("buenos días", latency=latency), sqlite_cache)
+        report("sqlite (Runner.run)", await timed_runs(Agent(name="spanish_agent", model=disk), runs))
+        report("sqlite (model call)", await timed_lookups(disk, runs))
+        print(f"  stats: {disk.stats} hit_rate={disk.stats.hit_rate:.2%}")
+        sqlite_cache.close()
+
+    hot = CachedModel(FakeModel("¡hola!", latency=latency))
+    creative = Agent(name="creative", model=hot, model_settings=ModelSettings(temperature=0.9))
+    await timed_runs(creative, 3)
+    print(f"temperature=0.9 agent stats: {hot.stats} (bypassed, model called {hot.model.calls} times)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.runs, args.latency_ms / 1000))
@@ -0,0 +1,106 @@
+"""
+100k synthetic deltas: print(delta, flush=True) per delta vs StreamPipeline batching,
+plus a slow queue consumer to show that backpressure keeps memory bounded.
+
+    python -m benchmarks.stream_pipeline --deltas 100000
+"""
+import argparse
+import asyncio
+import io
+import os
+import time
+
+from agents import Agent, Runner, set_tracing_disabled
+
+from fake_model import FakeModel
+from stream_pipeline import QueueSink, StdoutSink, StreamPipeline
+
+set_tracing_disabled(True)
+
+
+class CountingStream(io.TextIOBase):
+    """devnull text stream that counts flushes (each one is a write syscall on a real tty/pipe)."""
+
+    def __init__(self):
+        self.devnull = open(os.devnull, "w")
+        self.flushes = 0
+
+    def write(self, text: str) -> int:
+        return self.devnull.write(text)
+
+    def flush(self) -> None:
+        self.flushes += 1
+        self.devnull.flush()
+
+
+def deltas(count: int) -> list[str]:
+    return [f"tok{i % 97} " for i in range(count)]
+
+
+def per_delta_print(tokens: list[str]) -> tuple[float, int]:
+    stream = CountingStream()
+    start = time.perf_counter()
+    for token in tokens:
+        print(token, end="", flush=True, file=stream)
+    return time.perf_counter() - start, stream.flushes
+
+
+async def pipeline(tokens: list[str], max_chars: int) -> tuple[float, int, StreamPipeline]:
+    stream = CountingStream()
+    pipe = StreamPipeline([StdoutSink(stream)], max_chars=max_chars)
+    start = time.perf_counter()
+    drainer = asyncio.create_task(pipe.drain())
+    for token in tokens:
+        await pipe.put(token)
+    await pipe.finish()
+    await drainer
+    return time.perf_counter() - start, stream.flushes, pipe
+
+
+async def slow_consumer(tokens: list[str], queue_size: int) -> tuple[float, int]:
+    sink = QueueSink(maxsize=4)
+    pipe = StreamPipeline([sink], max_chars=64, queue_size=queue_size)
+    max_depth = 0
+
+    async def client():
+        while (batch := await sink.queue.get()) is not None:
+            await asyncio.sleep(0.0005)  # e.g. a slow WebSocket peer
+
+    reader = asyncio.create_task(client())
+    drainer = asyncio.create_task(pipe.drain())
+    start = time.perf_counter()
+    for token in tokens:
+        await pipe.put(token)
+        max_depth = max(max_depth, pipe._queue.qsize())
+    await pipe.finish()
+    await drainer
+    await reader
+    return time.perf_counter() - start, max_depth
+
+
+async def main(count: int) -> None:
+    tokens = deltas(count)
+    elapsed, flushes = per_delta_print(tokens)
+    print(f"print(flush=True) per delta   {elapsed * 1000:8.1f}ms  flushes={flushes}")
+    for max_chars in (64, 256, 4096):
+        elapsed, flushes, pipe = await pipeline(tokens, max_chars)
+        print(f"StreamPipeline max_chars={max_chars:<5} {elapsed * 1000:8.1f}ms  flushes={flushes}")
+    elapsed, depth = await slow_consumer(tokens[: count // 10], queue_size=256)
+    print(f"slow consumer ({count // 10} deltas)   {elapsed * 1000:8.1f}ms  max queue depth={depth} (bound 256)")
+
+    model = FakeModel(" ".join(tokens[:500]), latency=0.05, stream_delay=0.001)
+    result = Runner.run_streamed(Agent(name="assistant_agent", model=model), "hi")
+    pipe = StreamPipeline([StdoutSink(CountingStream())])
+    await pipe.consume(result)
+    summary = pipe.stats.summary()
+    print(
+        f"fake model stream: ttft={summary['ttft_ms']:.1f}ms  gap p50={summary['gap_p50_ms']:.2f}ms  "
+        f"p99={summary['gap_p99_ms']:.2f}ms  deltas={summary['deltas']} flushes={summary['flushes']}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--deltas", type=int, default=100_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.deltas))
@@ -0,0 +1,108 @@
+"""
+Headless load test for streamlit_app.py: `--sessions` browser sessions, each an
+AppTest driven from its own thread, send `--turns` chat messages at once
+against the offline FakeModel (streamed at `--tokens-per-second`). Reports the
+latency of every rerun that answers a message (the script run, the agent run
+and streaming the answer into the page), and checks that all sessions shared
+one background event loop and how much transcript each session still holds.
+
+    python -m benchmarks.streamlit_app --sessions 50 --turns 3
+"""
+import argparse
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+APP = str(Path(__file__).resolve().parent.parent / "streamlit_app.py")
+MESSAGES = [
+    "Bonjour, pouvez-vous m'aider avec ma commande ?",
+    "Hola, necesito ayuda con mi pedido",
+    "Hi, my order has not arrived yet",
+]
+
+
+def percentile(values: list[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def share_runtime() -> None:
+    """
+    AppTest installs a mock Runtime as a process-wide singleton for each run and
+    clears it when the run ends, so with sessions in threads one session's
+    teardown can pull it out from under another's script run ("Runtime hasn't
+    been created!"). Fall back to the last one installed instead.
+    """
+    from streamlit.runtime import Runtime
+
+    original = Runtime.instance.__func__
+    last = []
+
+    def instance(cls):
+        if cls._instance is None and last:
+            return last[0]
+        last[:] = [original(cls)]
+        return last[0]
+
+    Runtime.instance = classmethod(instance)
+
+
+def session(index: int, turns: int, start: threading.Barrier) -> tuple[float, list[float], int]:
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(APP, default_timeout=120)
+    t = time.perf_counter()
+    app.run()
+    first = time.perf_counter() - t
+    start.wait()  # every session is loaded: now all of them chat at once
+    reruns = []
+    for turn in range(turns):
+        t = time.perf_counter()
+        app.chat_input[0].set_value(MESSAGES[(index + turn) % len(MESSAGES)]).run()
+        reruns.append(time.perf_counter() - t)
+        if app.exception or app.error:
+            raise RuntimeError(f"session {index}: {list(app.exception) or [e.value for e in app.error]}")
+    return first, reruns, app.session_state.history.total_tokens
+
+
+def main(args: argparse.Namespace) -> None:
+    os.environ.update(
+        MODEL_BACKEND="fake",
+        FAKE_MODEL_LATENCY=str(args.latency_ms / 1000),
+        FAKE_MODEL_TOKENS_PER_SECOND=str(args.tokens_per_second),
+        FAKE_MODEL_TEXT=" ".join(["Merci, je regarde votre commande tout de suite."] * 4),
+    )
+    share_runtime()
+    barrier = threading.Barrier(args.sessions)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(args.sessions) as pool:
+        results = list(pool.map(lambda i: session(i, args.turns, barrier), range(args.sessions)))
+    elapsed = time.perf_counter() - started
+
+    firsts = [first for first, _, _ in results]
+    reruns = [seconds for _, times, _ in results for seconds in times]
+    loops = sum(thread.name == "streamlit-agents" for thread in threading.enumerate())
+    print(
+        f"first load    p50={statistics.median(firsts) * 1000:7.1f} ms  max={max(firsts) * 1000:7.1f} ms  "
+        "(one of them imports the flows)"
+    )
+    print(
+        f"chat reruns   p50={statistics.median(reruns) * 1000:7.1f} ms  p90={percentile(reruns, 0.9) * 1000:7.1f} ms  "
+        f"p99={percentile(reruns, 0.99) * 1000:7.1f} ms  n={len(reruns)}"
+    )
+    print(
+        f"{args.sessions} sessions x {args.turns} turns in {elapsed:.2f}s; background loops: {loops}; "
+        f"transcript tokens held per session: max {max(tokens for _, _, tokens in results)}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="fake model latency per call")
+    parser.add_argument("--tokens-per-second", type=float, default=200.0)
+    main(parser.parse_args())
@@ -0,0 +1,333 @@
+"""
+Local OpenAI-compatible stub server for benchmarks.
+
+Serves just enough of the API for AsyncOpenAI/OpenAIChatCompletionsModel:
+GET /v1/models and POST /v1/chat/completions (plain and SSE streaming), plus
+POST /v1/responses answering with an image_generation_call that carries the
+canned `image_b64`, and POST /v1/traces as an OTLP/HTTP JSON collector that
+counts the spans it receives. `handshake_delay` is slept once per new TCP connection to
+stand in for the TCP+TLS setup cost of a real provider; `response_delay` is
+slept per request. `error_rate` of the POSTs fail with a 429 (with
+Retry-After) or a 503. `rate_limits` ({model: (requests, tokens)} per
+`rate_window` seconds) enforces OpenAI-style limits on chat completions: token
+buckets per model, charged ~4 characters per prompt token plus `max_tokens`,
+x-ratelimit-* headers on every response and a 429 with Retry-After once a
+bucket runs dry.
+
+`FileServer` serves files from a directory with HTTP Range support, and can
+cut the first response for each file short to exercise resumable downloads and
+cap each connection's bandwidth.
+"""
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+        if self.server.handshake_delay:
+            time.sleep(self.server.handshake_delay)
+
+    def _send_json(self, payload: dict, status: int = 200, headers: dict[str, str] | None = None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self._send_json({"object": "list", "data": [{"id": "stub", "object": "model", "created": 0, "owned_by": "stub"}]})
+        else:
+            self._send_json({"error": {"message": "not found"}}, status=404)
+
+    def do_POST(self):
+        path = self.path.rstrip("/")
+        if path.endswith("/traces"):
+            self._receive_traces()
+            return
+        if not path.endswith(("/chat/completions", "/responses")):
+            self._read_json()
+            self._send_json({"error": {"message": "not found"}}, status=404)
+            return
+        request = self._read_json()
+        self.server.requests += 1
+        limit_headers = None
+        if self.server.rate_limits and path.endswith("/chat/completions"):
+            limit_headers = self.server.charge(request)
+            if "retry-after" in limit_headers:
+                self._send_json({"error": {"message": "rate limited", "type": "rate_limit_error"}}, 429, limit_headers)
+                return
+        if self.server.response_delay:
+            time.sleep(self.server.response_delay)
+        if self.server.error_rate and self.server.rng.random() < self.server.error_rate:
+            self.server.errors += 1
+            self._send_error()
+            return
+        if path.endswith("/responses"):
+            self._send_image_response(request)
+            return
+        text = self.server.reply
+        model = request.get("model", "stub")
+        if request.get("stream"):
+            self._stream_chat(model, text, limit_headers)
+        else:
+            self._send_json({
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 10, "completion_tokens": len(text.split()), "total_tokens": 10 + len(text.split())},
+            }, headers=limit_headers)
+
+    def _receive_traces(self):
+        # an OTLP/HTTP JSON collector: count what arrives, optionally slowly
+        request = self._read_json()
+        if self.server.response_delay:
+            time.sleep(self.server.response_delay)
+        spans = sum(
+            len(scope.get("spans", []))
+            for resource in request.get("resourceSpans", [])
+            for scope in resource.get("scopeSpans", [])
+        )
+        with self.server.lock:
+            self.server.trace_batches += 1
+            self.server.spans_received += spans
+        self._send_json({"partialSuccess": {}})
+
+    def _send_error(self):
+        if self.server.rng.random() < 0.5:
+            body = json.dumps({"error": {"message": "rate limited", "type": "rate_limit_error"}}).encode()
+            self.send_response(429)
+            self.send_header("Retry-After", "0.05")
+        else:
+            body = json.dumps({"error": {"message": "overloaded", "type": "server_error"}}).encode()
+            self.send_response(503)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_image_response(self, request: dict):
+        self._send_json({
+            "id": f"resp_stub{self.server.requests}",
+            "object": "response",
+            "created_at": int(time.time()),
+            "model": request.get("model", "stub"),
+            "status": "completed",
+            "parallel_tool_calls": True,
+            "tool_choice": "auto",
+            "tools": request.get("tools", []),
+            "output": [
+                {"id": f"ig_stub{self.server.requests}", "type": "image_generation_call", "status": "completed", "result": self.server.image_b64},
+            ],
+            "usage": {
+                "input_tokens": 20,
+                "input_tokens_details": {"cached_tokens": 0},
+                "output_tokens": 1000,
+                "output_tokens_details": {"reasoning_tokens": 0},
+                "total_tokens": 1020,
+            },
+        })
+
+    def _stream_chat(self, model: str, text: str, headers: dict[str, str] | None = None):
+        self.send_response(200)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def chunk(delta: dict, finish_reason=None):
+            payload = {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+            }
+            self._write_chunk(f"data: {json.dumps(payload)}\n\n".encode())
+
+        chunk({"role": "assistant", "content": ""})
+        for word in text.split(" "):
+            chunk({"content": word + " "})
+        chunk({}, finish_reason="stop")
+        self._write_chunk(b"data: [DONE]\n\n")
+        self._write_chunk(b"")
+
+    def _write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        handler=StubHandler,
+        handshake_delay: float = 0.0,
+        response_delay: float = 0.0,
+        reply: str = "hello from the stub",
+        image_b64: str = "",
+        error_rate: float = 0.0,
+        seed: int = 0,
+        rate_limits: dict[str, tuple[float, float]] | None = None,
+        rate_window: float = 60.0,
+    ):
+        super().__init__(("127.0.0.1", 0), handler)
+        self.handshake_delay = handshake_delay
+        self.response_delay = response_delay
+        self.reply = reply
+        self.image_b64 = image_b64
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.connections = 0
+        self.requests = 0
+        self.errors = 0
+        self.trace_batches = 0
+        self.spans_received = 0
+        self.lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self.rate_limits = rate_limits or {}
+        self.rate_window = rate_window
+        self.rate_limited = 0
+        self._buckets: dict[str, list[float]] = {}  # model -> [requests left, tokens left, last refill]
+
+    def charge(self, request: dict) -> dict[str, str]:
+        """Take one request and its tokens from the model's buckets; the response headers, with retry-after if refused."""
+        model = request.get("model", "stub")
+        requests_limit, tokens_limit = self.rate_limits.get(model, (float("inf"), float("inf")))
+        tokens = len(json.dumps(request.get("messages", []))) // 4 + (request.get("max_tokens") or 16)
+        with self.lock:
+            now = time.monotonic()
+            bucket = self._buckets.setdefault(model, [requests_limit, tokens_limit, now])
+            elapsed, bucket[2] = now - bucket[2], now
+            bucket[0] = min(requests_limit, bucket[0] + elapsed * requests_limit / self.rate_window)
+            bucket[1] = min(tokens_limit, bucket[1] + elapsed * tokens_limit / self.rate_window)
+            wait = max((
+                (need - left) * self.rate_window / limit
+                for need, left, limit in ((1, bucket[0], requests_limit), (min(tokens, tokens_limit), bucket[1], tokens_limit))
+                if limit != float("inf")
+            ), default=0.0)
+            if wait <= 0:
+                bucket[0] -= 1
+                bucket[1] -= tokens
+            else:
+                self.rate_limited += 1
+            headers = {}
+            for kind, limit, left in (("requests", requests_limit, bucket[0]), ("tokens", tokens_limit, bucket[1])):
+                if limit != float("inf"):
+                    headers[f"x-ratelimit-limit-{kind}"] = str(int(limit))
+                    headers[f"x-ratelimit-remaining-{kind}"] = str(max(0, int(left)))
+                    headers[f"x-ratelimit-reset-{kind}"] = f"{int((limit - left) * self.rate_window / limit * 1000)}ms"
+            if wait > 0:
+                headers["retry-after"] = f"{wait:.3f}"
+            return headers
+
+    def handle_error(self, request, client_address):
+        # clients going away mid-response (cancelled benchmark runs) are expected here
+        if not isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            super().handle_error(request, client_address)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1/"
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class FileHandler(StubHandler):
+    def do_GET(self):
+        path = os.path.join(self.server.directory, os.path.basename(self.path.split("?", 1)[0]))
+        if not os.path.isfile(path):
+            self._send_json({"error": {"message": "not found"}}, status=404)
+            return
+        self.server.requests += 1
+        size = os.path.getsize(path)
+        etag = f'"{size}-{int(os.path.getmtime(path))}"'
+        start, end = 0, size - 1
+        range_header = self.headers.get("Range")
+        if range_header and self.headers.get("If-Range", etag) == etag:
+            first, _, last = range_header.removeprefix("bytes=").partition("-")
+            start, end = int(first), int(last) if last else size - 1
+            if start >= size:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("ETag", etag)
+        self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+
+        limit = end - start + 1
+        if self.server.drop_after and path not in self.server.dropped and limit > self.server.drop_after:
+            # first response for this file: send part of the body, then hang up
+            self.server.dropped.add(path)
+            limit = self.server.drop_after
+            self.close_connection = True
+        with open(path, "rb") as f:
+            f.seek(start)
+            while limit > 0:
+                data = f.read(min(limit, 256 * 1024))
+                if not data:
+                    break
+                self.wfile.write(data)
+                if self.server.bytes_per_second:
+                    time.sleep(len(data) / self.server.bytes_per_second)
+                self.server.bytes_sent += len(data)
+                limit -= len(data)
+
+
+class FileServer(StubServer):
+    def __init__(self, directory: str, handshake_delay: float = 0.0, drop_after: int = 0, bytes_per_second: float = 0.0):
+        super().__init__(FileHandler, handshake_delay=handshake_delay)
+        self.directory = directory
+        self.bytes_per_second = bytes_per_second  # per connection, like a slow or distant link
+        self.drop_after = drop_after
+        self.dropped: set[str] = set()
+        self.bytes_sent = 0
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/"
@@ -0,0 +1,98 @@
+"""
+100 concurrent agent runs, each calling one blocking tool, with the SDK's
+`function_tool` (sync tools run on the event loop) vs `ToolExecutor.tool`
+(thread pool for blocking I/O, process pool for CPU-bound work). Reports wall
+time and how late a 10ms heartbeat task runs (event loop stalls).
+
+    python -m benchmarks.tool_executor --runs 100 --io-ms 50 --cpu-ms 20
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import time
+
+from agents import Agent, Runner, function_tool, set_tracing_disabled
+
+from fake_model import FakeModel
+from tool_executor import ToolExecutor
+
+set_tracing_disabled(True)
+
+IO_SECONDS = float(os.getenv("BENCH_IO_MS", "50")) / 1000
+CPU_SECONDS = float(os.getenv("BENCH_CPU_MS", "20")) / 1000
+
+executor = ToolExecutor(max_threads=32)
+
+
+def lookup(city: str) -> str:
+    """Look up the weather for a city (blocking HTTP call)."""
+    time.sleep(IO_SECONDS)
+    return f"weather of {city} is cloudy"
+
+
+def checksum(text: str) -> str:
+    """Hash the text over and over (CPU-bound)."""
+    digest = text.encode()
+    deadline = time.process_time() + CPU_SECONDS
+    while time.process_time() < deadline:
+        for _ in range(1000):
+            digest = hashlib.sha256(digest).digest()
+    return digest.hex()[:16]
+
+
+inline_lookup = function_tool(lookup)
+inline_checksum = function_tool(checksum)
+threaded_lookup = executor.tool(lookup, timeout=30)
+process_checksum = executor.tool(checksum, cpu_bound=True, timeout=30)
+
+
+async def heartbeat(lags: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        lags.append(time.perf_counter() - start - 0.01)
+
+
+async def timed(label: str, tool, runs: int) -> None:
+    agent = Agent(name="tool_user", model=FakeModel(latency=0.005, text="Lahore"), tools=[tool])
+    lags: list[float] = []
+    stop = asyncio.Event()
+    beat = asyncio.create_task(heartbeat(lags, stop))
+    await asyncio.sleep(0.02)
+    start = time.perf_counter()
+    results = await asyncio.gather(*(Runner.run(agent, "go", max_turns=3) for _ in range(runs)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await beat
+    assert all(r.final_output == "Lahore" for r in results)
+    lags.sort()
+    print(
+        f"{label:<34} {elapsed * 1000:8.1f} ms  loop stall p50={lags[len(lags) // 2] * 1000:6.1f}ms "
+        f"max={lags[-1] * 1000:7.1f}ms"
+    )
+
+
+async def main(runs: int) -> None:
+    await timed("blocking I/O, function_tool", inline_lookup, runs)
+    await timed("blocking I/O, executor threads", threaded_lookup, runs)
+    await timed("CPU-bound, function_tool", inline_checksum, runs)
+    # warm the pool so worker start-up is not counted
+    await asyncio.gather(*(asyncio.get_running_loop().run_in_executor(executor.processes, time.sleep, 0) for _ in range(4)))
+    await timed("CPU-bound, executor processes", process_checksum, runs)
+    for name, summary in executor.report().items():
+        print(f"  {name}: {summary}")
+    executor.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--io-ms", type=float, default=50.0)
+    parser.add_argument("--cpu-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    # read at import by the tool functions, so process-pool workers see them too
+    os.environ["BENCH_IO_MS"] = str(args.io_ms)
+    os.environ["BENCH_CPU_MS"] = str(args.cpu_ms)
+    IO_SECONDS, CPU_SECONDS = args.io_ms / 1000, args.cpu_ms / 1000
+    asyncio.run(main(args.runs))
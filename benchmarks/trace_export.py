@@ -0,0 +1,105 @@
+"""
+Trace processors under load. First the cost each finished span adds on the
+agent's thread: no processor, the SDK's BatchTraceProcessor and
+SamplingBatchProcessor (keep everything / 10% head + keep errored traces).
+Then a burst of traces against a slow OTLP collector (the stub server) with a
+small ring buffer, counting exported, sampled-out and dropped spans.
+
+    python -m benchmarks.trace_export --traces 2000 --spans 20
+"""
+import argparse
+import logging
+import random
+import time
+
+from agents import set_trace_processors, set_tracing_disabled
+from agents.tracing import SpanError, custom_span, trace
+from agents.tracing.processor_interface import TracingExporter
+from agents.tracing.processors import BatchTraceProcessor
+
+from benchmarks.stub_server import StubServer
+from trace_export import OTLPHttpExporter, SamplingBatchProcessor
+
+set_tracing_disabled(False)
+# the SDK's processor logs every span it drops once its queue is full
+logging.getLogger("openai.agents").setLevel(logging.ERROR)
+
+
+class NullExporter(TracingExporter):
+    def __init__(self):
+        self.items = 0
+
+    def export(self, items) -> None:
+        self.items += len(items)
+
+
+def produce(traces: int, spans: int, error_rate: float = 0.0, seed: int = 0) -> float:
+    """Seconds spent creating `traces` traces of `spans` spans each."""
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    for _ in range(traces):
+        with trace("bench"):
+            for i in range(spans):
+                with custom_span("step", {"i": i}) as span:
+                    if error_rate and rng.random() < error_rate:
+                        span.set_error(SpanError(message="tool failed", data=None))
+    return time.perf_counter() - start
+
+
+def overhead(traces: int, spans: int) -> None:
+    set_trace_processors([])
+    produce(traces // 10, spans)  # warm up
+    baseline = produce(traces, spans)
+    total = traces * spans
+    print(f"{'no processor':<40} {baseline / total * 1e6:6.2f} us/span")
+    configs = {
+        "SDK BatchTraceProcessor": lambda e: BatchTraceProcessor(e),
+        "SamplingBatchProcessor, keep all": lambda e: SamplingBatchProcessor([e]),
+        "SamplingBatchProcessor, 10% + errors": lambda e: SamplingBatchProcessor([e], head_rate=0.1, seed=0),
+    }
+    for label, make in configs.items():
+        exporter = NullExporter()
+        processor = make(exporter)
+        set_trace_processors([processor])
+        elapsed = produce(traces, spans, error_rate=0.01)
+        processor.shutdown()
+        extra = (elapsed - baseline) / total * 1e6
+        print(f"{label:<40} {elapsed / total * 1e6:6.2f} us/span  (+{extra:5.2f})  exported={exporter.items}")
+    set_trace_processors([])
+
+
+def load(traces: int, spans: int, collector_delay: float, max_queue: int) -> None:
+    with StubServer(response_delay=collector_delay) as stub:
+        for head_rate in (1.0, 0.1):
+            processor = SamplingBatchProcessor(
+                [OTLPHttpExporter(stub.base_url + "traces")],
+                head_rate=head_rate,
+                max_queue=max_queue,
+                batch_size=256,
+                flush_interval=0.2,
+                seed=0,
+            )
+            set_trace_processors([processor])
+            before = stub.spans_received
+            elapsed = produce(traces, spans, error_rate=0.002)
+            processor.shutdown()
+            s = processor.stats
+            print(
+                f"head_rate={head_rate:<4} {s.spans / elapsed:9.0f} spans/s produced  "
+                f"traces kept: head={s.head_sampled} tail={s.tail_kept} sampled_out={s.sampled_out}  "
+                f"items dropped={s.dropped} exported={s.exported} batches={s.batches} export_errors={s.export_errors}  "
+                f"collector got {stub.spans_received - before} spans"
+            )
+    set_trace_processors([])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--traces", type=int, default=2000)
+    parser.add_argument("--spans", type=int, default=20)
+    parser.add_argument("--collector-delay-ms", type=float, default=50.0)
+    parser.add_argument("--max-queue", type=int, default=2048)
+    args = parser.parse_args()
+    overhead(args.traces, args.spans)
+    print()
+    load(args.traces, args.spans, args.collector_delay_ms / 1000, args.max_queue)
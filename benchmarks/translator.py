@@ -0,0 +1,115 @@
+"""
+The `translator` tool's backend: one chat.completions call per translation vs
+BatchingTranslator (LRU memo + in-flight coalescing + micro-batching), against
+a fake AsyncOpenAI-shaped client with `--latency-ms` of simulated round-trip.
+
+The workload is bursts of concurrent tool calls (what parallel_agent produces
+in one turn) drawn from a small phrase pool, so phrases repeat both within a
+burst and across bursts.
+
+    python -m benchmarks.translator --bursts 50 --burst-size 6
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from types import SimpleNamespace
+
+from translation import BatchingTranslator
+
+PHRASES = [
+    "good morning", "thank you very much", "where is the station?", "how much does this cost?",
+    "I would like a coffee", "the weather is nice today", "see you tomorrow", "can you help me?",
+    "I don't understand", "what time is it?", "nice to meet you", "the bill, please",
+]
+PAIRS = [("English", "French"), ("english", "Spanish"), ("English ", "german")]
+
+
+class FakeCompletions:
+    def __init__(self, latency: float, bad_json_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.bad_json_rate = bad_json_rate
+        self.calls = 0
+        self._random = random.Random(seed)
+
+    async def create(self, model: str, messages: list[dict], **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        target = messages[0]["content"].split(" to ")[-1].split(".")[0]
+        if kwargs.get("response_format"):
+            segments = json.loads(messages[1]["content"])["segments"]
+            if self._random.random() < self.bad_json_rate:
+                content = "Here are your translations: ..."
+            else:
+                content = json.dumps({"translations": [f"[{target}] {s}" for s in segments]})
+        else:
+            content = f"[{target}] {messages[1]['content']}"
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+class FakeClient:
+    def __init__(self, latency: float, bad_json_rate: float = 0.0):
+        self.chat = SimpleNamespace(completions=FakeCompletions(latency, bad_json_rate))
+
+
+async def naive_translate(client: FakeClient, from_language: str, to_language: str, text: str) -> str:
+    # what the tool did before: a fresh request for every call
+    response = await client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": f"You are a translator. Translate from {from_language} to {to_language}."},
+            {"role": "user", "content": text},
+        ],
+    )
+    return response.choices[0].message.content
+
+
+def workload(bursts: int, burst_size: int, seed: int) -> list[list[tuple[str, str, str]]]:
+    rng = random.Random(seed)
+    return [
+        [(*rng.choice(PAIRS), rng.choice(PHRASES)) for _ in range(burst_size)]
+        for _ in range(bursts)
+    ]
+
+
+async def run(translate, bursts: list[list[tuple[str, str, str]]]) -> tuple[float, list[str]]:
+    results = []
+    start = time.perf_counter()
+    for burst in bursts:
+        results += await asyncio.gather(*(translate(*call) for call in burst))
+    return time.perf_counter() - start, results
+
+
+async def main(args: argparse.Namespace) -> None:
+    latency = args.latency_ms / 1000
+    bursts = workload(args.bursts, args.burst_size, args.seed)
+    calls = sum(len(b) for b in bursts)
+
+    naive_client = FakeClient(latency)
+    elapsed, expected = await run(lambda *call: naive_translate(naive_client, *call), bursts)
+    print(f"{'per-call requests':<22} {calls} translations  api_calls={naive_client.chat.completions.calls:4d}  "
+          f"{elapsed * 1000:8.1f} ms")
+
+    client = FakeClient(latency, args.bad_json_rate)
+    translator = BatchingTranslator(client, window=args.window_ms / 1000, max_batch=args.max_batch)
+    elapsed, results = await run(translator.translate, bursts)
+    stats = translator.stats
+    print(f"{'BatchingTranslator':<22} {calls} translations  api_calls={client.chat.completions.calls:4d}  "
+          f"{elapsed * 1000:8.1f} ms")
+    print(f"  hit_rate={stats.hit_rate:.1%} coalesced={stats.coalesced} batched_segments={stats.batched_segments} "
+          f"fallbacks={stats.fallbacks} requests_saved={stats.requests_saved}")
+    normalized = [r.split("] ", 1)[1] for r in results]
+    assert normalized == [e.split("] ", 1)[1] for e in expected], "translations differ"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bursts", type=int, default=50)
+    parser.add_argument("--burst-size", type=int, default=6)
+    parser.add_argument("--latency-ms", type=float, default=40.0)
+    parser.add_argument("--window-ms", type=float, default=5.0)
+    parser.add_argument("--max-batch", type=int, default=16)
+    parser.add_argument("--bad-json-rate", type=float, default=0.0, help="fraction of batched replies that are not JSON")
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
@@ -1,31 +1,12 @@
 import asyncio
-import os
 from dataclasses import dataclass
-from dotenv import load_dotenv
-load_dotenv()
 
-from agents import Agent, RunConfig, RunContextWrapper, Runner, function_tool, OpenAIChatCompletionsModel
-from openai import AsyncOpenAI
+from agents import Agent, RunContextWrapper, Runner, function_tool
+from provider import get_model, get_run_config
 
-gemini_api_key = os.getenv("GEMINI_API_KEY")
-if not gemini_api_key:
-    raise ValueError("GEMINI_API_KEY environment variable not set")
+llm_model = get_model("gemini-2.5-flash")
 
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
-
-llm_model = OpenAIChatCompletionsModel(
-    openai_client=external_client,
-    model="gemini-2.5-flash",
-)
-
-config = RunConfig(
-    model=llm_model,
-    model_provider=external_client,
-    tracing_disabled=False,
-)
+config = get_run_config(llm_model, tracing_disabled=False)
 
 
 @dataclass
@@ -57,4 +38,5 @@ async def main():
 
     print(result.final_output)
 
-asyncio.run(main())
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(main())
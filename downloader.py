@@ -0,0 +1,168 @@
+"""
+Pooled, resumable downloads for image URLs.
+
+image_gen.py used a bare `requests.get` per image (a new TCP/TLS connection
+each time) and wrote 1 KiB at a time, with no retry and no resume. Here every
+download goes through one shared `requests.Session` whose connection pool is
+sized for the parallel mode, reads in chunks scaled to the Content-Length, and
+streams into `<path>.part`. If the connection drops, the next attempt asks for
+the rest with an HTTP Range request (guarded by If-Range so a changed file is
+fetched from scratch); the part file is renamed to `path` only when complete.
+
+    result = download("https://.../image.png", "otter.png")
+    results = download_many([(url, path), ...], max_workers=8)
+"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+MIN_CHUNK = 64 * 1024
+MAX_CHUNK = 4 * 1024 * 1024
+DEFAULT_CHUNK = 256 * 1024
+
+_lock = threading.Lock()
+_session: requests.Session | None = None
+_pool_size = 0
+
+
+def get_session(pool_size: int = 16) -> requests.Session:
+    """
+    Process-wide session; connection errors and 5xx on connect are retried by
+    urllib3. Asking for a bigger pool than the current one grows it.
+    """
+    global _session, _pool_size
+    with _lock:
+        if _session is None:
+            _session = requests.Session()
+        if pool_size > _pool_size:
+            retry = Retry(total=3, connect=3, read=0, backoff_factor=0.2, status_forcelist=(429, 500, 502, 503, 504))
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+            _pool_size = pool_size
+    return _session
+
+
+def chunk_size_for(length: int | None) -> int:
+    """~1/64th of the body, between 64 KiB and 4 MiB; 256 KiB when the length is unknown."""
+    if not length:
+        return DEFAULT_CHUNK
+    return max(MIN_CHUNK, min(MAX_CHUNK, length // 64))
+
+
+@dataclass
+class DownloadResult:
+    url: str
+    path: str
+    bytes: int = 0
+    resumed_from: int = 0
+    attempts: int = 0
+    seconds: float = 0.0
+    error: BaseException | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _validator(resp: requests.Response) -> str | None:
+    return resp.headers.get("ETag") or resp.headers.get("Last-Modified")
+
+
+def download(
+    url: str,
+    path: str,
+    session: requests.Session | None = None,
+    max_attempts: int = 5,
+    timeout: float = 30.0,
+) -> DownloadResult:
+    """
+    Download `url` to `path`, resuming from `<path>.part` when a previous attempt
+    (in this call or an earlier run) left one. Raises on the final failure.
+    """
+    session = session or get_session()
+    part_path = path + ".part"
+    meta_path = part_path + ".json"
+    result = DownloadResult(url, path)
+    start = time.perf_counter()
+
+    for attempt in range(1, max_attempts + 1):
+        result.attempts = attempt
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = {}
+        validator = None
+        if offset:
+            try:
+                with open(meta_path, encoding="utf-8") as f:
+                    validator = json.load(f).get("validator")
+            except (OSError, ValueError):
+                pass
+            headers["Range"] = f"bytes={offset}-"
+            if validator:
+                headers["If-Range"] = validator
+        try:
+            with session.get(url, stream=True, timeout=timeout, headers=headers) as resp:
+                if resp.status_code == 416:
+                    # the part file already holds everything (or is bogus): start over
+                    os.remove(part_path)
+                    continue
+                resp.raise_for_status()
+                if resp.status_code == 206:
+                    mode = "ab"
+                    result.resumed_from = result.resumed_from or offset
+                    total = int(resp.headers.get("Content-Range", "*/0").rsplit("/", 1)[-1] or 0) or None
+                else:
+                    # 200: the server ignored the range or the file changed
+                    mode, offset = "wb", 0
+                    total = int(resp.headers["Content-Length"]) if "Content-Length" in resp.headers else None
+                    with open(meta_path, "w", encoding="utf-8") as f:
+                        json.dump({"url": url, "validator": _validator(resp), "total": total}, f)
+                with open(part_path, mode) as f:
+                    for chunk in resp.iter_content(chunk_size_for(total)):
+                        f.write(chunk)
+            size = os.path.getsize(part_path)
+            if total is not None and size != total:
+                raise requests.exceptions.ChunkedEncodingError(f"got {size} of {total} bytes")
+            os.replace(part_path, path)
+            try:
+                os.remove(meta_path)
+            except FileNotFoundError:
+                pass
+            result.bytes = size
+            result.seconds = time.perf_counter() - start
+            result.error = None  # an earlier attempt may have failed before this one resumed
+            return result
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+            # keep the part file: the next attempt resumes from it
+            result.error = e
+            if attempt == max_attempts:
+                raise
+            time.sleep(min(2.0, 0.1 * 2 ** attempt))
+    raise result.error or RuntimeError(f"could not download {url}")
+
+
+def download_many(
+    items: list[tuple[str, str]],
+    max_workers: int = 8,
+    **kwargs,
+) -> list[DownloadResult]:
+    """Download (url, path) pairs in parallel over the shared pool; failures are returned, not raised."""
+    session = kwargs.pop("session", None) or get_session(max(16, max_workers))
+
+    def one(item: tuple[str, str]) -> DownloadResult:
+        url, path = item
+        start = time.perf_counter()
+        try:
+            return download(url, path, session=session, **kwargs)
+        except Exception as e:
+            return DownloadResult(url, path, error=e, seconds=time.perf_counter() - start)
+
+    with ThreadPoolExecutor(max_workers) as pool:
+        return list(pool.map(one, items))
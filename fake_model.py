@@ -0,0 +1,282 @@
+"""
+Scripted, offline stand-in for OpenAIChatCompletionsModel.
+
+No network and no API key: every call returns the next scripted reply after an
+optional delay, so flows can be exercised in benchmarks and load tests.
+
+    model = FakeModel(["first answer", "second answer"], latency=0.05)
+    agent = Agent(name="a", model=model)
+
+Without a script the model improvises from what the agent offers it: it hands
+off or calls a tool (with arguments built from the tool's JSON schema) when it
+has not yet seen a tool result, and otherwise answers with text or with an
+object that fits the agent's `output_type`. Latency can be drawn from a
+distribution (`parse_latency("lognormal:0.3,0.5")`), streaming can be paced in
+tokens per second, and a share of calls can be made to fail.
+
+`provider.get_model()` returns a FakeModel configured from FAKE_MODEL_*
+variables when MODEL_BACKEND=fake, so every script runs without keys.
+"""
+import asyncio
+import json
+import math
+import os
+import random
+import uuid
+from collections.abc import AsyncIterator, Callable
+from typing import Any
+
+import httpx
+from agents import FunctionTool, Model, ModelResponse, ModelSettings, ModelTracing, Tool, TResponseInputItem, Usage
+from agents.agent_output import AgentOutputSchemaBase
+from agents.handoffs import Handoff
+from openai import APITimeoutError
+from openai.types.responses import (
+    ResponseFunctionToolCall,
+    ResponseOutputItem,
+    ResponseOutputMessage,
+    ResponseOutputText,
+    ResponseTextDeltaEvent,
+)
+from pydantic import BaseModel
+
+from model_events import response_events
+
+Reply = str | dict | BaseModel | list[ResponseOutputItem]
+
+
+def text_message(text: str) -> ResponseOutputMessage:
+    return ResponseOutputMessage(
+        id=f"msg_{uuid.uuid4().hex[:12]}",
+        type="message",
+        role="assistant",
+        status="completed",
+        content=[ResponseOutputText(type="output_text", text=text, annotations=[])],
+    )
+
+
+def function_call(name: str, arguments: dict | str | None = None) -> ResponseFunctionToolCall:
+    """A tool call (or handoff, using the handoff's tool name) as the model would emit it."""
+    if not isinstance(arguments, str):
+        arguments = json.dumps(arguments or {})
+    return ResponseFunctionToolCall(
+        id=f"fc_{uuid.uuid4().hex[:12]}",
+        call_id=f"call_{uuid.uuid4().hex[:12]}",
+        type="function_call",
+        name=name,
+        arguments=arguments,
+    )
+
+
+def count_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token), good enough for fake usage numbers."""
+    return max(1, len(text) // 4)
+
+
+def parse_latency(spec: str | float, seed: int | None = None) -> Callable[[], float]:
+    """
+    Latency sampler from a spec: "0.2" (constant seconds), "uniform:LOW,HIGH",
+    "normal:MEAN,STDDEV" (clipped at 0) or "lognormal:MEDIAN,SIGMA" (long tail,
+    the usual shape of real provider latencies).
+    """
+    rng = random.Random(seed)
+    kind, _, args = str(spec).partition(":")
+    if not args:
+        value = float(kind)
+        return lambda: value
+    a, b = (float(x) for x in args.split(","))
+    if kind == "uniform":
+        return lambda: rng.uniform(a, b)
+    if kind == "normal":
+        return lambda: max(0.0, rng.gauss(a, b))
+    if kind == "lognormal":
+        return lambda: rng.lognormvariate(math.log(a), b)
+    raise ValueError(f"unknown latency distribution: {kind}")
+
+
+def sample_from_schema(schema: dict, text: str = "ok", defs: dict | None = None) -> Any:
+    """Smallest value that validates against a JSON schema (strict agent output / tool params)."""
+    defs = defs if defs is not None else schema.get("$defs", {})
+    if "$ref" in schema:
+        return sample_from_schema(defs[schema["$ref"].rsplit("/", 1)[-1]], text, defs)
+    if "const" in schema:
+        return schema["const"]
+    if "enum" in schema:
+        return schema["enum"][0]
+    if "default" in schema:
+        return schema["default"]
+    for key in ("anyOf", "oneOf", "allOf"):
+        if key in schema:
+            options = [option for option in schema[key] if option.get("type") != "null"] or schema[key]
+            return sample_from_schema(options[0], text, defs)
+    kind = schema.get("type", "object")
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), "null")
+    if kind == "object":
+        properties = schema.get("properties", {})
+        return {name: sample_from_schema(properties[name], text, defs) for name in schema.get("required", properties)}
+    if kind == "array":
+        return []
+    return {"string": text, "integer": 0, "number": 0.0, "boolean": False, "null": None}[kind]
+
+
+def timeout_error() -> Exception:
+    return APITimeoutError(request=httpx.Request("POST", "http://fake-model/v1/chat/completions"))
+
+
+class FakeModel(Model):
+    """
+    `replies` is a single reply, a list of replies consumed in order (the last one
+    repeats), a callable `(system_instructions, input) -> reply`, or None to
+    improvise (see the module docstring). A reply is text, a dict/pydantic object
+    (sent as JSON, for structured output), or a list of ready-made output items.
+
+    `latency` (seconds, or a sampler from `parse_latency`) is slept before each
+    answer. Streamed text deltas are paced by `stream_delay` seconds each, or by
+    `tokens_per_second` when set. `error_rate` of the calls raise `error()`
+    (an API timeout by default) after the latency. `seed` makes improvised
+    choices and injected errors reproducible.
+    """
+
+    def __init__(
+        self,
+        replies: Reply | list[Reply] | Callable[[str | None, Any], Reply] | None = None,
+        latency: float | Callable[[], float] = 0.0,
+        stream_delay: float = 0.0,
+        tokens_per_second: float | None = None,
+        error_rate: float = 0.0,
+        error: Callable[[], Exception] = timeout_error,
+        text: str = "ok",
+        seed: int | None = None,
+    ):
+        self.replies = replies
+        self.latency = latency
+        self.stream_delay = stream_delay
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.error = error
+        self.text = text
+        self.rng = random.Random(seed)
+        self.calls = 0
+        self.errors = 0
+
+    @classmethod
+    def from_env(cls) -> "FakeModel":
+        """Configure from FAKE_MODEL_LATENCY / _TOKENS_PER_SECOND / _ERROR_RATE / _SEED / _TEXT."""
+        seed = os.getenv("FAKE_MODEL_SEED")
+        seed = int(seed) if seed else None
+        tps = os.getenv("FAKE_MODEL_TOKENS_PER_SECOND")
+        return cls(
+            latency=parse_latency(os.getenv("FAKE_MODEL_LATENCY", "0"), seed),
+            tokens_per_second=float(tps) if tps else None,
+            error_rate=float(os.getenv("FAKE_MODEL_ERROR_RATE", "0")),
+            text=os.getenv("FAKE_MODEL_TEXT", "ok"),
+            seed=seed,
+        )
+
+    def next_reply(self, system_instructions: str | None, input: str | list[TResponseInputItem]) -> Reply | None:
+        if self.replies is None:
+            return None
+        if callable(self.replies):
+            return self.replies(system_instructions, input)
+        if isinstance(self.replies, list):
+            return self.replies[min(self.calls, len(self.replies) - 1)]
+        return self.replies
+
+    def improvise(
+        self,
+        input: str | list[TResponseInputItem],
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+    ) -> Reply:
+        last = input[-1] if isinstance(input, list) and input else {}
+        seen_tool_result = isinstance(last, dict) and last.get("type") == "function_call_output"
+        if not seen_tool_result:
+            if handoffs:
+                return [function_call(self.rng.choice(handoffs).tool_name)]
+            function_tools = [tool for tool in tools if isinstance(tool, FunctionTool)]
+            if function_tools:
+                tool = self.rng.choice(function_tools)
+                return [function_call(tool.name, sample_from_schema(tool.params_json_schema, self.text))]
+        if output_schema is not None and not output_schema.is_plain_text():
+            return sample_from_schema(output_schema.json_schema(), self.text)
+        return self.text
+
+    def build_output(self, reply: Reply) -> list[ResponseOutputItem]:
+        if isinstance(reply, BaseModel):
+            reply = reply.model_dump_json()
+        elif isinstance(reply, dict):
+            reply = json.dumps(reply)
+        if isinstance(reply, str):
+            return [text_message(reply)]
+        return list(reply)
+
+    def usage_for(self, input: str | list[TResponseInputItem], output: list[ResponseOutputItem]) -> Usage:
+        input_tokens = count_tokens(input if isinstance(input, str) else json.dumps(input, default=str))
+        output_tokens = count_tokens(json.dumps([item.model_dump() for item in output]))
+        return Usage(
+            requests=1,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            total_tokens=input_tokens + output_tokens,
+        )
+
+    async def get_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: str | None,
+        prompt: Any | None = None,
+    ) -> ModelResponse:
+        reply = self.next_reply(system_instructions, input)
+        if reply is None:
+            reply = self.improvise(input, tools, output_schema, handoffs)
+        self.calls += 1
+        latency = self.latency() if callable(self.latency) else self.latency
+        if latency:
+            await asyncio.sleep(latency)
+        if self.error_rate and self.rng.random() < self.error_rate:
+            self.errors += 1
+            raise self.error()
+        output = self.build_output(reply)
+        return ModelResponse(output=output, usage=self.usage_for(input, output), response_id=None)
+
+    async def stream_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: str | None,
+        prompt: Any | None = None,
+    ) -> AsyncIterator:
+        response = await self.get_response(
+            system_instructions,
+            input,
+            model_settings,
+            tools,
+            output_schema,
+            handoffs,
+            tracing,
+            previous_response_id=previous_response_id,
+            prompt=prompt,
+        )
+        for event in response_events(response):
+            if isinstance(event, ResponseTextDeltaEvent):
+                if self.tokens_per_second:
+                    await asyncio.sleep(count_tokens(event.delta) / self.tokens_per_second)
+                elif self.stream_delay:
+                    await asyncio.sleep(self.stream_delay)
+            yield event
+
@@ -0,0 +1,62 @@
+"""
+Run several independent agents concurrently and hand back each result as soon as it finishes.
+
+Used by the agents-as-tools flow: instead of the orchestrator calling one
+translator per turn, the selected translators run side by side and every finished
+translation goes straight into the synthesizer's input.
+
+    async for branch in fan_out({"spanish": (spanish_agent, msg), "french": (french_agent, msg)}):
+        print(branch.name, branch.output)
+"""
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any
+
+from agents import Agent, Runner, TResponseInputItem
+
+
+@dataclass
+class BranchResult:
+    name: str
+    output: Any = None
+    error: BaseException | None = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+async def fan_out(
+    branches: dict[str, tuple[Agent, str | list[TResponseInputItem]]],
+    max_concurrency: int = 4,
+    timeout: float | None = None,
+    **run_kwargs: Any,
+) -> AsyncIterator[BranchResult]:
+    """
+    Start every branch with `Runner.run`, at most `max_concurrency` at a time, and
+    yield results in completion order. A branch that raises or runs longer than
+    `timeout` seconds (counted from when it actually starts) is yielded with
+    `error` set instead of failing the others. Branches still running when the
+    caller stops iterating are cancelled.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run_branch(name: str, agent: Agent, input: str | list[TResponseInputItem]) -> BranchResult:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(Runner.run(agent, input, **run_kwargs), timeout)
+                return BranchResult(name, result.final_output, None, time.perf_counter() - start)
+            except Exception as e:
+                return BranchResult(name, None, e, time.perf_counter() - start)
+
+    tasks = [asyncio.create_task(run_branch(name, agent, input)) for name, (agent, input) in branches.items()]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,318 @@
+"""
+One long-lived entry point for every flow in this repo.
+
+Each flow used to be its own script, so every use paid for the imports, the
+clients and the agents again. `pro_1 serve` keeps them: a flow's module is
+imported on its first request (or up front with --preload) and its agents and
+the pooled clients in provider.py are reused by every later request. Requests
+run concurrently on one event loop.
+
+    pro_1 list
+    pro_1 run triage "Bonjour, pouvez-vous m'aider ?"
+    pro_1 serve                          # JSONL requests on stdin, responses on stdout
+    pro_1 serve --socket /tmp/pro_1.sock # the same protocol over a Unix socket
+
+A request is one JSON object per line; `id` is echoed back and responses come
+in completion order, not request order:
+
+    {"id": 1, "flow": "triage", "input": "Hola", "conversation_id": "abc"}
+    {"id": 1, "ok": true, "output": "...", "ms": 812.4}
+    {"id": 2, "ok": false, "error": "KeyError: 'unknown flow nope'", "ms": 0.1}
+
+While serving, whatever the flows print goes to stderr, so stdout only carries
+responses. `pro_1` is declared in pyproject.toml; `python flows.py` works too.
+"""
+import argparse
+import asyncio
+import contextlib
+import importlib
+import json
+import os
+import sys
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from types import ModuleType
+from typing import Any
+
+from rate_limits import BATCH, DEFAULT, INTERACTIVE, request_priority
+
+Handler = Callable[[ModuleType, dict[str, Any]], Awaitable[Any]]
+
+
+@dataclass
+class Flow:
+    name: str
+    module: str  # imported by name on first use
+    handler: Handler
+    description: str
+    priority: int = DEFAULT  # model calls queue at this priority when rate limiting is on
+
+
+@dataclass
+class _Conversation:
+    history: Any  # history.ConversationHistory
+    lock: asyncio.Lock
+
+
+# routing.py's transcript per conversation_id, bounded like the router's sticky table
+_conversations: OrderedDict[str, _Conversation] = OrderedDict()
+
+
+async def _triage(module: ModuleType, request: dict[str, Any]) -> dict[str, Any]:
+    from agents import Runner
+
+    from history import ConversationHistory
+
+    conversation_id = str(request.get("conversation_id") or "default")
+    conversation = _conversations.pop(conversation_id, None) or _Conversation(
+        ConversationHistory(budget_tokens=4000, summarizer=module.summary_agent), asyncio.Lock()
+    )
+    _conversations[conversation_id] = conversation
+    while len(_conversations) > 1024:
+        _conversations.popitem(last=False)
+    async with conversation.lock:  # turns of one conversation run in order
+        history = conversation.history
+        history.append({"content": request["input"], "role": "user"})
+        agent = module.router.route(conversation_id, request["input"])
+        result = await Runner.run(agent, input=history.window(), run_config=module.config)
+        history.extend_from_result(result)
+        module.router.remember(conversation_id, result.last_agent)
+    return {"agent": result.last_agent.name, "text": result.final_output}
+
+
+async def _translate(module: ModuleType, request: dict[str, Any]) -> str:
+    return await module.translate(request["input"], fan_out_mode=request.get("fan_out", True))
+
+
+async def _story(module: ModuleType, request: dict[str, Any]) -> dict[str, Any]:
+    from judge_loop import judge_loop
+
+    session = await judge_loop(
+        module.story_outline_generator, module.evaluator, request["input"],
+        candidates=request.get("candidates", 3), max_rounds=request.get("max_rounds", 5),
+    )
+    return {"outline": session.outline, "score": session.best.score if session.best else None}
+
+
+async def _guardrail(module: ModuleType, request: dict[str, Any]) -> dict[str, Any]:
+    from agents import InputGuardrailTripwireTriggered, OutputGuardrailTripwireTriggered, Runner
+
+    from speculative_guardrails import run_speculative
+
+    try:
+        if request.get("agent") == "support":
+            # math_guardrail is checked alongside the first model call
+            result = await run_speculative(module.customer_agent, request["input"], run_config=module.config)
+        else:
+            result = await Runner.run(module.pakistan_agent, request["input"], run_config=module.config)
+    except InputGuardrailTripwireTriggered:
+        return {"tripped": "input", "text": None}
+    except OutputGuardrailTripwireTriggered:
+        return {"tripped": "output", "text": None}
+    return {"tripped": None, "text": str(result.final_output)}
+
+
+async def _image(module: ModuleType, request: dict[str, Any]) -> dict[str, Any]:
+    filename = request.get("filename") or "generated_image.png"
+    # image_gen's client is synchronous: keep it off the loop
+    response = await asyncio.to_thread(
+        module.get_client().responses.create,
+        model=request.get("model", "gpt-5"), input=request["input"], tools=[{"type": "image_generation"}],
+    )
+    saved = await asyncio.to_thread(module.save_image_from_response, response, filename)
+    return {"saved": saved, "filename": filename}
+
+
+FLOWS: dict[str, Flow] = {
+    flow.name: flow
+    for flow in (
+        Flow("triage", "routing", _triage, "French/Spanish/English support; conversation_id keeps context", INTERACTIVE),
+        Flow("translate", "agent_as_tool", _translate, "translate into the languages named in the input", INTERACTIVE),
+        Flow("story", "story2", _story, "story outline refined by an LLM judge", BATCH),
+        Flow("guardrail", "guardrail", _guardrail, "Pakistan Q&A behind an output guardrail; agent=support runs support behind the math input guardrail", INTERACTIVE),
+        Flow("image", "image_gen", _image, "generate an image with the Responses API; filename= sets the output"),
+    )
+}
+
+
+class Registry:
+    """Flows by name, each module imported once and kept warm."""
+
+    def __init__(self, flows: dict[str, Flow] | None = None):
+        self.flows = flows if flows is not None else FLOWS
+        self._modules: dict[str, ModuleType] = {}
+        self._loading: dict[str, asyncio.Future] = {}
+
+    async def load(self, name: str) -> ModuleType:
+        if name not in self.flows:
+            raise KeyError(f"unknown flow {name}")
+        module = self._modules.get(name)
+        if module is not None:
+            return module
+        if name in self._loading:  # another request is already importing it
+            return await asyncio.shield(self._loading[name])
+        future = self._loading[name] = asyncio.get_running_loop().create_future()
+        try:
+            # importing runs module-level code (agents, tools): not on the loop
+            module = await asyncio.to_thread(importlib.import_module, self.flows[name].module)
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # retrieved: nobody else may be waiting
+            raise
+        finally:
+            del self._loading[name]
+        self._modules[name] = module
+        future.set_result(module)
+        return module
+
+    async def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        start = time.perf_counter()
+        response: dict[str, Any] = {"id": request.get("id")}
+        try:
+            module = await self.load(request.get("flow", ""))
+            flow = self.flows[request["flow"]]
+            with request_priority(flow.priority):
+                response["output"] = await flow.handler(module, request)
+            response["ok"] = True
+        except Exception as e:
+            response["ok"] = False
+            response["error"] = f"{type(e).__name__}: {e}"
+        response["ms"] = round((time.perf_counter() - start) * 1000, 2)
+        return response
+
+
+class Server:
+    def __init__(self, registry: Registry, max_concurrency: int = 64):
+        self.registry = registry
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.served = 0
+
+    async def _respond(self, line: bytes, write: Callable[[bytes], Awaitable[None]]) -> None:
+        async with self.semaphore:
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("a request must be a JSON object")
+            except ValueError as e:
+                response = {"id": None, "ok": False, "error": f"bad request: {e}"}
+            else:
+                response = await self.registry.handle(request)
+        self.served += 1
+        await write(json.dumps(response, default=str).encode() + b"\n")
+
+    async def serve_stream(self, reader: asyncio.StreamReader, write: Callable[[bytes], Awaitable[None]]) -> None:
+        """Answer every line of `reader` concurrently; returns once all of them are answered."""
+        tasks: set[asyncio.Task] = set()
+        while line := await reader.readline():
+            if line.strip():
+                task = asyncio.create_task(self._respond(line, write))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def serve_stdio(self) -> None:
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader(limit=2 ** 20)
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+        out = sys.__stdout__.buffer
+
+        async def write(data: bytes) -> None:
+            out.write(data)
+            out.flush()
+
+        await self.serve_stream(reader, write)
+
+    async def serve_unix(self, path: str) -> None:
+        async def connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            lock = asyncio.Lock()
+
+            async def write(data: bytes) -> None:
+                async with lock:
+                    writer.write(data)
+                    await writer.drain()
+
+            try:
+                await self.serve_stream(reader, write)
+            except ConnectionError:
+                pass
+            finally:
+                writer.close()
+
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(path)
+        server = await asyncio.start_unix_server(connection, path, limit=2 ** 20)
+        print(f"serving {', '.join(self.registry.flows)} on {path}", file=sys.stderr, flush=True)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(path)
+
+
+async def serve(args: argparse.Namespace) -> None:
+    from provider import aclose_clients
+
+    registry = Registry()
+    preload = list(registry.flows) if args.preload == "all" else [name for name in args.preload.split(",") if name]
+    for name in preload:
+        await registry.load(name)
+    server = Server(registry, args.max_concurrency)
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            if args.socket:
+                await server.serve_unix(args.socket)
+            else:
+                await server.serve_stdio()
+    finally:
+        await aclose_clients()
+
+
+async def run_once(args: argparse.Namespace) -> int:
+    from provider import aclose_clients
+
+    request: dict[str, Any] = {"id": 0, "flow": args.flow, "input": args.input}
+    for param in args.param:
+        key, _, value = param.partition("=")
+        try:
+            request[key] = json.loads(value)  # fan_out=false, candidates=2
+        except ValueError:
+            request[key] = value
+    try:
+        response = await Registry().handle(request)
+    finally:
+        await aclose_clients()
+    print(json.dumps(response, default=str, ensure_ascii=False))
+    return 0 if response["ok"] else 1
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="pro_1", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="show the registered flows")
+    run = commands.add_parser("run", help="answer one request and exit")
+    run.add_argument("flow", choices=sorted(FLOWS))
+    run.add_argument("input")
+    run.add_argument("--param", action="append", default=[], metavar="KEY=VALUE", help="extra request fields")
+    daemon = commands.add_parser("serve", help="answer JSONL requests until stdin closes (or forever on a socket)")
+    daemon.add_argument("--socket", default=None, help="listen on this Unix socket instead of stdin/stdout")
+    daemon.add_argument("--preload", default="all", help="comma-separated flows to import up front, 'all' or ''")
+    daemon.add_argument("--max-concurrency", type=int, default=64)
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        for flow in FLOWS.values():
+            print(f"{flow.name:<10} {flow.module + '.py':<18} {flow.description}")
+        return 0
+    if args.command == "run":
+        return asyncio.run(run_once(args))
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(serve(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,44 +1,24 @@
-import os
 import asyncio
 from agents import (
     Agent,
     InputGuardrailTripwireTriggered,
-    RunConfig,
     Runner,
     input_guardrail,
     GuardrailFunctionOutput,
     OutputGuardrailTripwireTriggered,
     output_guardrail,
-    OpenAIChatCompletionsModel,
     RunContextWrapper,
     TResponseInputItem,
 )
-from openai import AsyncOpenAI
 from pydantic import BaseModel
-from dotenv import load_dotenv
+from provider import get_model, get_run_config
+from speculative_guardrails import run_speculative, stream_with_output_guardrails
+from tiered_guardrail import MATH_HOMEWORK_RULES, PAKISTAN_RULES, TieredClassifier
 
-load_dotenv()
+# Model config (shared Gemini client with OpenAI-compatible API)
+model = get_model("gemini-2.0-flash")
 
-openai_key = os.getenv("OPENAI_API_KEY")
-gemini_api_key = os.getenv("GEMINI_API_KEY")
-
-# External client (Gemini with OpenAI-compatible API)
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
-
-# Model config
-model = OpenAIChatCompletionsModel(
-    openai_client=external_client,
-    model="gemini-2.0-flash",
-)
-
-config = RunConfig(
-    model=model,
-    model_provider=external_client,
-    tracing_disabled=False,
-)
+config = get_run_config(model, tracing_disabled=False)
 
 # ----------------------------
 # Pydantic output models
@@ -61,16 +41,38 @@ police = Agent(
     name="police",
     instructions="check if the user is asking for math homework",
     output_type=math_output,
-    model="gpt-4o-mini",
+    model=get_model("gpt-4o-mini"),
 )
 
 guard = Agent(
     name="guard",
     instructions="check if the user is asking for Pakistan related query",
     output_type=pak_output,
-    model="gpt-4o-mini",
+    model=get_model("gpt-4o-mini"),
 )
 
+# ----------------------------
+# Tiered checks: local rules first, the police/guard LLM judges only when unsure
+# ----------------------------
+math_tiers = TieredClassifier(MATH_HOMEWORK_RULES)
+pak_tiers = TieredClassifier(PAKISTAN_RULES)
+
+def input_text(input: str | list[TResponseInputItem]) -> str:
+    if isinstance(input, str):
+        return input
+    return "\n".join(str(item.get("content", "")) for item in input if item.get("role") == "user")
+
+async def is_pakistan_related(ctx: RunContextWrapper, text: str) -> tuple[bool, pak_output]:
+    async def ask_guard(text: str):
+        result = await Runner.run(guard, text, context=ctx.context)
+        return result.final_output.is_relevant, result.final_output
+
+    verdict = await pak_tiers.classify(text, judge=ask_guard)
+    info = verdict.output_info or pak_output(
+        is_relevant=verdict.positive, reasoning=f"{verdict.tier} tier (p={verdict.probability:.2f})"
+    )
+    return verdict.positive, info
+
 # ----------------------------
 # Guardrail functions
 # ----------------------------
@@ -79,11 +81,11 @@ async def pak_guardrail(
     ctx: RunContextWrapper, agent: Agent, output: MessageOutput
 ) -> GuardrailFunctionOutput:
     """Check if the agent's output is relevant to Pakistan queries."""
-    result = await Runner.run(guard, output.response, context=ctx.context)
+    relevant, info = await is_pakistan_related(ctx, output.response)
 
     return GuardrailFunctionOutput(
-        output_info=result.final_output,
-        tripwire_triggered=result.final_output.is_relevant is False,  # trip if NOT Pakistan-related
+        output_info=info,
+        tripwire_triggered=relevant is False,  # trip if NOT Pakistan-related
     )
 
 @input_guardrail
@@ -93,10 +95,28 @@ async def math_guardrail(
     input: str | list[TResponseInputItem],
 ) -> GuardrailFunctionOutput:
     """Block math homework queries before they reach the main agent."""
-    result = await Runner.run(police, input, context=ctx.context)
+    async def ask_police(text: str):
+        result = await Runner.run(police, text, context=ctx.context)
+        return result.final_output.is_math_homework, result.final_output
+
+    verdict = await math_tiers.classify(input_text(input), judge=ask_police)
+    info = verdict.output_info or math_output(
+        is_math_homework=verdict.positive, reasoning=f"{verdict.tier} tier (p={verdict.probability:.2f})"
+    )
     return GuardrailFunctionOutput(
-        output_info=result.final_output,
-        tripwire_triggered=result.final_output.is_math_homework,
+        output_info=info,
+        tripwire_triggered=verdict.positive,
+    )
+
+@output_guardrail
+async def pak_stream_guardrail(
+    ctx: RunContextWrapper, agent: Agent, output: str
+) -> GuardrailFunctionOutput:
+    """Same relevance check as pak_guardrail, on the partial text of a streamed answer."""
+    relevant, info = await is_pakistan_related(ctx, output)
+    return GuardrailFunctionOutput(
+        output_info=info,
+        tripwire_triggered=relevant is False,
     )
 
 # ----------------------------
@@ -105,33 +125,51 @@ async def math_guardrail(
 customer_agent = Agent(
     name="Customer Support Agent",
     instructions="you are a customer support agent, you help customers with their queries",
-    model="gpt-4o-mini",
+    model=get_model("gpt-4o-mini"),
     input_guardrails=[math_guardrail],
 )
 
 pakistan_agent = Agent(
     name="Pakistan Agent",
     instructions="you are a Pakistan agent, you answer Pakistan related queries",
-    model="gpt-4o-mini",
+    model=get_model("gpt-4o-mini"),
     output_type=MessageOutput,
     output_guardrails=[pak_guardrail],
 )
 
+# Streams prose rather than MessageOutput's JSON, so the deltas can be printed and
+# checked as they come; pak_stream_guardrail also checks the complete text at the end.
+pakistan_stream_agent = pakistan_agent.clone(output_type=None, output_guardrails=[])
+
 # ----------------------------
 # Runner test
 # ----------------------------
+async def stream_pakistan_answer(query: str):
+    """Stream pakistan_agent's answer, cutting it off as soon as it drifts off-topic."""
+    async for delta in stream_with_output_guardrails(
+        pakistan_stream_agent, query, [pak_stream_guardrail], check_every=200, run_config=config
+    ):
+        print(delta, end="", flush=True)
+
 async def main():
     try:
-        await Runner.run(
-            pakistan_agent,
-            "Hello, what is the prime minister of India?",  # ❌ not Pakistan-related
+        # input guardrails run alongside the first model call (see speculative_guardrails.py)
+        await run_speculative(
+            customer_agent,
+            "Solve for x: 2x + 3 = 11",  # ❌ math homework
             run_config=config,
         )
         print("Guardrail didn't trip - this is unexpected")
-
     except InputGuardrailTripwireTriggered:
         print("❌ Math homework guardrail tripped")
+
+    try:
+        await stream_pakistan_answer("Hello, what is the prime minister of India?")  # ❌ not Pakistan-related
+        print("\nGuardrail didn't trip - this is unexpected")
     except OutputGuardrailTripwireTriggered:
-        print("❌ Query is not relevant to Pakistan (output guardrail tripped)")
+        print("\n❌ Query is not relevant to Pakistan (output guardrail tripped)")
+
+    print(f"guardrail tiers: math={math_tiers.stats.as_dict()} pak={pak_tiers.stats.as_dict()}")
 
-asyncio.run(main())
+if __name__ == "__main__":
+    asyncio.run(main())
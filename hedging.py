@@ -0,0 +1,232 @@
+"""
+Hedged requests and failover across model backends.
+
+`HedgedModel` takes an ordered list of Models (e.g. gemini-2.0-flash on the
+Gemini endpoint, then gpt-4o-mini) and sends each call to the first backend
+whose circuit breaker is closed. If no answer has come back after the hedge
+delay, a duplicate goes to the next backend; the first answer wins and the
+other call is cancelled. A backend that fails hands over to the next one right
+away, without waiting for the delay.
+
+The hedge delay tracks the `hedge_quantile` (p95 by default) of each
+backend's recent latencies (a call cancelled as the losing hedge counts with
+the time it had been running), clamped to [min_delay, max_delay], so
+only about 5% of calls are duplicated: the ones that are already slower than
+usual. Until `min_samples` answers have been seen it is `initial_delay`.
+
+Each backend has a `CircuitBreaker`: after `failure_threshold` consecutive
+failures it opens and the backend is skipped for `reset_timeout` seconds; then
+a single trial call is let through (half-open), and its outcome closes or
+reopens the breaker.
+
+    model = HedgedModel([get_model("gemini-2.0-flash"), get_model("gpt-4o-mini")])
+
+or set MODEL_FALLBACKS=gpt-4o-mini to have provider.get_model() build one.
+Streamed calls fail over before their first event but are not hedged.
+"""
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+from agents import Model, ModelResponse
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.trial_in_flight = False
+        self.opens = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if time.monotonic() - self.opened_at >= self.reset_timeout else "open"
+
+    def allow(self) -> bool:
+        """Whether a call may go to this backend now; a half-open breaker lets one trial through."""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.opened_at is None:
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                self.opens += 1
+        else:  # a failed trial, or a call sent before the breaker opened: wait reset_timeout again
+            self.opened_at = time.monotonic()
+        self.trial_in_flight = False
+
+    def release(self) -> None:
+        """A call that ended without an outcome (cancelled as the losing hedge, or a stream closed early)."""
+        self.trial_in_flight = False
+
+
+@dataclass
+class HedgeStats:
+    calls: int = 0
+    hedged: int = 0  # calls that sent a duplicate after the hedge delay
+    hedge_wins: int = 0  # ... and were answered by the duplicate first
+    failovers: int = 0  # backends tried because the previous one failed
+    skipped: int = 0  # backends passed over because their breaker was open
+    failed: int = 0  # calls where every backend failed
+
+
+class _Backend:
+    def __init__(self, model: Model, breaker: CircuitBreaker, window: int):
+        self.model = model
+        self.breaker = breaker
+        self.latencies: deque[float] = deque(maxlen=window)
+        self.name = getattr(model, "model", None) or type(model).__name__
+
+
+class HedgedModel(Model):
+    def __init__(
+        self,
+        backends: list[Model],
+        hedge_quantile: float = 0.95,
+        initial_delay: float = 2.0,
+        min_delay: float = 0.05,
+        max_delay: float = 30.0,
+        min_samples: int = 20,
+        window: int = 500,
+        max_hedges: int = 1,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ):
+        if not backends:
+            raise ValueError("HedgedModel needs at least one backend")
+        self.backends = [_Backend(model, CircuitBreaker(failure_threshold, reset_timeout), window) for model in backends]
+        self.hedge_quantile = hedge_quantile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self.max_hedges = max_hedges
+        self.stats = HedgeStats()
+        name = self.backends[0].name
+        self.model = name if isinstance(name, str) else "hedged"  # the model name, as on the SDK's models
+
+    def hedge_delay(self, backend: _Backend) -> float:
+        if len(backend.latencies) < self.min_samples:
+            return self.initial_delay
+        ordered = sorted(backend.latencies)
+        delay = ordered[min(len(ordered) - 1, int(len(ordered) * self.hedge_quantile))]
+        return min(self.max_delay, max(self.min_delay, delay))
+
+    def _next_backend(self, after: int) -> int | None:
+        for index in range(after + 1, len(self.backends)):
+            if self.backends[index].breaker.allow():
+                return index
+            self.stats.skipped += 1
+        return None
+
+    async def _call(self, backend: _Backend, args: tuple, kwargs: dict) -> ModelResponse:
+        start = time.monotonic()
+        try:
+            response = await backend.model.get_response(*args, **kwargs)
+        except asyncio.CancelledError:
+            # The losing hedge: it took at least this long, which keeps slow calls in the quantile.
+            backend.breaker.release()
+            backend.latencies.append(time.monotonic() - start)
+            raise
+        except Exception:
+            backend.breaker.record_failure()
+            raise
+        backend.breaker.record_success()
+        backend.latencies.append(time.monotonic() - start)
+        return response
+
+    async def get_response(self, *args, **kwargs) -> ModelResponse:
+        self.stats.calls += 1
+        index = self._next_backend(-1)
+        if index is None:  # every breaker is open: try the primary anyway rather than fail outright
+            index = 0
+        running: dict[asyncio.Task, int] = {}
+        hedges = 0
+        last_error: BaseException | None = None
+
+        def launch(i: int) -> None:
+            running[asyncio.create_task(self._call(self.backends[i], args, kwargs))] = i
+
+        launch(index)
+        try:
+            while running:
+                can_hedge = hedges < self.max_hedges and index < len(self.backends) - 1
+                timeout = self.hedge_delay(self.backends[index]) if can_hedge else None
+                done, _ = await asyncio.wait(running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:  # slow answer: hedge to the next backend
+                    next_index = self._next_backend(index)
+                    hedges += 1
+                    if next_index is not None:
+                        self.stats.hedged += 1
+                        index = next_index
+                        launch(index)
+                    continue
+                for task in done:
+                    backend_index = running.pop(task)
+                    if task.exception() is None:
+                        if backend_index != min([backend_index, *running.values()]):
+                            self.stats.hedge_wins += 1
+                        return task.result()
+                    last_error = task.exception()
+                if not running:  # everything in flight failed: fail over
+                    next_index = self._next_backend(index)
+                    if next_index is not None:
+                        self.stats.failovers += 1
+                        index = next_index
+                        launch(index)
+            self.stats.failed += 1
+            assert last_error is not None
+            raise last_error
+        finally:
+            for task in running:  # the losers
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+    async def stream_response(self, *args, **kwargs) -> AsyncIterator:
+        self.stats.calls += 1
+        index = self._next_backend(-1)
+        if index is None:
+            index = 0
+        while True:
+            backend = self.backends[index]
+            started = False
+            try:
+                async for event in backend.model.stream_response(*args, **kwargs):
+                    started = True
+                    yield event
+            except Exception:
+                backend.breaker.record_failure()
+                next_index = None if started else self._next_backend(index)
+                if next_index is None:
+                    self.stats.failed += 1
+                    raise
+                self.stats.failovers += 1
+                index = next_index
+                continue
+            except BaseException:  # cancelled, or closed early by the consumer: no outcome
+                backend.breaker.release()
+                raise
+            backend.breaker.record_success()
+            return
+
+    def __repr__(self) -> str:
+        return f"HedgedModel({[backend.name for backend in self.backends]})"
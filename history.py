@@ -0,0 +1,134 @@
+"""
+Bounded conversation history for long-running chat loops (see routing.py).
+
+Instead of resending `result.to_input_list()` every turn, keep the transcript here
+and pass `history.window()` to the runner. The window is the newest items that fit
+in `budget_tokens`, preceded by a running summary of everything older. Older items
+are summarised in the background by a cheap agent, so a turn never waits on it;
+until a summary lands the window simply goes without it. When the summarizer
+fails, the evicted items stay queued and are retried with the next eviction
+(`summary_failures` counts the failed attempts).
+
+    history = ConversationHistory(budget_tokens=2000, summarizer=summary_agent)
+    history.append({"content": msg, "role": "user"})
+    result = Runner.run_streamed(agent, input=history.window())
+    ...
+    history.extend_from_result(result)
+"""
+import asyncio
+import json
+from collections.abc import Callable, Iterable
+
+from agents import Agent, Runner, TResponseInputItem
+from agents.result import RunResultBase
+
+
+def estimate_tokens(item: TResponseInputItem) -> int:
+    """~4 characters per token over the item's JSON; close enough for budgeting."""
+    return max(1, len(json.dumps(item, default=str, ensure_ascii=False)) // 4)
+
+
+SUMMARY_PREFIX = "Summary of the earlier conversation: "
+
+
+def item_text(item: TResponseInputItem) -> str:
+    content = item.get("content", item.get("output", item.get("arguments", "")))
+    if isinstance(content, list):
+        content = " ".join(str(part.get("text", "")) for part in content if isinstance(part, dict))
+    return f"{item.get('role', item.get('type', 'item'))}: {content}"
+
+
+class ConversationHistory:
+    def __init__(
+        self,
+        budget_tokens: int = 4000,
+        summarizer: Agent | None = None,
+        count_tokens: Callable[[TResponseInputItem], int] = estimate_tokens,
+        min_recent_items: int = 2,
+    ):
+        self.budget_tokens = budget_tokens
+        self.summarizer = summarizer
+        self.count_tokens = count_tokens
+        self.min_recent_items = min_recent_items
+        self.items: list[TResponseInputItem] = []
+        self.tokens: list[int] = []  # token count per item, computed once on append
+        self.summary: str | None = None
+        self._summary_tokens = 0
+        self._summary_task: asyncio.Task | None = None
+        self._pending: list[TResponseInputItem] = []
+        self.summary_failures = 0
+        self.last_summary_error: Exception | None = None
+
+    def append(self, item: TResponseInputItem) -> None:
+        self.items.append(item)
+        self.tokens.append(self.count_tokens(item))
+
+    def extend(self, items: Iterable[TResponseInputItem]) -> None:
+        for item in items:
+            self.append(item)
+
+    def extend_from_result(self, result: RunResultBase) -> None:
+        """Add the items a run produced (messages, tool calls and outputs, handoffs)."""
+        self.extend(item.to_input_item() for item in result.new_items)
+
+    @property
+    def total_tokens(self) -> int:
+        """Tokens in the items still held (the summary not included)."""
+        return sum(self.tokens)
+
+    def _summary_item(self) -> list[TResponseInputItem]:
+        if not self.summary:
+            return []
+        return [{"content": SUMMARY_PREFIX + self.summary, "role": "system"}]
+
+    def window(self) -> list[TResponseInputItem]:
+        """Newest items within the budget (always at least `min_recent_items`), after the summary."""
+        budget = self.budget_tokens - self._summary_tokens
+        cut = len(self.items)
+        used = 0
+        while cut > 0:
+            cost = self.tokens[cut - 1]
+            if used + cost > budget and len(self.items) - cut >= self.min_recent_items:
+                break
+            used += cost
+            cut -= 1
+        # never start on a tool output whose call was trimmed away
+        while cut < len(self.items) - 1 and self.items[cut].get("type") == "function_call_output":
+            cut += 1
+        if cut > 0:
+            self._evict(cut)
+        return self._summary_item() + self.items
+
+    def _evict(self, cut: int) -> None:
+        # evicted items leave memory; only the summary remembers them
+        evicted = self.items[:cut]
+        del self.items[:cut]
+        del self.tokens[:cut]
+        if self.summarizer is None:
+            return
+        self._pending.extend(evicted)
+        if self._summary_task is None or self._summary_task.done():
+            self._summary_task = asyncio.create_task(self._summarize())
+
+    async def _summarize(self) -> None:
+        # drain everything evicted so far, including items evicted while a run was in flight
+        while self._pending:
+            batch, self._pending = self._pending, []
+            transcript = "\n".join(item_text(item) for item in batch)
+            prompt = f"Previous summary: {self.summary or '(none)'}\n\nNew messages:\n{transcript}"
+            try:
+                result = await Runner.run(self.summarizer, prompt)
+            except Exception as e:
+                # keep the conversation going without a summary rather than failing the turn;
+                # the batch goes back in front of the queue and is retried on the next eviction
+                self._pending = batch + self._pending
+                self.summary_failures += 1
+                self.last_summary_error = e
+                return
+            self.summary = str(result.final_output)
+            self._summary_tokens = sum(self.count_tokens(item) for item in self._summary_item())
+
+    async def flush(self) -> None:
+        """Wait for a background summary in progress, e.g. before saving the conversation."""
+        if self._summary_task is not None:
+            await self._summary_task
@@ -0,0 +1,285 @@
+"""
+Render a JSONL file of prompts to images, many at a time, resumably.
+
+image_gen.py / image_gemini.py make one image per run. `run_batch` reads jobs
+lazily, keeps at most `concurrency` generations in flight, retries 429s and 5xx
+with exponential backoff (honouring Retry-After), writes each image to disk as
+soon as it arrives (image_io: streamed decode, atomic rename) and appends it to
+a JSONL manifest. Prompts already marked done in the manifest are skipped, so
+an interrupted batch picks up where it stopped (an image written but not yet
+recorded is simply rendered again). One batch per output directory: stale
+temp files there are removed on start.
+
+    python image_batch.py prompts.jsonl --out images/ --concurrency 8
+
+Each prompt line is {"prompt": "...", "id": "optional", "filename": "optional.png"}.
+The generator is any `async (prompt) -> response`; `openai_image_generator`
+wraps the Responses API image_generation tool used by image_gen.py.
+
+openai and the downloader (requests) are only imported once a batch needs
+them, so a batch driven by another generator never pays for them.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import statistics
+import time
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from image_io import decode_base64_to_file
+from image_payload import find_image_payload
+from image_postprocess import PostProcessor
+from lazy import lazy_import
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+openai = lazy_import("openai")
+downloader = lazy_import("downloader")
+
+ImageGenerator = Callable[[str], Awaitable[Any]]
+
+
+def retryable() -> tuple[type[Exception], ...]:
+    # APITimeoutError is an APIConnectionError
+    return (openai.RateLimitError, openai.InternalServerError, openai.APIConnectionError)
+
+
+@dataclass
+class PromptJob:
+    id: str
+    prompt: str
+    filename: str
+
+
+def read_prompts(path: str) -> Iterator[PromptJob]:
+    """Jobs from a JSONL file, one at a time (the file is never loaded whole)."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            job_id = str(row.get("id") or hashlib.sha1(row["prompt"].encode()).hexdigest()[:12])
+            yield PromptJob(job_id, row["prompt"], row.get("filename") or f"{job_id}.png")
+
+
+class Manifest:
+    """Append-only JSONL log of finished prompts; the last entry per id wins."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done: set[str] = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # a line cut short by a crash
+                    if entry.get("status") == "done":
+                        self.done.add(entry["id"])
+                    else:
+                        self.done.discard(entry["id"])
+        self._file = open(path, "a", encoding="utf-8")
+
+    def record(self, entry: dict) -> None:
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        if entry.get("status") == "done":
+            self.done.add(entry["id"])
+
+    def close(self) -> None:
+        self._file.close()
+
+
+@dataclass
+class BatchStats:
+    done: int = 0
+    skipped: int = 0
+    failed: int = 0
+    retries: int = 0
+    bytes: int = 0
+    elapsed: float = 0.0
+    stages: dict[str, list[float]] = field(default_factory=lambda: {"generate": [], "extract": [], "write": []})
+
+    @property
+    def images_per_minute(self) -> float:
+        return self.done / self.elapsed * 60 if self.elapsed else 0.0
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "done": self.done,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "retries": self.retries,
+            "images_per_minute": round(self.images_per_minute, 1),
+            "elapsed_s": round(self.elapsed, 2),
+            "stage_ms": {
+                stage: {
+                    "p50": round(statistics.median(times) * 1000, 2),
+                    "max": round(max(times) * 1000, 2),
+                }
+                for stage, times in self.stages.items()
+                if times
+            },
+        }
+
+
+def retry_delay(error: Exception, attempt: int, base_delay: float, max_delay: float) -> float:
+    """Retry-After when the server sent one, otherwise exponential backoff with full jitter."""
+    if isinstance(error, openai.APIStatusError):
+        retry_after = error.response.headers.get("retry-after")
+        try:
+            return min(max_delay, float(retry_after))
+        except (TypeError, ValueError):
+            pass
+    return random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+
+def openai_image_generator(client: AsyncOpenAI, model: str = "gpt-5") -> ImageGenerator:
+    # retries are run_batch's job: the client's own would hide them from the stats
+    client = client.with_options(max_retries=0)
+
+    async def generate(prompt: str):
+        return await client.responses.create(model=model, input=prompt, tools=[{"type": "image_generation"}])
+
+    return generate
+
+
+async def run_batch(
+    jobs: Iterable[PromptJob],
+    generate: ImageGenerator,
+    out_dir: str,
+    manifest_path: str | None = None,
+    concurrency: int = 8,
+    max_attempts: int = 5,
+    base_delay: float = 0.5,
+    max_delay: float = 30.0,
+    postprocess: PostProcessor | None = None,
+) -> BatchStats:
+    """
+    Render every job not yet done in the manifest. With `postprocess`, each image
+    also gets its renditions (image_postprocess.py) before it counts as done.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    for name in os.listdir(out_dir):
+        if name.startswith(".tmp-"):
+            os.unlink(os.path.join(out_dir, name))  # half-written images from a run that died
+    manifest = Manifest(manifest_path or os.path.join(out_dir, "manifest.jsonl"))
+    stats = BatchStats()
+    semaphore = asyncio.Semaphore(concurrency)
+    start = time.perf_counter()
+
+    async def render(job: PromptJob) -> None:
+        path = os.path.join(out_dir, job.filename)
+        job_start = time.perf_counter()
+        try:
+            for attempt in range(max_attempts):
+                t = time.perf_counter()
+                try:
+                    response = await generate(job.prompt)
+                    break
+                except retryable() as e:
+                    if attempt == max_attempts - 1:
+                        raise
+                    stats.retries += 1
+                    await asyncio.sleep(retry_delay(e, attempt, base_delay, max_delay))
+            stats.stages["generate"].append(time.perf_counter() - t)
+
+            t = time.perf_counter()
+            payload = find_image_payload(response)
+            stats.stages["extract"].append(time.perf_counter() - t)
+            if payload is None:
+                raise ValueError("no image in response")
+
+            t = time.perf_counter()
+            if payload.kind == "url":
+                size = (await asyncio.to_thread(downloader.download, payload.data, path)).bytes
+            else:
+                size = await asyncio.to_thread(decode_base64_to_file, payload.data, path)
+            stats.stages["write"].append(time.perf_counter() - t)
+
+            renditions = None
+            if postprocess is not None:
+                t = time.perf_counter()
+                renditions = await postprocess.process(path)
+                stats.stages.setdefault("postprocess", []).append(time.perf_counter() - t)
+        except Exception as e:
+            stats.failed += 1
+            manifest.record({"id": job.id, "status": "failed", "error": f"{type(e).__name__}: {e}"})
+        else:
+            stats.done += 1
+            stats.bytes += size
+            manifest.record({
+                "id": job.id,
+                "status": "done",
+                "path": path,
+                "bytes": size,
+                "attempts": attempt + 1,
+                "renditions": renditions,
+                "seconds": round(time.perf_counter() - job_start, 3),
+            })
+        finally:
+            semaphore.release()
+
+    tasks: set[asyncio.Task] = set()
+    try:
+        for job in jobs:
+            if job.id in manifest.done:
+                stats.skipped += 1
+                continue
+            # acquiring before creating the task keeps at most `concurrency` jobs in memory
+            await semaphore.acquire()
+            task = asyncio.create_task(render(job))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        manifest.close()
+        stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+async def main(args: argparse.Namespace) -> None:
+    from provider import OPENAI_BASE_URL, get_client
+
+    client = get_client(args.base_url or OPENAI_BASE_URL, args.api_key)
+    postprocess = None
+    if args.renditions:
+        postprocess = PostProcessor(args.renditions)
+    stats = await run_batch(
+        read_prompts(args.prompts),
+        openai_image_generator(client, args.model),
+        args.out,
+        manifest_path=args.manifest,
+        concurrency=args.concurrency,
+        max_attempts=args.max_attempts,
+        postprocess=postprocess,
+    )
+    if postprocess is not None:
+        postprocess.close()
+    print(json.dumps(stats.summary(), indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("prompts", help="JSONL file of prompts")
+    parser.add_argument("--out", default="images")
+    parser.add_argument("--manifest", default=None, help="defaults to OUT/manifest.jsonl")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--max-attempts", type=int, default=5)
+    parser.add_argument("--model", default="gpt-5")
+    parser.add_argument("--base-url", default=None)
+    parser.add_argument("--api-key", default=None)
+    parser.add_argument("--renditions", default=None, help="also write thumbnails/WebP renditions to this directory")
+    asyncio.run(main(parser.parse_args()))
@@ -8,8 +8,6 @@
 #
 
 import os
-import google.generativeai as genai
-from PIL import Image
 from io import BytesIO
 
 def generate_image(prompt: str):
@@ -20,6 +18,11 @@ def generate_image(prompt: str):
         prompt (str): The text prompt for image generation.
     """
     try:
+        # imported here rather than at module level: the SDK is slow to import
+        # and optional, so importing this module neither pays for nor needs it
+        import google.generativeai as genai
+        from PIL import Image
+
         # Load the API key from an environment variable.
         # This is a best practice for security.
         api_key = os.environ.get("GEMINI_API_KEY")
@@ -0,0 +1,160 @@
+"""
+Write generated images to disk without holding them in memory.
+
+`decode_base64_to_file` decodes base64 in fixed-size chunks straight into a
+temporary file next to the target and renames it into place only once the
+whole image is written (and, for PNGs, verified), so a crash or a bad payload
+never leaves a truncated image behind. Peak memory is O(chunk_size), not
+O(image): only one chunk of text and its decoded bytes exist at a time.
+
+    size = decode_base64_to_file(payload.data, "otter.png")
+
+`PNGVerifier` checks the signature, every chunk's CRC and the final IEND chunk
+incrementally, as the bytes go by.
+"""
+import binascii
+import os
+import struct
+import tempfile
+import zlib
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import BinaryIO
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_WHITESPACE = b" \t\r\n"
+
+
+class ImageIntegrityError(ValueError):
+    """The decoded bytes are not a complete, uncorrupted image."""
+
+
+class PNGVerifier:
+    """Feed PNG bytes in any slicing; `close()` raises unless a valid IEND was reached."""
+
+    def __init__(self):
+        self._buffer = b""  # never more than a signature or a chunk header/CRC
+        self._signature_ok = False
+        self._remaining = 0  # bytes of chunk data still to come
+        self._crc = 0
+        self._chunk_type = b""
+        self.chunks = 0
+        self.done = False
+
+    def update(self, data: bytes | memoryview) -> None:
+        view = memoryview(data)
+        while view:
+            if self.done:
+                raise ImageIntegrityError("data after the PNG IEND chunk")
+            if not self._signature_ok:
+                view = self._fill(view, len(PNG_SIGNATURE))
+                if len(self._buffer) == len(PNG_SIGNATURE):
+                    if self._buffer != PNG_SIGNATURE:
+                        raise ImageIntegrityError("not a PNG (bad signature)")
+                    self._signature_ok, self._buffer = True, b""
+            elif self._remaining:
+                take = min(self._remaining, len(view))
+                self._crc = zlib.crc32(view[:take], self._crc)
+                self._remaining -= take
+                view = view[take:]
+            elif not self._chunk_type:
+                view = self._fill(view, 8)
+                if len(self._buffer) == 8:
+                    length, self._chunk_type = struct.unpack(">I4s", self._buffer)
+                    self._crc = zlib.crc32(self._chunk_type)
+                    self._remaining, self._buffer = length, b""
+            else:
+                view = self._fill(view, 4)
+                if len(self._buffer) == 4:
+                    (expected,) = struct.unpack(">I", self._buffer)
+                    if expected != self._crc:
+                        raise ImageIntegrityError(f"CRC mismatch in {self._chunk_type.decode('latin-1')} chunk")
+                    self.chunks += 1
+                    self.done = self._chunk_type == b"IEND"
+                    self._chunk_type, self._buffer = b"", b""
+
+    def _fill(self, view: memoryview, size: int) -> memoryview:
+        take = size - len(self._buffer)
+        self._buffer += bytes(view[:take])
+        return view[take:]
+
+    def close(self) -> None:
+        if not self.done:
+            raise ImageIntegrityError("truncated PNG (no IEND chunk)")
+
+
+def _read_umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# read once: os.umask can only be read by setting it, which is not thread-safe
+_FILE_MODE = 0o666 & ~_read_umask()
+
+
+@contextmanager
+def atomic_writer(path: str | os.PathLike) -> Iterator[BinaryIO]:
+    """Binary file that only appears at `path` if the block completes without raising."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, _FILE_MODE)  # mkstemp creates 0600; give it the mode open() would
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def iter_base64_decoded(b64: str | bytes | memoryview, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """
+    Decode `b64` piece by piece. Pieces are re-aligned to 4 characters after
+    dropping whitespace, so line-wrapped (MIME) base64 works too.
+    """
+    chunk_size = max(64, chunk_size - chunk_size % 4)
+    carry = b""
+    for start in range(0, len(b64), chunk_size):
+        piece = b64[start:start + chunk_size]
+        piece = piece.encode("ascii") if isinstance(piece, str) else bytes(piece)
+        piece = carry + piece.translate(None, _WHITESPACE)
+        cut = len(piece) - len(piece) % 4
+        carry = piece[cut:]
+        if cut:
+            yield binascii.a2b_base64(piece[:cut])
+    if carry:
+        raise binascii.Error("incorrect base64 padding")
+
+
+def decode_base64_to_file(
+    b64: str | bytes | memoryview,
+    path: str | os.PathLike,
+    chunk_size: int = 64 * 1024,
+    verify: bool | None = None,
+) -> int:
+    """
+    Stream-decode `b64` into `path` atomically and return the number of bytes
+    written. `verify=None` checks PNG integrity when the data starts with the PNG
+    signature, True requires a valid PNG, False skips the check.
+    """
+    verifier: PNGVerifier | None = None
+    written = 0
+    with atomic_writer(path) as f:
+        for data in iter_base64_decoded(b64, chunk_size):
+            if written == 0 and verify is not False and (verify or data.startswith(PNG_SIGNATURE)):
+                verifier = PNGVerifier()
+            if verifier is not None:
+                verifier.update(data)
+            f.write(data)
+            written += len(data)
+        if verifier is not None:
+            verifier.close()
+        elif verify:
+            raise ImageIntegrityError("not a PNG (bad signature)")
+    return written
@@ -0,0 +1,113 @@
+"""
+Find the generated image in a Responses API result without copying it around.
+
+image_gen.py used to `to_dict()` the whole response, try every candidate field
+with freshly compiled regexes and, when nothing matched, `str()` the entire dict
+and regex over that: several copies of a multi-megabyte base64 payload per
+image. `find_image_payload` walks the typed response objects once, to a bounded
+depth, using the patterns compiled below:
+
+- `image_generation_call` items are read straight from `.result`;
+- otherwise string fields under the usual keys are checked for a data URI
+  (anywhere in the text), a URL or plain base64, and nested objects/lists under
+  those keys are descended.
+
+Base64 comes back as a `memoryview` over ASCII bytes. A Python str exposes no
+buffer, so that one encode is the only copy; stripping a data-URI prefix is a
+slice of the view, and `binascii.a2b_base64` decodes a view without copying it.
+
+    payload = find_image_payload(response)
+    if payload and payload.kind == "base64":
+        image = binascii.a2b_base64(payload.data)
+"""
+import re
+from dataclasses import dataclass
+from typing import Any, Literal
+
+from pydantic import BaseModel
+
+_DATA_URI = re.compile(rb"data:(image/[\w.+-]+);base64,")
+_URL = re.compile(r"\s*(https?://\S+)")
+_IMAGE_URL = re.compile(r"https?://[^\s'\"<>()]+?\.(?:png|jpe?g|webp|gif)\b[^\s'\"<>()]*", re.IGNORECASE)
+_BASE64 = re.compile(rb"[A-Za-z0-9+/=\r\n]+")  # no spaces: prose is not base64
+
+# fields that may hold the payload itself or something that contains it
+PAYLOAD_KEYS = ("result", "url", "image_url", "image", "data", "b64", "base64", "b64_json", "text")
+CONTAINER_KEYS = ("output", "content", "message", "items", "parts", "tool_call", "tool", "choices")
+
+
+@dataclass
+class ImagePayload:
+    kind: Literal["url", "base64"]
+    data: memoryview | str  # memoryview of base64 ASCII bytes, or the URL
+    media_type: str | None = None
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+
+def payload_from_string(value: str, min_base64_chars: int = 64) -> ImagePayload | None:
+    if "data:image/" in value:
+        # data URI anywhere in the text (e.g. markdown); the view ends where the base64 does
+        encoded = value.encode("utf-8")
+        m = _DATA_URI.search(encoded)
+        if m:
+            body = _BASE64.match(encoded, m.end())
+            if body:
+                return ImagePayload("base64", memoryview(encoded)[body.start():body.end()], m.group(1).decode())
+    m = _URL.match(value)
+    if m:
+        return ImagePayload("url", m.group(1))
+    m = _IMAGE_URL.search(value)  # an image URL inside message text (e.g. markdown)
+    if m:
+        return ImagePayload("url", m.group(0))
+    if len(value) < min_base64_chars:
+        return None
+    try:
+        encoded = value.encode("ascii")
+    except UnicodeEncodeError:
+        return None
+    if _BASE64.fullmatch(encoded) and len(encoded.strip()) % 4 == 0:
+        return ImagePayload("base64", memoryview(encoded))
+    return None
+
+
+def _field(obj: Any, key: str) -> Any:
+    if isinstance(obj, dict):
+        return obj.get(key)
+    return getattr(obj, key, None)
+
+
+def find_image_payload(response: Any, max_depth: int = 6, min_base64_chars: int = 64) -> ImagePayload | None:
+    """
+    First image payload in `response` (a typed Response, a pydantic model, a dict
+    or a list of output items), or None. Nothing is serialised or stringified.
+    """
+
+    def walk(obj: Any, depth: int) -> ImagePayload | None:
+        if obj is None or depth > max_depth:
+            return None
+        if isinstance(obj, str):
+            return payload_from_string(obj, min_base64_chars)
+        if isinstance(obj, (list, tuple)):
+            for item in obj:
+                found = walk(item, depth + 1)
+                if found:
+                    return found
+            return None
+        if not isinstance(obj, (dict, BaseModel)):
+            return None
+        if _field(obj, "type") == "image_generation_call":
+            result = _field(obj, "result")
+            if isinstance(result, str) and result:
+                # the tool's result is raw base64 by contract, no need to pattern-check it
+                return ImagePayload("base64", memoryview(result.encode("ascii", "ignore")), "image/png")
+        for key in PAYLOAD_KEYS + CONTAINER_KEYS:
+            value = _field(obj, key)
+            if value:
+                found = walk(value, depth + 1)
+                if found:
+                    return found
+        return None
+
+    return walk(response, 0)
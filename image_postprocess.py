@@ -0,0 +1,141 @@
+"""
+Thumbnails and format conversion for generated images, off the event loop.
+
+Pillow work is CPU-bound and would stall the asyncio loop the agents run on, so
+`PostProcessor` sends it to a process pool. Each image is decoded once and
+every rendition is produced from that decode, largest first, each one scaled
+down from the previous: `Image.draft` lets JPEG decoders skip straight to a
+reduced scale, and `Image.reduce` does cheap integer box downscaling before
+the final resample. Outputs are named by the source's content hash, so an
+image already processed (a duplicate prompt, a re-run) costs one hash and no
+decode; concurrent requests for the same content share one job.
+
+    processor = PostProcessor("renditions/")
+    paths = await processor.process("otter.png")   # {"thumb": ".../<hash>-thumb.webp", ...}
+
+Pillow is an optional dependency (pip install Pillow); it is only imported in
+the worker processes.
+"""
+import asyncio
+import hashlib
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Rendition:
+    name: str
+    max_size: tuple[int, int] | None  # None keeps the original size
+    format: str = "WEBP"
+    quality: int = 80
+
+    @property
+    def extension(self) -> str:
+        return {"JPEG": "jpg"}.get(self.format, self.format.lower())
+
+
+DEFAULT_RENDITIONS = (
+    Rendition("full", None),
+    Rendition("medium", (768, 768)),
+    Rendition("thumb", (256, 256)),
+)
+
+
+@dataclass
+class PostProcessStats:
+    processed: int = 0
+    cache_hits: int = 0
+    coalesced: int = 0
+    seconds: float = 0.0  # wall time spent waiting on workers
+
+
+def rendition_path(out_dir: str, digest: str, rendition: Rendition) -> str:
+    return os.path.join(out_dir, f"{digest[:16]}-{rendition.name}.{rendition.extension}")
+
+
+def file_digest(path: str, chunk_size: int = 1024 * 1024) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def render(source: str, renditions: tuple[Rendition, ...], out_dir: str, digest: str) -> dict[str, str]:
+    """Worker side: one decode, every rendition. Runs in a pool process."""
+    try:
+        from PIL import Image
+    except ImportError:
+        raise ImportError("image post-processing needs Pillow: pip install Pillow")
+
+    ordered = sorted(renditions, key=lambda r: -(r.max_size[0] * r.max_size[1]) if r.max_size else float("-inf"))
+    largest = next((r.max_size for r in ordered if r.max_size), None)
+    paths = {}
+    with Image.open(source) as img:
+        if largest and all(r.max_size for r in ordered):
+            img.draft("RGB", largest)  # JPEG: decode at a reduced scale; no-op for PNG
+        current = img.convert("RGB") if img.mode not in ("RGB", "RGBA") else img.copy()
+    for rendition in ordered:
+        if rendition.max_size:
+            width, height = rendition.max_size
+            factor = min(current.width // width, current.height // height)
+            if factor >= 2:
+                current = current.reduce(factor)  # box filter by an integer factor, much cheaper than a resample
+            current.thumbnail(rendition.max_size, Image.Resampling.LANCZOS)
+        path = rendition_path(out_dir, digest, rendition)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        current.save(tmp_path, rendition.format, quality=rendition.quality)
+        os.replace(tmp_path, path)
+        paths[rendition.name] = path
+    return paths
+
+
+class PostProcessor:
+    def __init__(
+        self,
+        out_dir: str,
+        renditions: tuple[Rendition, ...] = DEFAULT_RENDITIONS,
+        max_workers: int | None = None,
+        executor: Executor | None = None,
+    ):
+        self.out_dir = out_dir
+        self.renditions = renditions
+        self.executor = executor or ProcessPoolExecutor(max_workers)
+        self._owns_executor = executor is None
+        self.stats = PostProcessStats()
+        self._in_flight: dict[str, asyncio.Future] = {}
+        os.makedirs(out_dir, exist_ok=True)
+
+    def cached(self, digest: str) -> dict[str, str] | None:
+        paths = {r.name: rendition_path(self.out_dir, digest, r) for r in self.renditions}
+        return paths if all(os.path.exists(p) for p in paths.values()) else None
+
+    async def process(self, source: str) -> dict[str, str]:
+        """Renditions of the image file at `source`, as {rendition name: path}."""
+        digest = await asyncio.to_thread(file_digest, source)
+        paths = self.cached(digest)
+        if paths is not None:
+            self.stats.cache_hits += 1
+            return paths
+        pending = self._in_flight.get(digest)
+        if pending is not None:
+            self.stats.coalesced += 1
+            return await asyncio.shield(pending)
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, render, source, self.renditions, self.out_dir, digest)
+        self._in_flight[digest] = future
+        start = time.perf_counter()
+        try:
+            paths = await asyncio.shield(future)
+        finally:
+            del self._in_flight[digest]
+        self.stats.processed += 1
+        self.stats.seconds += time.perf_counter() - start
+        return paths
+
+    def close(self) -> None:
+        if self._owns_executor:
+            self.executor.shutdown()
@@ -0,0 +1,126 @@
+"""
+Bounded LLM-as-a-judge loop for story.py / story2.py.
+
+The original loop alternates one outline and one evaluation per round, forever,
+resending the whole growing transcript both times. `judge_loop` instead asks the
+generator for `candidates` outlines at once, scores them with the evaluator side
+by side, keeps the best, and stops on the first `pass` or once `max_rounds` or
+`max_tokens` is used up. Each round only sees the original request, the best
+outline so far and its feedback.
+
+    session = await judge_loop(story_outline_generator, evaluator, msg, candidates=3)
+    print(session.outline, session.report())
+
+The evaluator's output needs `score` ("pass" / "needs improvement" / "fail") and
+`feedback` attributes, like story.py's `EvaluationFeedback`. For the candidates
+to differ, the generator should sample with a temperature above zero.
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from agents import Agent, ItemHelpers, Runner, Usage
+
+SCORE_RANK = {"pass": 2, "needs improvement": 1, "fail": 0}
+
+
+@dataclass
+class Candidate:
+    outline: str
+    score: str | None = None
+    feedback: str = ""
+
+    @property
+    def rank(self) -> int:
+        return SCORE_RANK.get(self.score or "", -1)
+
+
+@dataclass
+class JudgeSession:
+    best: Candidate | None = None
+    rounds: int = 0
+    model_calls: int = 0
+    usage: Usage = field(default_factory=Usage)
+    elapsed: float = 0.0
+
+    @property
+    def outline(self) -> str | None:
+        return self.best.outline if self.best else None
+
+    @property
+    def passed(self) -> bool:
+        return self.best is not None and self.best.score == "pass"
+
+    def report(self) -> str:
+        return (
+            f"rounds={self.rounds} model_calls={self.model_calls} "
+            f"tokens={self.usage.total_tokens} (in={self.usage.input_tokens} out={self.usage.output_tokens}) "
+            f"time={self.elapsed:.2f}s passed={self.passed}"
+        )
+
+
+def generator_prompt(request: str, best: Candidate | None) -> str:
+    if best is None:
+        return request
+    return f"{request}\n\nPrevious outline:\n{best.outline}\n\nfeedback: {best.feedback}"
+
+
+def evaluator_prompt(request: str, outline: str, attempt: int) -> str:
+    # the evaluator no longer sees the transcript, so tell it which attempt this is
+    return f"Request: {request}\n\nStory outline (attempt {attempt}):\n{outline}"
+
+
+async def judge_loop(
+    generator: Agent,
+    evaluator: Agent,
+    request: str,
+    candidates: int = 3,
+    max_rounds: int = 5,
+    max_tokens: int | None = None,
+    **run_kwargs: Any,
+) -> JudgeSession:
+    """
+    Run generate/evaluate rounds until a candidate passes or the budget is spent,
+    and return the best candidate seen. The token budget is checked between
+    rounds, so one round may overshoot it. Evaluations still running when a
+    candidate passes are cancelled.
+    """
+    session = JudgeSession()
+    start = time.perf_counter()
+
+    def account(result) -> None:
+        session.model_calls += len(result.raw_responses)
+        session.usage.add(result.context_wrapper.usage)
+
+    async def evaluate(outline: str) -> Candidate:
+        result = await Runner.run(evaluator, evaluator_prompt(request, outline, session.rounds), **run_kwargs)
+        account(result)
+        return Candidate(outline, result.final_output.score, result.final_output.feedback)
+
+    try:
+        while session.rounds < max_rounds:
+            if max_tokens is not None and session.usage.total_tokens >= max_tokens:
+                break
+            session.rounds += 1
+
+            prompt = generator_prompt(request, session.best)
+            generated = await asyncio.gather(*(Runner.run(generator, prompt, **run_kwargs) for _ in range(candidates)))
+            for result in generated:
+                account(result)
+            outlines = list(dict.fromkeys(ItemHelpers.text_message_outputs(result.new_items) for result in generated))
+
+            tasks = [asyncio.create_task(evaluate(outline)) for outline in outlines]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    candidate = await next_done
+                    if session.best is None or candidate.rank >= session.best.rank:
+                        session.best = candidate
+                    if candidate.score == "pass":
+                        return session
+            finally:
+                for task in tasks:
+                    task.cancel()
+        return session
+    finally:
+        session.elapsed = time.perf_counter() - start
@@ -0,0 +1,171 @@
+"""
+Local language routing for routing.py, so triage_agent is only asked when needed.
+
+`LanguageDetector` scores text against character trigram profiles built from the
+small samples below (no network, microseconds per call). `StickyRouter` picks the
+language agent directly when detection is confident, otherwise falls back to the
+agent the conversation last used (kept per conversation_id with a TTL), and only
+then to the triage agent.
+
+    router = StickyRouter({"en": english_agent, "fr": french_agent, "es": spanish_agent}, triage_agent)
+    agent = router.route(conversation_id, msg)
+    result = Runner.run_streamed(agent, ...)
+    router.remember(conversation_id, result.current_agent)
+"""
+import math
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass
+
+from agents import Agent
+
+SAMPLES = {
+    "en": (
+        "Hello, how are you today? I would like to know what time the shop opens and whether "
+        "you have any tickets left for the evening show. Thank you very much for your help, "
+        "that is really kind of you. Can you tell me where the nearest station is? I think we "
+        "should meet there at the weekend. What do you think about the weather this week? It "
+        "has been raining every day and the children want to play outside with their friends. "
+        "I need help with my order, it has not arrived yet and I want to know why. Could you "
+        "please tell me a story about a cat who lives in the city? My name is John and I live "
+        "in London with my family. We are going to travel next summer, which country should we "
+        "visit? Please explain how this works, because I don't understand the question. Where "
+        "can I buy a coffee and something to eat? Yes, no, maybe, thanks, good morning, good "
+        "night, see you later, what is this, who are you, why not, which one is better?"
+    ),
+    "fr": (
+        "Bonjour, comment allez-vous aujourd'hui ? Je voudrais savoir à quelle heure le magasin "
+        "ouvre et s'il vous reste des billets pour le spectacle de ce soir. Merci beaucoup pour "
+        "votre aide, c'est vraiment gentil. Pouvez-vous me dire où se trouve la gare la plus "
+        "proche ? Je pense que nous devrions nous retrouver là-bas ce week-end. Qu'est-ce que "
+        "vous pensez du temps cette semaine ? Il pleut tous les jours et les enfants veulent "
+        "jouer dehors avec leurs amis. J'ai besoin d'aide avec ma commande, elle n'est pas encore "
+        "arrivée et je veux savoir pourquoi. Pourriez-vous me raconter une histoire sur un chat "
+        "qui habite en ville ? Je m'appelle Jean et j'habite à Paris avec ma famille. Nous allons "
+        "voyager l'été prochain, quel pays devrions-nous visiter ? Expliquez-moi comment cela "
+        "fonctionne, parce que je ne comprends pas la question. Où est-ce que je peux acheter un "
+        "café et quelque chose à manger ? Oui, non, peut-être, merci, bonsoir, bonne nuit, à "
+        "bientôt, qu'est-ce que c'est, qui êtes-vous, pourquoi pas, lequel est le meilleur ?"
+    ),
+    "es": (
+        "Hola, ¿cómo estás hoy? Me gustaría saber a qué hora abre la tienda y si todavía quedan "
+        "entradas para el espectáculo de esta noche. Muchas gracias por tu ayuda, eres muy "
+        "amable. ¿Puedes decirme dónde está la estación más cercana? Creo que deberíamos "
+        "encontrarnos allí el fin de semana. ¿Qué piensas del tiempo esta semana? Ha llovido "
+        "todos los días y los niños quieren jugar fuera con sus amigos. Necesito ayuda con mi "
+        "pedido, todavía no ha llegado y quiero saber por qué. ¿Podrías contarme una historia "
+        "sobre un gato que vive en la ciudad? Me llamo Juan y vivo en Madrid con mi familia. "
+        "Vamos a viajar el próximo verano, ¿qué país deberíamos visitar? Por favor, explícame "
+        "cómo funciona esto, porque no entiendo la pregunta. ¿Dónde puedo comprar un café y "
+        "algo de comer? Sí, no, quizás, gracias, buenos días, buenas noches, hasta luego, ¿qué "
+        "es esto?, ¿quién eres?, ¿por qué no?, ¿cuál es mejor?"
+    ),
+}
+
+_non_word = re.compile(r"[^\w']+")
+
+
+def ngram_counts(text: str, sizes: tuple[int, ...] = (3,)) -> Counter:
+    text = f" {_non_word.sub(' ', text.lower()).strip()} "
+    return Counter(text[i:i + n] for n in sizes for i in range(len(text) - n + 1))
+
+
+class LanguageDetector:
+    """Cosine similarity between the text's n-gram counts and each language profile."""
+
+    def __init__(self, samples: dict[str, str] = SAMPLES):
+        self.profiles = {}
+        for language, sample in samples.items():
+            counts = ngram_counts(sample)
+            norm = math.sqrt(sum(c * c for c in counts.values()))
+            self.profiles[language] = {gram: c / norm for gram, c in counts.items()}
+
+    def detect(self, text: str) -> tuple[str | None, float]:
+        """
+        Best language and a confidence in [0, 1]: how far the best score is ahead of the
+        runner-up, relative to the best. Short or mixed text gives a low confidence.
+        """
+        counts = ngram_counts(text)
+        norm = math.sqrt(sum(c * c for c in counts.values()))
+        if not norm:
+            return None, 0.0
+        scores = sorted(
+            (
+                (sum(c * profile.get(gram, 0.0) for gram, c in counts.items()) / norm, language)
+                for language, profile in self.profiles.items()
+            ),
+            reverse=True,
+        )
+        (best, language), (second, _) = scores[0], scores[1]
+        if best <= 0:
+            return None, 0.0
+        return language, (best - second) / best
+
+
+@dataclass
+class RouterStats:
+    detected: int = 0
+    sticky: int = 0
+    triage_calls: int = 0
+
+    @property
+    def triage_avoided(self) -> int:
+        return self.detected + self.sticky
+
+
+class StickyRouter:
+    def __init__(
+        self,
+        agents: dict[str, Agent],
+        triage_agent: Agent,
+        detector: LanguageDetector | None = None,
+        min_confidence: float = 0.25,
+        ttl: float = 30 * 60,
+        max_conversations: int = 100_000,
+    ):
+        self.agents = agents
+        self.triage_agent = triage_agent
+        self.detector = detector or LanguageDetector()
+        self.min_confidence = min_confidence
+        self.ttl = ttl
+        self.max_conversations = max_conversations
+        self.stats = RouterStats()
+        self._sticky: dict[str, tuple[Agent, float]] = {}  # conversation_id -> (agent, expires_at)
+
+    def route(self, conversation_id: str, text: str) -> Agent:
+        language, confidence = self.detector.detect(text)
+        if language in self.agents and confidence >= self.min_confidence:
+            self.stats.detected += 1
+            agent = self.agents[language]
+            self.remember(conversation_id, agent)
+            return agent
+
+        entry = self._sticky.get(conversation_id)
+        if entry is not None:
+            agent, expires_at = entry
+            if expires_at > time.monotonic():
+                self.stats.sticky += 1
+                self.remember(conversation_id, agent)
+                return agent
+            del self._sticky[conversation_id]
+
+        self.stats.triage_calls += 1
+        return self.triage_agent
+
+    def remember(self, conversation_id: str, agent: Agent) -> None:
+        """Stick the conversation to `agent` (ignored for agents outside the language set)."""
+        if agent not in self.agents.values():
+            return
+        if conversation_id not in self._sticky and len(self._sticky) >= self.max_conversations:
+            self._evict_expired()
+            if len(self._sticky) >= self.max_conversations:
+                # still full: drop the oldest entry (dicts keep insertion order)
+                del self._sticky[next(iter(self._sticky))]
+        self._sticky.pop(conversation_id, None)
+        self._sticky[conversation_id] = (agent, time.monotonic() + self.ttl)
+
+    def _evict_expired(self) -> None:
+        now = time.monotonic()
+        for conversation_id in [cid for cid, (_, expires_at) in self._sticky.items() if expires_at <= now]:
+            del self._sticky[conversation_id]
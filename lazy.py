@@ -0,0 +1,64 @@
+"""
+Helpers for keeping imports cheap and free of side effects.
+
+`lazy_import` returns a module whose code only runs on first attribute access,
+for heavy SDKs a script may not need on every path (google.generativeai, PIL,
+openai in the image tools):
+
+    genai = lazy_import("google.generativeai")   # nothing imported yet
+    genai.configure(api_key=...)                 # imported here
+
+`once` turns a zero-argument factory into a thread-safe, build-on-first-call
+accessor, for clients and agents that used to be created at import time:
+
+    @once
+    def translation_backend() -> BatchingTranslator:
+        return BatchingTranslator(get_openai_client())
+
+A missing module still fails at `lazy_import` time (the import system finds
+the spec eagerly); only executing it is deferred.
+"""
+import functools
+import importlib.util
+import sys
+import threading
+from collections.abc import Callable
+from types import ModuleType
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+def lazy_import(name: str) -> ModuleType:
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def once(factory: Callable[[], T]) -> Callable[[], T]:
+    lock = threading.Lock()
+    result: list[T] = []
+
+    @functools.wraps(factory)
+    def get() -> T:
+        if not result:
+            with lock:
+                if not result:
+                    result.append(factory())
+        return result[0]
+
+    def reset() -> None:
+        with lock:
+            result.clear()
+
+    get.reset = reset  # type: ignore[attr-defined]
+    return get
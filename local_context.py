@@ -1,32 +1,17 @@
-import os
 import asyncio
-from dotenv import load_dotenv, find_dotenv
 from dataclasses import dataclass
-from agents import Agent, ModelSettings, Runner,OpenAIChatCompletionsModel, function_tool, RunContextWrapper
-from openai import AsyncOpenAI 
+from agents import Agent, ModelSettings, Runner, RunContextWrapper
+from provider import get_model
+from tool_executor import default_executor
 
-
-_:bool = load_dotenv(find_dotenv())
-openai_api_key = os.getenv("OPENAI_API_KEY")
-gemini_api_key = os.getenv("GEMINI_API_KEY")
-if not gemini_api_key and not openai_api_key:
-    raise ValueError("GEMINI_API_KEY environment variable not set")
-
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
-llm_model = OpenAIChatCompletionsModel(
-    openai_client=external_client,
-    model="gemini-2.5-flash",
-)
+llm_model = get_model("gemini-2.5-flash")
 
 @dataclass
 class UserContext:
     username:str
     email:str
 
-@function_tool
+@default_executor.tool(timeout=5)
 async def search(local_context:RunContextWrapper[UserContext], query:str)->str:
     
     await asyncio.sleep(2)
@@ -57,4 +42,5 @@ async def call_agent():
     )
     print(f"\nOutput:{output.final_output}")
 
-asyncio.run(call_agent())
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(call_agent())
\ No newline at end of file
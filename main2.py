@@ -1,37 +1,18 @@
-import os
-from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel,RunConfig, ModelSettings
-from agents.run import AgentRunner, set_default_agent_runner
-from dotenv import load_dotenv
+from agents import Agent, ModelSettings
+from agents.run import set_default_agent_runner
+from profiling_runner import ProfilingRunner
+from provider import get_model, get_run_config
 import asyncio
 
-load_dotenv()
-gemini_api = os.getenv('GEMINI_API_KEY')
-if not gemini_api:
-    raise ValueError("api key not set")
+model = get_model("gemini-2.5-flash")
 
-external_client = AsyncOpenAI(
-    api_key=gemini_api,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-
-model= OpenAIChatCompletionsModel(
-    openai_client=external_client,
-    model="gemini-2.5-flash"
-)
+config = get_run_config(model, tracing_disabled=True)
 
-config=RunConfig(
-    model=model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
 
 
+class CustomAgentRunner(ProfilingRunner):
+    """Opt-in profiling: PROFILE_SAMPLE_RATE=0.01 writes traces for 1% of runs to PROFILE_DIR."""
 
-class CustomAgentRunner(AgentRunner):
-    async def run(self, starting_agent, input, **kwargs):
-        return await super().run(starting_agent, input, **kwargs)
-    
-set_default_agent_runner(CustomAgentRunner())
 
 # More focused vocabulary
 focused_agent = Agent(
@@ -57,7 +38,8 @@ agent= Agent(
 
 
 async def main():
-    runner = CustomAgentRunner()
+    runner = CustomAgentRunner.from_env()
+    set_default_agent_runner(runner)  # Runner.run calls made while this script runs are profiled too
     result = await runner.run(focused_agent, "write about wisdom", run_config=config)
     print(result.final_output)
 
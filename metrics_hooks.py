@@ -0,0 +1,308 @@
+"""
+Per-agent, per-tool and per-handoff latency, token and error metrics from the
+SDK's lifecycle hooks, exported as Prometheus text or a JSON snapshot.
+
+agent_hook.py's TestAgHooks printed `context.usage` on every event. Here the
+hooks only take a timestamp and update a few dict entries; everything else
+(quantiles, formatting) happens when a snapshot is asked for.
+
+    collector = MetricsCollector()
+    agent = Agent(..., hooks=MetricsHooks(collector))     # one agent
+    await Runner.run(agent, input, hooks=collector.run_hooks)   # or every agent in a run
+    await collector.run(agent, input)                     # same, and counts errors that end the run
+    print(collector.to_prometheus())
+
+Latencies go into log-linear (HDR-style) histograms: 32 linear sub-buckets per
+power of two of microseconds, so any quantile is within ~3% of the exact
+value at a fixed cost per sample. Each thread writes only to its own shard,
+so recording needs no lock; snapshots merge the shards. Tokens per agent are
+the growth of the run's `context.usage` between the agent starting and
+finishing or handing off. The SDK turns tool exceptions into an error string
+for the model, so a tool counts as failed when its result is that string.
+"""
+import contextvars
+import json
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any
+
+from agents import Agent, AgentHooks, RunContextWrapper, RunHooks, Runner, Tool
+
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+TOOL_ERROR_PREFIX = "An error occurred while running the tool"  # agents.tool.default_tool_error_function
+
+
+class HdrHistogram:
+    """Log-linear histogram of non-negative integers (here: microseconds)."""
+
+    SUB_BITS = 5
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts: dict[int, int] = defaultdict(int)
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, value: int) -> None:
+        shift = value.bit_length() - self.SUB_BITS - 1
+        if shift < 0:
+            shift = 0
+        self.counts[(shift << self.SUB_BITS) + (value >> shift)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    @classmethod
+    def bucket_bounds(cls, index: int) -> tuple[int, int]:
+        shift = max(0, (index >> cls.SUB_BITS) - 1)
+        low = (index - (shift << cls.SUB_BITS)) << shift
+        return low, low + (1 << shift) - 1
+
+    def merge(self, other: "HdrHistogram") -> None:
+        for index, count in list(other.counts.items()):
+            self.counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> int:
+        if not self.count:
+            return 0
+        rank = max(1, round(q * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self.max, self.bucket_bounds(index)[1])
+        return self.max
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean_us": round(self.total / self.count, 1) if self.count else 0.0,
+            **{f"p{q * 100:g}_us": self.quantile(q) for q in QUANTILES},
+            "max_us": self.max,
+        }
+
+
+@dataclass
+class _Shard:
+    """One thread's accumulators. Only the owning thread writes to it."""
+
+    histograms: dict[tuple, HdrHistogram] = field(default_factory=lambda: defaultdict(HdrHistogram))
+    counters: dict[tuple, int] = field(default_factory=lambda: defaultdict(int))
+    # open spans: (context id, agent name) -> (start ns, input tokens, output tokens); tool call id -> start ns
+    agents: dict[tuple[int, str], tuple[int, int, int]] = field(default_factory=dict)
+    tools: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class _RunState:
+    """Set by MetricsCollector.run so an exception can be pinned on the agent that was running."""
+
+    context_id: int | None = None
+    agent: str | None = None
+
+
+_current_run: contextvars.ContextVar[_RunState | None] = contextvars.ContextVar("metrics_run", default=None)
+
+
+class MetricsCollector:
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: list[_Shard] = []
+        self._lock = threading.Lock()  # only taken when a thread records for the first time
+        self.run_hooks = MetricsRunHooks(self)
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    # recording (called from the hooks)
+
+    def agent_started(self, context: RunContextWrapper, agent: Agent) -> None:
+        usage = context.usage
+        self._shard().agents[(id(context), agent.name)] = (time.perf_counter_ns(), usage.input_tokens, usage.output_tokens)
+        state = _current_run.get()
+        if state is not None:
+            state.context_id, state.agent = id(context), agent.name
+
+    def agent_finished(self, context: RunContextWrapper, agent: Agent, handoff_to: Agent | None = None) -> None:
+        shard = self._shard()
+        opened = shard.agents.pop((id(context), agent.name), None)
+        if opened is None:
+            return
+        start, input_tokens, output_tokens = opened
+        elapsed = (time.perf_counter_ns() - start) // 1000
+        usage = context.usage
+        shard.counters[("tokens", agent.name, "input")] += usage.input_tokens - input_tokens
+        shard.counters[("tokens", agent.name, "output")] += usage.output_tokens - output_tokens
+        if handoff_to is None:
+            shard.histograms[("agent", agent.name)].record(elapsed)
+        else:
+            shard.histograms[("handoff", agent.name, handoff_to.name)].record(elapsed)
+
+    def tool_started(self, context: RunContextWrapper, tool: Tool) -> None:
+        self._shard().tools[getattr(context, "tool_call_id", None) or tool.name] = time.perf_counter_ns()
+
+    def tool_finished(self, context: RunContextWrapper, agent: Agent, tool: Tool, result: Any) -> None:
+        shard = self._shard()
+        start = shard.tools.pop(getattr(context, "tool_call_id", None) or tool.name, None)
+        if start is None:
+            return
+        shard.histograms[("tool", agent.name, tool.name)].record((time.perf_counter_ns() - start) // 1000)
+        if isinstance(result, str) and result.startswith(TOOL_ERROR_PREFIX):
+            shard.counters[("tool_errors", agent.name, tool.name)] += 1
+
+    def error(self, agent_name: str, error: BaseException, context_id: int | None = None) -> None:
+        shard = self._shard()
+        shard.counters[("errors", agent_name, type(error).__name__)] += 1
+        if context_id is not None:
+            shard.agents.pop((context_id, agent_name), None)
+
+    async def run(self, starting_agent: Agent, input: Any, **kwargs: Any):
+        """Runner.run with these metrics as run hooks, counting the exception if the run fails."""
+        kwargs.setdefault("hooks", self.run_hooks)
+        state = _RunState()
+        token = _current_run.set(state)
+        try:
+            return await Runner.run(starting_agent, input, **kwargs)
+        except Exception as e:
+            self.error(state.agent or starting_agent.name, e, state.context_id)
+            raise
+        finally:
+            _current_run.reset(token)
+
+    # export
+
+    def merged(self) -> tuple[dict[tuple, HdrHistogram], dict[tuple, int]]:
+        histograms: dict[tuple, HdrHistogram] = defaultdict(HdrHistogram)
+        counters: dict[tuple, int] = defaultdict(int)
+        with self._lock:
+            shards = list(self._shards)
+        for shard in shards:
+            for key, histogram in list(shard.histograms.items()):
+                histograms[key].merge(histogram)
+            for key, value in list(shard.counters.items()):
+                counters[key] += value
+        return histograms, counters
+
+    def snapshot(self) -> dict[str, Any]:
+        histograms, counters = self.merged()
+        agents: dict[str, dict[str, Any]] = defaultdict(lambda: {"input_tokens": 0, "output_tokens": 0, "errors": {}})
+        tools: dict[str, dict[str, Any]] = {}
+        handoffs: dict[str, dict[str, Any]] = {}
+        for key, histogram in sorted(histograms.items()):
+            if key[0] == "agent":
+                agents[key[1]]["latency"] = histogram.summary()
+            elif key[0] == "tool":
+                tools[f"{key[1]}/{key[2]}"] = {"latency": histogram.summary(), "errors": 0}
+            else:
+                handoffs[f"{key[1]}->{key[2]}"] = {"latency": histogram.summary()}
+        for key, value in sorted(counters.items()):
+            if key[0] == "tokens":
+                agents[key[1]][f"{key[2]}_tokens"] += value
+            elif key[0] == "errors":
+                agents[key[1]]["errors"][key[2]] = value
+            else:
+                tools.setdefault(f"{key[1]}/{key[2]}", {"errors": 0})["errors"] = value
+        return {"agents": dict(agents), "tools": tools, "handoffs": handoffs}
+
+    def to_json(self, **kwargs: Any) -> str:
+        return json.dumps(self.snapshot(), **kwargs)
+
+    def to_prometheus(self, prefix: str = "agents") -> str:
+        """Prometheus text exposition format: latencies as summaries (seconds), the rest as counters."""
+        histograms, counters = self.merged()
+        families = {
+            "agent": (f"{prefix}_agent_duration_seconds", ("agent",), "Wall time from agent start to final output."),
+            "tool": (f"{prefix}_tool_duration_seconds", ("agent", "tool"), "Wall time of one tool call."),
+            "handoff": (
+                f"{prefix}_handoff_duration_seconds",
+                ("source", "target"),
+                "Wall time the source agent ran before handing off.",
+            ),
+        }
+        counter_families = {
+            "tokens": (f"{prefix}_tokens_total", ("agent", "direction"), "Model tokens used while the agent ran."),
+            "errors": (f"{prefix}_errors_total", ("agent", "error"), "Runs that failed while the agent ran."),
+            "tool_errors": (f"{prefix}_tool_errors_total", ("agent", "tool"), "Tool calls that returned an error."),
+        }
+        lines = []
+        for kind, (name, label_names, help_text) in families.items():
+            series = sorted((key, h) for key, h in histograms.items() if key[0] == kind)
+            if not series:
+                continue
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} summary"]
+            for key, histogram in series:
+                labels = _labels(label_names, key[1:])
+                for q in QUANTILES:
+                    lines.append(f'{name}{{{labels},quantile="{q}"}} {histogram.quantile(q) / 1e6}')
+                lines.append(f"{name}_sum{{{labels}}} {histogram.total / 1e6}")
+                lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+        for kind, (name, label_names, help_text) in counter_families.items():
+            series = sorted((key, v) for key, v in counters.items() if key[0] == kind)
+            if not series:
+                continue
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            lines += [f"{name}{{{_labels(label_names, key[1:])}}} {value}" for key, value in series]
+        return "\n".join(lines) + "\n"
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    escape = lambda v: str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return ",".join(f'{name}="{escape(value)}"' for name, value in zip(names, values))
+
+
+class MetricsHooks(AgentHooks):
+    """Per-agent hooks: `Agent(..., hooks=MetricsHooks(collector))`."""
+
+    def __init__(self, collector: MetricsCollector):
+        self.collector = collector
+
+    async def on_start(self, context: RunContextWrapper, agent: Agent) -> None:
+        self.collector.agent_started(context, agent)
+
+    async def on_end(self, context: RunContextWrapper, agent: Agent, output: Any) -> None:
+        self.collector.agent_finished(context, agent)
+
+    async def on_handoff(self, context: RunContextWrapper, agent: Agent, source: Agent) -> None:
+        # the SDK calls this on the *source* agent's hooks, with `agent` the target
+        self.collector.agent_finished(context, source, handoff_to=agent)
+
+    async def on_tool_start(self, context: RunContextWrapper, agent: Agent, tool: Tool) -> None:
+        self.collector.tool_started(context, tool)
+
+    async def on_tool_end(self, context: RunContextWrapper, agent: Agent, tool: Tool, result: str) -> None:
+        self.collector.tool_finished(context, agent, tool, result)
+
+
+class MetricsRunHooks(RunHooks):
+    """Run-wide hooks covering every agent: `Runner.run(..., hooks=collector.run_hooks)`."""
+
+    def __init__(self, collector: MetricsCollector):
+        self.collector = collector
+
+    async def on_agent_start(self, context: RunContextWrapper, agent: Agent) -> None:
+        self.collector.agent_started(context, agent)
+
+    async def on_agent_end(self, context: RunContextWrapper, agent: Agent, output: Any) -> None:
+        self.collector.agent_finished(context, agent)
+
+    async def on_handoff(self, context: RunContextWrapper, from_agent: Agent, to_agent: Agent) -> None:
+        self.collector.agent_finished(context, from_agent, handoff_to=to_agent)
+
+    async def on_tool_start(self, context: RunContextWrapper, agent: Agent, tool: Tool) -> None:
+        self.collector.tool_started(context, tool)
+
+    async def on_tool_end(self, context: RunContextWrapper, agent: Agent, tool: Tool, result: str) -> None:
+        self.collector.tool_finished(context, agent, tool, result)
@@ -0,0 +1,62 @@
+"""
+Stream events for a finished `ModelResponse`.
+
+Anything that has a whole response but must answer `Model.stream_response`
+(a cache hit, a scripted fake) replays it through `response_events`: the
+created event, word-sized text deltas, then the completed event, which is what
+`Runner.run_streamed` needs to emit its own events.
+"""
+import time
+import uuid
+
+from agents import ModelResponse
+from openai.types.responses import (
+    Response,
+    ResponseCompletedEvent,
+    ResponseCreatedEvent,
+    ResponseOutputMessage,
+    ResponseTextDeltaEvent,
+    ResponseUsage,
+)
+from openai.types.responses.response_usage import InputTokensDetails, OutputTokensDetails
+
+
+def response_events(response: ModelResponse, words_per_delta: int = 1) -> list:
+    """Created event, one text delta per word of each message, then the completed event."""
+    final = Response(
+        id=response.response_id or f"resp_{uuid.uuid4().hex[:12]}",
+        created_at=time.time(),
+        model="fake",
+        object="response",
+        output=response.output,
+        tool_choice="auto",
+        tools=[],
+        parallel_tool_calls=False,
+        usage=ResponseUsage(
+            input_tokens=response.usage.input_tokens,
+            output_tokens=response.usage.output_tokens,
+            total_tokens=response.usage.total_tokens,
+            input_tokens_details=InputTokensDetails(cached_tokens=0),
+            output_tokens_details=OutputTokensDetails(reasoning_tokens=0),
+        ),
+    )
+    events: list = [ResponseCreatedEvent(type="response.created", response=final.model_copy(update={"output": []}), sequence_number=0)]
+    for output_index, item in enumerate(response.output):
+        if not isinstance(item, ResponseOutputMessage):
+            continue
+        for content_index, part in enumerate(item.content):
+            words = getattr(part, "text", "").split(" ")
+            for i in range(0, len(words), words_per_delta):
+                delta = " ".join(words[i:i + words_per_delta])
+                if i + words_per_delta < len(words):
+                    delta += " "
+                events.append(ResponseTextDeltaEvent(
+                    type="response.output_text.delta",
+                    item_id=item.id,
+                    output_index=output_index,
+                    content_index=content_index,
+                    delta=delta,
+                    sequence_number=len(events),
+                ))
+    events.append(ResponseCompletedEvent(type="response.completed", response=final, sequence_number=len(events)))
+    return events
@@ -1,33 +1,23 @@
-from agents import Agent, ModelSettings, OpenAIChatCompletionsModel, RunConfig, RunContextWrapper, Runner, function_tool
-import os
-from dotenv import load_dotenv
-from openai import AsyncOpenAI
-load_dotenv()
-
-openai_key = os.getenv('OPENAI_API_KEY')
-if not openai_key:
-    raise ValueError('openai api key not set')
-
-gemini_api = os.getenv('GEMINI_API_KEY')
-if not gemini_api:
-    raise ValueError("api key not set")
-
-external_client = AsyncOpenAI(
-    api_key=gemini_api,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
+from agents import Agent, ModelSettings, RunContextWrapper, Runner
+from response_cache import CachedModel
+from lazy import once
+from provider import get_model, get_openai_client, get_run_config
+from tool_executor import default_executor
+from translation import BatchingTranslator
 
-model= OpenAIChatCompletionsModel(
-    openai_client=external_client,
-    model="gemini-2.0-flash"
-)
 
-config=RunConfig(
-    model=model,
-    model_provider=external_client,
-    tracing_disabled=False
-)
-openai_client=AsyncOpenAI(api_key=openai_key)
+# memoized, coalesced and micro-batched: parallel tool calls share one request.
+# Built on the first translation, so importing this module needs no OpenAI key.
+@once
+def translation_backend() -> BatchingTranslator:
+    return BatchingTranslator(get_openai_client(), model="gpt-4o-mini")
+
+
+model = get_model("gemini-2.0-flash")
+# deterministic tool agents below keep getting identical prompts
+cached_model = CachedModel(model)
+
+config = get_run_config(model, tracing_disabled=False)
 
 
 # 1. Temperature => The Creativity Knob
@@ -58,7 +48,8 @@ agent_creative = Agent(
 )
 
 # 2. Tool Choice - The "can I use tools" switch
-@function_tool
+# sync tools run in default_executor's thread pool, off the event loop
+@default_executor.tool
 def calculator(a:int,b:int,op:str)-> int|str|float:
     if op=='add' or op == 'plus' or op == 'sum' or op == '+':
         return a+b
@@ -74,12 +65,12 @@ def calculator(a:int,b:int,op:str)-> int|str|float:
     else:
         return {"error": f"Unsupported operation: {op}"}
 
-@function_tool
+@default_executor.tool(timeout=10, max_concurrency=8)
 def weather(city:str):
     return f'weather of {city} is cloudy'
 
 
-@function_tool
+@default_executor.tool(timeout=30)
 async def translator(
     ctx: RunContextWrapper,
     from_language: str,
@@ -89,15 +80,7 @@ async def translator(
     """
     Translate text from one language to another using OpenAI.
     """
-    response = await openai_client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": f"You are a translator. Translate from {from_language} to {to_language}."},
-            {"role": "user", "content": text}
-        ]
-    )
-    
-    translation = response.choices[0].message.content
+    translation = await translation_backend().translate(from_language, to_language, text)
     return {"translation": translation}
 
 
@@ -108,7 +91,7 @@ agent_auto = Agent(
     tools=[calculator, weather],
     model_settings=ModelSettings(tool_choice='auto'),
     #model="gpt-4o-mini"
-    model=model
+    model=cached_model
 )
 
 agent_required = Agent(
@@ -116,7 +99,7 @@ agent_required = Agent(
     tools=[calculator, weather],
     model_settings=ModelSettings(tool_choice='required'),
     #model='gpt-4o-mini'
-    model=model
+    model=cached_model
 )
 
 agent_no_tools = Agent(
@@ -124,7 +107,7 @@ agent_no_tools = Agent(
     tools=[calculator, weather],
     model_settings=ModelSettings(tool_choice='none', max_tokens=100),
     #model='gpt-4o-mini'
-    model=model
+    model=cached_model
 )
 
 # 3. Max Tokens - The Response Length Limit
@@ -161,7 +144,14 @@ sequential_agent = Agent(
     model=model
 )
 
-# result=Runner.run_sync(focused_agent,"what is openai agents sdk?")
-result = Runner.run_sync(focused_agent, "write story on openai agents sdk revolution?")
-print(result.final_output)
+
+def main():
+    # result=Runner.run_sync(focused_agent,"what is openai agents sdk?")
+    result = Runner.run_sync(focused_agent, "write story on openai agents sdk revolution?")
+    print(result.final_output)
+
+
+if __name__ == "__main__":
+    main()
+
 
@@ -0,0 +1,284 @@
+"""
+An AgentRunner that shows where a run's time goes.
+
+For a sampled fraction of runs (`sample_rate`), `ProfilingRunner` times each
+phase of every turn separately (input guardrails, model call, tool execution,
+handoff, output guardrails) and, with `stack_interval` set, samples the event
+loop thread's Python stack in a background thread. Each profiled run writes:
+
+- `<out_dir>/<run_id>.trace.json`: Chrome trace-event JSON; open it in
+  chrome://tracing or https://ui.perfetto.dev. Guardrails get their own lane,
+  since the input guardrails run concurrently with the first turn.
+- `<out_dir>/<run_id>.folded`: collapsed stacks, one `frame;frame;... count`
+  line each, for flamegraph.pl / speedscope / inferno.
+
+Runs that are not sampled pay one random() call and a context variable lookup
+per phase, so the runner can stay installed in production with a low rate.
+
+    set_default_agent_runner(ProfilingRunner(sample_rate=0.01, out_dir="profiles"))
+
+The phases hook the AgentRunner classmethods that the SDK's run loop calls
+(`_run_input_guardrails`, `_get_new_response`,
+`_get_single_step_result_from_response`, `_run_output_guardrails`). A step
+that ends in a handoff is recorded as "handoff", one that ran tools as
+"tools". Streamed runs are not profiled. Stack samples cover the whole loop
+thread: with several profiled runs in flight, each run's samples include
+what the others were doing at the time.
+"""
+import contextvars
+import itertools
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from types import FrameType
+from typing import Any
+
+from agents.items import ToolCallOutputItem
+from agents.run import AgentRunner
+
+try:
+    from agents._run_impl import NextStepHandoff
+except ImportError:  # private module; only used to name the phase
+    NextStepHandoff = None
+
+GUARDRAIL_PHASES = ("input_guardrails", "output_guardrails")
+
+
+@dataclass(eq=False)  # hashed by identity: StackSampler keeps a set of them
+class RunProfile:
+    run_id: str
+    agent: str
+    thread_id: int
+    started: float = field(default_factory=time.perf_counter)
+    ended: float | None = None
+    events: list[dict[str, Any]] = field(default_factory=list)
+    stacks: Counter[str] = field(default_factory=Counter)
+
+    @contextmanager
+    def phase(self, name: str, agent: str) -> Iterator[dict[str, Any]]:
+        start = time.perf_counter()
+        args: dict[str, Any] = {"agent": agent}
+        try:
+            yield args
+        finally:
+            self.events.append({"name": args.pop("phase", name), "start": start, "end": time.perf_counter(), "args": args})
+
+    @property
+    def seconds(self) -> float:
+        return (self.ended or time.perf_counter()) - self.started
+
+    def totals(self) -> dict[str, float]:
+        totals: dict[str, float] = {}
+        for event in self.events:
+            totals[event["name"]] = totals.get(event["name"], 0.0) + event["end"] - event["start"]
+        return totals
+
+    def chrome_trace(self) -> dict[str, Any]:
+        pid = os.getpid()
+        us = lambda t: round((t - self.started) * 1e6, 1)
+        lanes = {"run": 1, "guardrails": 2}
+        events: list[dict[str, Any]] = [
+            {"ph": "M", "name": "thread_name", "pid": pid, "tid": tid, "args": {"name": lane}} for lane, tid in lanes.items()
+        ]
+        events.append({
+            "ph": "X", "name": f"run {self.agent}", "cat": "run", "pid": pid, "tid": lanes["run"],
+            "ts": 0, "dur": us(self.ended or time.perf_counter()), "args": {"run_id": self.run_id},
+        })
+        for event in self.events:
+            lane = "guardrails" if event["name"] in GUARDRAIL_PHASES else "run"
+            events.append({
+                "ph": "X", "name": event["name"], "cat": event["name"], "pid": pid, "tid": lanes[lane],
+                "ts": us(event["start"]), "dur": round((event["end"] - event["start"]) * 1e6, 1), "args": event["args"],
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def write(self, out_dir: str) -> tuple[str, str]:
+        os.makedirs(out_dir, exist_ok=True)
+        trace_path = os.path.join(out_dir, f"{self.run_id}.trace.json")
+        folded_path = os.path.join(out_dir, f"{self.run_id}.folded")
+        with open(trace_path, "w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+        with open(folded_path, "w", encoding="utf-8") as f:
+            f.write(self.collapsed())
+        return trace_path, folded_path
+
+
+class StackSampler:
+    """Background thread sampling the stacks of threads that have a profiled run in flight."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples = 0
+        self._runs: set[RunProfile] = set()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._labels: dict[Any, str] = {}
+
+    def add(self, profile: RunProfile) -> None:
+        with self._lock:
+            self._runs.add(profile)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._sample, name="stack-sampler", daemon=True)
+                self._thread.start()
+
+    def remove(self, profile: RunProfile) -> None:
+        with self._lock:
+            self._runs.discard(profile)
+
+    def _label(self, frame: FrameType) -> str:
+        code = frame.f_code
+        label = self._labels.get(code)
+        if label is None:
+            name = getattr(code, "co_qualname", code.co_name)
+            label = self._labels[code] = f"{os.path.basename(code.co_filename)}:{name}".replace(";", ":")
+        return label
+
+    def _collapse(self, frame: FrameType | None) -> str:
+        labels = []
+        while frame is not None:
+            labels.append(self._label(frame))
+            frame = frame.f_back
+        return ";".join(reversed(labels))
+
+    def _sample(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                runs = list(self._runs)
+                if not runs:
+                    self._thread = None
+                    return
+            frames = sys._current_frames()
+            stacks = {
+                thread_id: self._collapse(frames[thread_id])
+                for thread_id in {profile.thread_id for profile in runs}
+                if thread_id in frames
+            }
+            del frames
+            with self._lock:  # a run being removed is done being written to
+                for profile in runs:
+                    if profile in self._runs and profile.thread_id in stacks:
+                        profile.stacks[stacks[profile.thread_id]] += 1
+            self.samples += 1
+
+
+_current: contextvars.ContextVar[RunProfile | None] = contextvars.ContextVar("run_profile", default=None)
+_run_ids = itertools.count(1)
+
+
+def _agent_name(args: tuple, kwargs: dict, position: int) -> str:
+    agent = kwargs.get("agent") or (args[position] if len(args) > position else None)
+    return getattr(agent, "name", "?")
+
+
+class ProfilingRunner(AgentRunner):
+    def __init__(
+        self,
+        sample_rate: float = 0.0,
+        out_dir: str = "profiles",
+        stack_interval: float | None = 0.005,
+        seed: int | None = None,
+    ):
+        self.sample_rate = sample_rate
+        self.out_dir = out_dir
+        self.sampler = StackSampler(stack_interval) if stack_interval else None
+        self.last_profile: RunProfile | None = None
+        self.written: list[tuple[str, str]] = []  # (trace path, folded path) per profiled run
+        self.write_errors: list[OSError] = []
+        self._random = random.Random(seed)
+        self._writer = ThreadPoolExecutor(1, thread_name_prefix="profile-writer")
+
+    @classmethod
+    def from_env(cls) -> "ProfilingRunner":
+        """Configure from PROFILE_SAMPLE_RATE (default 0: off) / PROFILE_DIR / PROFILE_STACK_INTERVAL."""
+        interval = float(os.getenv("PROFILE_STACK_INTERVAL", "0.005"))
+        return cls(
+            sample_rate=float(os.getenv("PROFILE_SAMPLE_RATE", "0")),
+            out_dir=os.getenv("PROFILE_DIR", "profiles"),
+            stack_interval=interval or None,
+        )
+
+    async def run(self, starting_agent, input, **kwargs):
+        if not self.sample_rate or self._random.random() >= self.sample_rate:
+            return await super().run(starting_agent, input, **kwargs)
+        run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{next(_run_ids):05d}-{uuid.uuid4().hex[:6]}"
+        profile = RunProfile(run_id, starting_agent.name, threading.get_ident())
+        token = _current.set(profile)
+        if self.sampler is not None:
+            self.sampler.add(profile)
+        try:
+            return await super().run(starting_agent, input, **kwargs)
+        finally:
+            profile.ended = time.perf_counter()
+            _current.reset(token)
+            if self.sampler is not None:
+                self.sampler.remove(profile)
+            self.last_profile = profile
+            # written on a background thread, so profiling does not add file I/O to the run's latency
+            self._writer.submit(self._write, profile)
+
+    def _write(self, profile: RunProfile) -> None:
+        try:
+            self.written.append(profile.write(self.out_dir))
+        except OSError as e:
+            self.write_errors.append(e)
+
+    def flush(self) -> None:
+        """Wait until every finished profile is on disk."""
+        self._writer.submit(lambda: None).result()
+
+    @classmethod
+    async def _run_input_guardrails(cls, *args, **kwargs):
+        profile = _current.get()
+        if profile is None:
+            return await super()._run_input_guardrails(*args, **kwargs)
+        with profile.phase("input_guardrails", _agent_name(args, kwargs, 0)):
+            return await super()._run_input_guardrails(*args, **kwargs)
+
+    @classmethod
+    async def _get_new_response(cls, *args, **kwargs):
+        profile = _current.get()
+        if profile is None:
+            return await super()._get_new_response(*args, **kwargs)
+        with profile.phase("model", _agent_name(args, kwargs, 0)) as info:
+            response = await super()._get_new_response(*args, **kwargs)
+            info["output_tokens"] = response.usage.output_tokens
+            return response
+
+    @classmethod
+    async def _get_single_step_result_from_response(cls, *args, **kwargs):
+        profile = _current.get()
+        if profile is None:
+            return await super()._get_single_step_result_from_response(*args, **kwargs)
+        with profile.phase("step", _agent_name(args, kwargs, 0)) as info:
+            result = await super()._get_single_step_result_from_response(*args, **kwargs)
+            tools = sum(isinstance(item, ToolCallOutputItem) for item in result.new_step_items)
+            if NextStepHandoff is not None and isinstance(result.next_step, NextStepHandoff):
+                info["phase"] = "handoff"
+                info["to"] = result.next_step.new_agent.name
+            elif tools:
+                info["phase"] = "tools"
+                info["tool_calls"] = tools
+            else:
+                info["phase"] = "process_output"
+            return result
+
+    @classmethod
+    async def _run_output_guardrails(cls, *args, **kwargs):
+        profile = _current.get()
+        if profile is None:
+            return await super()._run_output_guardrails(*args, **kwargs)
+        with profile.phase("output_guardrails", _agent_name(args, kwargs, 1)):
+            return await super()._run_output_guardrails(*args, **kwargs)
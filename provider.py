@@ -0,0 +1,324 @@
+"""
+Shared model clients for every flow in this repo.
+
+Each script used to build its own AsyncOpenAI client (and with it its own httpx
+connection pool) at import time. When several flows run side by side in one
+process that means one pool and one set of TLS handshakes per script. This module
+keeps a single lazily built, pooled client per (base_url, api_key) pair and hands
+out models and run configs built on top of it.
+
+    from provider import get_model, get_run_config
+
+    model = get_model("gemini-2.0-flash")
+    config = get_run_config(model)
+
+Set MODEL_BACKEND=fake to get an offline `fake_model.FakeModel` from
+`get_model()` instead (configured from FAKE_MODEL_* variables), e.g. to run a
+flow or a load test without API keys.
+
+`get_model()` does not touch the network or the API keys: it returns a
+`DeferredModel` that builds the client on its first call, so importing a flow
+(to list it, lint it or load-test it with a fake model) needs no keys and opens
+no connection pool. .env is read on the first `get_*` call rather than at
+import.
+
+With MODEL_RPM / MODEL_TPM set, or after `configure_scheduler()`, every model
+from `get_model()` is admitted through rate_limits.RateLimitScheduler:
+per-provider/model request and token budgets, interactive calls first.
+
+With MODEL_FALLBACKS set (comma-separated model names, e.g. "gpt-4o-mini"),
+`get_model()` returns a hedging.HedgedModel over the requested model and the
+fallbacks: slow calls are hedged to the next backend after its p95 latency,
+failing backends are skipped by a circuit breaker.
+
+Note: httpx connections belong to the event loop that opened them. The shared
+clients are meant to live for the whole process and be used from one loop; call
+`aclose_clients()` before switching loops (e.g. between two `asyncio.run` calls).
+Models from `get_model()` build a new client on their next call; a client taken
+from `get_client()` is closed for good and must be fetched again.
+"""
+import asyncio
+import os
+import threading
+import weakref
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import httpx
+from agents import AsyncOpenAI, Model, OpenAIChatCompletionsModel, RunConfig
+from dotenv import load_dotenv
+
+from lazy import once
+
+if TYPE_CHECKING:
+    from hedging import HedgedModel
+    from rate_limits import RateLimitScheduler
+
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/openai/"
+OPENAI_BASE_URL = "https://api.openai.com/v1"
+
+
+@dataclass(frozen=True)
+class PoolSettings:
+    """Connection pool knobs for the shared httpx client."""
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 60.0
+    http2: bool = False
+    connect_timeout: float = 10.0
+    timeout: float = 600.0
+
+    @classmethod
+    def from_env(cls) -> "PoolSettings":
+        """Read overrides from MODEL_POOL_* environment variables."""
+        _load_env()
+        return cls(
+            max_connections=int(os.getenv("MODEL_POOL_MAX_CONNECTIONS", cls.max_connections)),
+            max_keepalive_connections=int(
+                os.getenv("MODEL_POOL_MAX_KEEPALIVE", cls.max_keepalive_connections)
+            ),
+            keepalive_expiry=float(os.getenv("MODEL_POOL_KEEPALIVE_EXPIRY", cls.keepalive_expiry)),
+            http2=os.getenv("MODEL_POOL_HTTP2", "0").lower() in ("1", "true", "yes"),
+            connect_timeout=float(os.getenv("MODEL_POOL_CONNECT_TIMEOUT", cls.connect_timeout)),
+            timeout=float(os.getenv("MODEL_POOL_TIMEOUT", cls.timeout)),
+        )
+
+    def build_http_client(self, event_hooks: dict | None = None) -> httpx.AsyncClient:
+        if self.http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                raise ImportError("HTTP/2 needs the h2 package: pip install 'httpx[http2]'")
+        return httpx.AsyncClient(
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+            follow_redirects=True,
+            event_hooks=event_hooks,
+        )
+
+
+@once
+def _load_env() -> bool:
+    return load_dotenv()
+
+
+_lock = threading.Lock()
+_clients: dict[tuple[str, str], AsyncOpenAI] = {}
+_models: dict[tuple[str, str, str], OpenAIChatCompletionsModel] = {}
+_pool_settings: PoolSettings | None = None
+_fake_model: Model | None = None
+_deferred: "weakref.WeakSet[DeferredModel]" = weakref.WeakSet()  # reset by aclose_clients()
+_hedged: dict[tuple[tuple[str, ...], str | None, str | None], "HedgedModel"] = {}
+_scheduler: "RateLimitScheduler | None" = None
+_scheduler_checked = False
+
+
+def configure_pool(settings: PoolSettings) -> None:
+    """Set the pool settings used for clients built from now on."""
+    global _pool_settings
+    _pool_settings = settings
+
+
+def configure_scheduler(scheduler: "RateLimitScheduler | None") -> None:
+    """
+    Route models from `get_model()` through a rate_limits.RateLimitScheduler (None: no throttling).
+    Clients built from now on leave 429 retries to the scheduler and report rate-limit headers to it.
+    """
+    global _scheduler, _scheduler_checked
+    _scheduler, _scheduler_checked = scheduler, True
+
+
+def _get_scheduler() -> "RateLimitScheduler | None":
+    global _scheduler, _scheduler_checked
+    if not _scheduler_checked:
+        with _lock:
+            if not _scheduler_checked:
+                _load_env()
+                if os.getenv("MODEL_RPM") or os.getenv("MODEL_TPM"):
+                    from rate_limits import RateLimitScheduler
+
+                    _scheduler = RateLimitScheduler.from_env()
+                _scheduler_checked = True
+    return _scheduler
+
+
+def _resolve_key(base_url: str, api_key: str | None) -> str:
+    if api_key:
+        return api_key
+    _load_env()
+    env_name = "GEMINI_API_KEY" if base_url == GEMINI_BASE_URL else "OPENAI_API_KEY"
+    key = os.getenv(env_name)
+    if not key:
+        raise ValueError("api key not set")
+    return key
+
+
+def get_client(base_url: str = GEMINI_BASE_URL, api_key: str | None = None) -> AsyncOpenAI:
+    """Return the process-wide client for this (base_url, api_key) pair, building it on first use."""
+    api_key = _resolve_key(base_url, api_key)
+    cache_key = (base_url, api_key)
+    client = _clients.get(cache_key)
+    if client is not None:
+        return client
+    scheduler = _get_scheduler()  # before _lock, which _get_scheduler takes on its first call
+    with _lock:
+        client = _clients.get(cache_key)
+        if client is None:
+            settings = _pool_settings or PoolSettings.from_env()
+            hooks, options = None, {}
+            if scheduler is not None:
+                from rate_limits import observe_response
+
+                hooks = {"response": [observe_response]}
+                options["max_retries"] = 0  # the SDK's immediate 429 retries would bypass the scheduler's queue
+            client = AsyncOpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                http_client=settings.build_http_client(hooks),
+                **options,
+            )
+            _clients[cache_key] = client
+    return client
+
+
+def get_openai_client(api_key: str | None = None) -> AsyncOpenAI:
+    return get_client(OPENAI_BASE_URL, api_key)
+
+
+def get_model(
+    model_name: str = "gemini-2.0-flash",
+    base_url: str | None = None,
+    api_key: str | None = None,
+) -> Model:
+    """
+    Chat-completions model on top of the shared client. Gemini models default to
+    the Gemini endpoint. The client (and the API key lookup) waits for the
+    model's first call.
+    """
+    _load_env()
+    if os.getenv("MODEL_BACKEND") == "fake":
+        return _get_fake_model()
+    fallbacks = [name.strip() for name in os.getenv("MODEL_FALLBACKS", "").split(",")]
+    names = (model_name, *(name for name in fallbacks if name and name != model_name))
+    if len(names) == 1:
+        return _get_backend(model_name, base_url, api_key)
+    cache_key = (names, base_url, api_key)
+    with _lock:
+        hedged = _hedged.get(cache_key)
+    if hedged is None:
+        from hedging import HedgedModel
+
+        # One HedgedModel per backend list, so every agent shares its latency window and breakers.
+        # A base_url or api_key given here applies to the requested model; fallbacks use the defaults.
+        backends = [_get_backend(model_name, base_url, api_key)] + [_get_backend(name) for name in names[1:]]
+        with _lock:
+            hedged = _hedged.setdefault(cache_key, HedgedModel(backends))
+    return hedged
+
+
+def _get_backend(model_name: str, base_url: str | None = None, api_key: str | None = None) -> Model:
+    if base_url is None:
+        base_url = GEMINI_BASE_URL if model_name.startswith("gemini") else OPENAI_BASE_URL
+    model = DeferredModel(lambda: _build_model(model_name, base_url, api_key), model_name)
+    scheduler = _get_scheduler()
+    if scheduler is not None:
+        from rate_limits import ScheduledModel
+
+        provider = "gemini" if base_url == GEMINI_BASE_URL else "openai" if base_url == OPENAI_BASE_URL else base_url.rstrip("/")
+        return ScheduledModel(model, scheduler, f"{provider}/{model_name}")
+    return model
+
+
+def _build_model(model_name: str, base_url: str, api_key: str | None) -> OpenAIChatCompletionsModel:
+    client = get_client(base_url, api_key)
+    cache_key = (base_url, client.api_key, model_name)
+    model = _models.get(cache_key)
+    if model is None:
+        with _lock:
+            model = _models.setdefault(
+                cache_key, OpenAIChatCompletionsModel(openai_client=client, model=model_name)
+            )
+    return model
+
+
+class DeferredModel(Model):
+    """
+    A Model that builds the real one on its first call. `.model` is the model
+    name, as on OpenAIChatCompletionsModel; other attributes build the model.
+    """
+
+    def __init__(self, factory: Callable[[], Model], model: str = ""):
+        self.model = model
+        self.resolve = once(factory)
+        _deferred.add(self)
+
+    async def get_response(self, *args, **kwargs):
+        return await self.resolve().get_response(*args, **kwargs)
+
+    def stream_response(self, *args, **kwargs):
+        return self.resolve().stream_response(*args, **kwargs)
+
+    def __getattr__(self, name: str):
+        if name in ("model", "resolve"):  # not set yet: __init__ is still running
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
+
+    def __repr__(self) -> str:
+        return f"DeferredModel({self.model!r})"
+
+
+def _get_fake_model() -> Model:
+    global _fake_model
+    with _lock:
+        if _fake_model is None:
+            from fake_model import FakeModel
+
+            _fake_model = FakeModel.from_env()
+    return _fake_model
+
+
+def get_run_config(model: Model | str = "gemini-2.0-flash", tracing_disabled: bool = True, **kwargs) -> RunConfig:
+    if isinstance(model, str):
+        model = get_model(model)
+    return RunConfig(model=model, tracing_disabled=tracing_disabled, **kwargs)
+
+
+async def warm_up(client: AsyncOpenAI | None = None, connections: int = 1) -> int:
+    """
+    Open `connections` keep-alive connections ahead of the first real call.
+    Uses the cheap models listing endpoint. Failures are swallowed (a cold pool
+    is not an error) and the number of successful warm-up calls is returned.
+    """
+    clients = [client] if client is not None else list(_clients.values())
+
+    async def _ping(c: AsyncOpenAI) -> bool:
+        try:
+            await c.models.list()
+            return True
+        except Exception:
+            return False
+
+    results = await asyncio.gather(*(_ping(c) for c in clients for _ in range(connections)))
+    return sum(results)
+
+
+async def aclose_clients() -> None:
+    """
+    Close every shared client and forget it, e.g. before the event loop shuts down.
+    Models from `get_model()` stay usable: their next call builds a new client.
+    """
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+        _models.clear()
+        for model in list(_deferred):
+            model.resolve.reset()
+    for client in clients:
+        await client.close()
@@ -0,0 +1,372 @@
+"""
+Client-side rate limiting for model calls, per provider and model.
+
+`RateLimitScheduler` keeps a requests-per-minute and a tokens-per-minute token
+bucket for every lane (a "provider/model" key) and admits queued calls in
+priority order: interactive turns (`INTERACTIVE`) go ahead of batch work
+(`BATCH`), FIFO within a priority. A call is admitted once both buckets cover
+it; its token estimate (prompt + max output tokens) is corrected with the
+response's real usage afterwards.
+
+The buckets follow the server: `observe()` reads OpenAI-style
+`x-ratelimit-{limit,remaining,reset}-{requests,tokens}` headers from every
+response (provider.py installs an httpx hook for this) and a 429's
+`retry-after` pauses the whole lane. With the scheduler in charge, the clients
+are built with `max_retries=0`: the SDK's immediate retries only add load on a
+provider that is already refusing requests, so `ScheduledModel` retries 429s
+itself, back through the queue.
+
+    scheduler = RateLimitScheduler({"openai/gpt-4o-mini": Limits(500, 200_000)}, default=Limits(60, 100_000))
+    provider.configure_scheduler(scheduler)     # get_model() now returns ScheduledModels
+
+    with request_priority(BATCH):
+        await Runner.run(story_agent, ...)
+
+or set MODEL_RPM / MODEL_TPM to have provider.py build one from the
+environment (`RateLimitScheduler.from_env`).
+"""
+import asyncio
+import contextlib
+import contextvars
+import heapq
+import itertools
+import os
+import re
+import time
+from collections.abc import AsyncIterator, Iterator, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from agents import Model, ModelResponse, ModelSettings
+
+from history import estimate_tokens
+
+INTERACTIVE = 0
+DEFAULT = 5
+BATCH = 10
+
+_priority: contextvars.ContextVar[int] = contextvars.ContextVar("request_priority", default=DEFAULT)
+# (scheduler, lane key) of the model call in flight, for the response header hook
+_current: contextvars.ContextVar[tuple["RateLimitScheduler", str] | None] = contextvars.ContextVar(
+    "rate_limit_lane", default=None
+)
+
+
+@contextlib.contextmanager
+def request_priority(priority: int) -> Iterator[None]:
+    """Model calls made inside (including by agents and tools they run) queue at `priority`; lower goes first."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+@dataclass(frozen=True)
+class Limits:
+    requests: float | None = None  # per `per` seconds; None: unlimited
+    tokens: float | None = None
+    per: float = 60.0
+
+
+class TokenBucket:
+    """Continuously refilled to `limit` over `per` seconds. May go negative when a call used more than estimated."""
+
+    def __init__(self, limit: float, per: float = 60.0):
+        self.limit = limit
+        self.rate = limit / per
+        self.per = per
+        self.level = float(limit)
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.limit, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        self._refill(now)
+        amount = min(amount, self.limit)  # a call bigger than the bucket waits for a full one
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.level -= amount
+
+    def sync(self, remaining: float, limit: float | None, now: float) -> None:
+        """Adopt the server's view where it is stricter than ours."""
+        self._refill(now)
+        if limit and limit != self.limit:
+            self.limit = limit
+            self.rate = limit / self.per
+        self.level = min(self.level, remaining)
+
+
+@dataclass
+class LaneStats:
+    admitted: int = 0
+    waited: float = 0.0  # total seconds spent queued
+    throttled: int = 0  # 429s seen
+    pauses: int = 0  # retry-after pauses applied
+
+    @property
+    def mean_wait(self) -> float:
+        return self.waited / self.admitted if self.admitted else 0.0
+
+
+class _Lane:
+    def __init__(self, limits: Limits):
+        self.requests = TokenBucket(limits.requests, limits.per) if limits.requests else None
+        self.tokens = TokenBucket(limits.tokens, limits.per) if limits.tokens else None
+        self.queue: list[tuple[int, int, float, float, asyncio.Future]] = []  # (priority, seq, tokens, queued at, future)
+        self.paused_until = 0.0
+        self.in_flight = 0
+        self.probed = False  # a response has been seen, so unknown limits have had a chance to show up
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.wakeup = asyncio.Event()
+        self.dispatcher: asyncio.Task | None = None
+        self.stats = LaneStats()
+
+    def bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Move the lane to `loop`. The wakeup event and the dispatcher task belong to the
+        loop they were made on, and a process-wide scheduler outlives loops (one per
+        asyncio.run, Streamlit rerun or test case); the buckets carry over.
+        """
+        if self.loop is loop:
+            return
+        self.loop = loop
+        self.wakeup = asyncio.Event()
+        self.dispatcher = None
+        # calls still queued from a loop that has since closed will never be awaited again
+        self.queue = [entry for entry in self.queue if not entry[-1].done() and not entry[-1].get_loop().is_closed()]
+        heapq.heapify(self.queue)
+
+    def wait_time(self, tokens: float, now: float) -> float | None:
+        """Seconds until a call of `tokens` fits; None: until something changes (a response or an arrival)."""
+        if self.requests is None and self.tokens is None and not self.probed and self.in_flight:
+            return None  # limits unknown: one call at a time until the first response shows them
+        wait = self.paused_until - now
+        if self.requests is not None:
+            wait = max(wait, self.requests.wait_time(1, now))
+        if self.tokens is not None:
+            wait = max(wait, self.tokens.wait_time(tokens, now))
+        return wait
+
+
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_reset(value: str | None) -> float | None:
+    """OpenAI's reset durations ("1s", "6m0s", "120ms") or plain seconds, as seconds."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION.findall(value)
+    return sum(float(number) * _UNITS[unit] for number, unit in parts) if parts else None
+
+
+def retry_after(headers: Mapping[str, str]) -> float | None:
+    if value := headers.get("retry-after-ms"):
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    try:
+        return float(headers["retry-after"])
+    except (KeyError, ValueError):
+        return None  # absent, or an HTTP date
+
+
+class RateLimitScheduler:
+    def __init__(self, limits: dict[str, Limits] | None = None, default: Limits | None = None):
+        self.limits = limits or {}
+        self.default = default or Limits()
+        self._lanes: dict[str, _Lane] = {}
+        self._seq = itertools.count()
+
+    @classmethod
+    def from_env(cls) -> "RateLimitScheduler":
+        """Default per-lane limits from MODEL_RPM / MODEL_TPM (unset: learned from response headers only)."""
+        rpm, tpm = os.getenv("MODEL_RPM"), os.getenv("MODEL_TPM")
+        return cls(default=Limits(float(rpm) if rpm else None, float(tpm) if tpm else None))
+
+    def lane(self, key: str) -> _Lane:
+        lane = self._lanes.get(key)
+        if lane is None:
+            lane = self._lanes[key] = _Lane(self.limits.get(key, self.default))
+        return lane
+
+    def stats(self) -> dict[str, LaneStats]:
+        return {key: lane.stats for key, lane in self._lanes.items()}
+
+    async def acquire(self, key: str, tokens: float, priority: int | None = None) -> None:
+        """Wait until the lane's buckets admit a call of about `tokens` tokens, in priority order."""
+        lane = self.lane(key)
+        loop = asyncio.get_running_loop()
+        lane.bind(loop)
+        future = loop.create_future()
+        priority = _priority.get() if priority is None else priority
+        heapq.heappush(lane.queue, (priority, next(self._seq), tokens, time.monotonic(), future))
+        lane.wakeup.set()
+        if lane.dispatcher is None or lane.dispatcher.done():
+            lane.dispatcher = asyncio.create_task(self._dispatch(lane))
+        await future
+
+    async def _dispatch(self, lane: _Lane) -> None:
+        while lane.queue:
+            _, _, tokens, queued, future = lane.queue[0]
+            if future.done():  # the caller was cancelled
+                heapq.heappop(lane.queue)
+                continue
+            now = time.monotonic()
+            wait = lane.wait_time(tokens, now)
+            if wait is not None and wait <= 0:
+                heapq.heappop(lane.queue)
+                lane.in_flight += 1
+                if lane.requests is not None:
+                    lane.requests.take(1, now)
+                if lane.tokens is not None:
+                    lane.tokens.take(tokens, now)
+                lane.stats.admitted += 1
+                lane.stats.waited += now - queued
+                future.set_result(None)
+                continue
+            # sleep until the head fits, or until an arrival / header update changes the picture
+            lane.wakeup.clear()
+            try:
+                await asyncio.wait_for(lane.wakeup.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+
+    def settle(self, key: str, estimated: float, used: float) -> None:
+        """Once per admitted call, when it ends: charge the difference between its token estimate and its real usage."""
+        lane = self.lane(key)
+        lane.in_flight -= 1
+        if lane.tokens is not None:
+            lane.tokens.take(used - estimated, time.monotonic())
+        lane.wakeup.set()
+
+    def observe(self, key: str, headers: Mapping[str, str], status: int = 200) -> None:
+        """Update a lane from a response's rate-limit headers; a 429 pauses it for `retry-after`."""
+        lane = self.lane(key)
+        lane.probed = True
+        now = time.monotonic()
+        for kind in ("requests", "tokens"):
+            remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+            if remaining is None:
+                continue
+            limit = headers.get(f"x-ratelimit-limit-{kind}")
+            bucket = getattr(lane, kind)
+            if bucket is None and limit:
+                bucket = TokenBucket(float(limit), self.default.per)
+                setattr(lane, kind, bucket)
+            if bucket is not None:
+                bucket.sync(float(remaining), float(limit) if limit else None, now)
+        if status == 429:
+            lane.stats.throttled += 1
+            delay = retry_after(headers)
+            if delay is None:
+                delay = max(
+                    parse_reset(headers.get("x-ratelimit-reset-requests")) or 0.0,
+                    parse_reset(headers.get("x-ratelimit-reset-tokens")) or 0.0,
+                ) or 1.0
+            if now + delay > lane.paused_until:
+                lane.paused_until = now + delay
+                lane.stats.pauses += 1
+        lane.wakeup.set()
+
+
+async def observe_response(response: Any) -> None:
+    """httpx response hook: feed the headers to the scheduler of the model call in flight, if any."""
+    current = _current.get()
+    if current is not None:
+        scheduler, key = current
+        scheduler.observe(key, response.headers, response.status_code)
+
+
+def _input_tokens(system_instructions: str | None, input: Any) -> int:
+    tokens = len(system_instructions or "") // 4
+    if isinstance(input, str):
+        return tokens + max(1, len(input) // 4)
+    return tokens + sum(estimate_tokens(item) for item in input)
+
+
+def _is_rate_limit(error: Exception) -> bool:
+    return getattr(error, "status_code", None) == 429
+
+
+class ScheduledModel(Model):
+    """
+    Admits each call through `scheduler` under lane `key` ("provider/model") and
+    retries 429s (after the lane's retry-after pause) up to `max_attempts` times.
+    """
+
+    def __init__(
+        self,
+        model: Model,
+        scheduler: RateLimitScheduler,
+        key: str,
+        max_attempts: int = 4,
+        output_tokens: int = 512,
+    ):
+        self.wrapped = model
+        name = getattr(model, "model", None)
+        self.model = name if isinstance(name, str) else key  # the model name, as on the SDK's models (CachedModel keys on it)
+        self.scheduler = scheduler
+        self.key = key
+        self.max_attempts = max_attempts
+        self.output_tokens = output_tokens  # assumed when model_settings.max_tokens is unset
+
+    def _estimate(self, system_instructions: str | None, input: Any, model_settings: ModelSettings) -> int:
+        return _input_tokens(system_instructions, input) + (model_settings.max_tokens or self.output_tokens)
+
+    async def get_response(self, system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs) -> ModelResponse:
+        estimate = self._estimate(system_instructions, input, model_settings)
+        for attempt in range(self.max_attempts):
+            await self.scheduler.acquire(self.key, estimate)
+            token = _current.set((self.scheduler, self.key))
+            used = 0  # a refused or failed call is refunded
+            try:
+                response = await self.wrapped.get_response(
+                    system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs
+                )
+                used = response.usage.total_tokens or estimate
+                return response
+            except Exception as e:
+                # on a 429 the response hook has already paused the lane for retry-after
+                if not _is_rate_limit(e) or attempt == self.max_attempts - 1:
+                    raise
+            finally:
+                _current.reset(token)
+                self.scheduler.settle(self.key, estimate, used)
+
+    async def stream_response(self, system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs) -> AsyncIterator:
+        estimate = self._estimate(system_instructions, input, model_settings)
+        for attempt in range(self.max_attempts):
+            await self.scheduler.acquire(self.key, estimate)
+            token = _current.set((self.scheduler, self.key))
+            started = False
+            used = estimate  # a stream's usage is not known here: the estimate stands
+            try:
+                async for event in self.wrapped.stream_response(
+                    system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs
+                ):
+                    started = True
+                    yield event
+                return
+            except Exception as e:
+                if not started:
+                    used = 0
+                if started or not _is_rate_limit(e) or attempt == self.max_attempts - 1:
+                    raise
+            finally:
+                with contextlib.suppress(ValueError):  # the generator may be closed from another context
+                    _current.reset(token)
+                self.scheduler.settle(self.key, estimate, used)
+
+    def __repr__(self) -> str:
+        return f"ScheduledModel({self.wrapped!r}, {self.key!r})"
@@ -0,0 +1,259 @@
+"""
+Response cache in front of any agents `Model` (usually OpenAIChatCompletionsModel).
+
+The key covers everything that changes what the model would say: system
+instructions, input items, ModelSettings, tool schemas, output schema and
+handoffs. Calls with `temperature > 0` are not cached (their answers are meant
+to vary) unless the cache is built with `cache_nondeterministic=True`; calls that
+leave temperature unset are cached.
+
+    model = CachedModel(get_model("gemini-2.0-flash"), MemoryCache(maxsize=1024, ttl=600))
+    agent = Agent(name="calculator", model=model, ...)
+    print(model.stats)
+
+Hits return a zero-usage response, so `context.usage` only counts real calls.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from agents import Model, ModelResponse, ModelSettings, ModelTracing, Tool, TResponseInputItem, Usage
+from agents.agent_output import AgentOutputSchemaBase
+from agents.handoffs import Handoff
+from agents.items import TResponseOutputItem
+from openai.types.responses import ResponseCompletedEvent
+from pydantic import BaseModel, TypeAdapter
+
+from model_events import response_events
+
+_output_adapter = TypeAdapter(list[TResponseOutputItem])
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    bypassed: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class ResponseCache(Protocol):
+    def get(self, key: str) -> list[TResponseOutputItem] | None: ...
+
+    def set(self, key: str, output: list[TResponseOutputItem]) -> None: ...
+
+
+class MemoryCache:
+    """In-process LRU cache with an optional TTL (seconds)."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._items: OrderedDict[str, tuple[float, list[TResponseOutputItem]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> list[TResponseOutputItem] | None:
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                return None
+            stored_at, output = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return output
+
+    def set(self, key: str, output: list[TResponseOutputItem]) -> None:
+        with self._lock:
+            self._items[key] = (time.monotonic(), output)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class SQLiteCache:
+    """On-disk cache, shared between processes and restarts. Expired rows are dropped lazily."""
+
+    def __init__(self, path: str = "response_cache.sqlite3", ttl: float | None = None):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, stored_at REAL, output TEXT)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> list[TResponseOutputItem] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT stored_at, output FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            stored_at, output = row
+            if self.ttl is not None and time.time() - stored_at > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+        return _output_adapter.validate_json(output)
+
+    def set(self, key: str, output: list[TResponseOutputItem]) -> None:
+        payload = _output_adapter.dump_json(output).decode()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, stored_at, output) VALUES (?, ?, ?)",
+                (key, time.time(), payload),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    return str(value)
+
+
+def cache_key(
+    model_name: str,
+    system_instructions: str | None,
+    input: str | list[TResponseInputItem],
+    model_settings: ModelSettings,
+    tools: list[Tool],
+    output_schema: AgentOutputSchemaBase | None,
+    handoffs: list[Handoff],
+    previous_response_id: str | None = None,
+    prompt: Any | None = None,
+) -> str:
+    payload = {
+        "model": model_name,
+        "instructions": system_instructions,
+        "input": input,
+        "settings": model_settings.to_json_dict(),
+        "tools": [
+            {
+                "name": tool.name,
+                "description": getattr(tool, "description", None),
+                "schema": getattr(tool, "params_json_schema", None),
+            }
+            for tool in tools
+        ],
+        "output_schema": None if output_schema is None or output_schema.is_plain_text() else output_schema.json_schema(),
+        "handoffs": [[h.tool_name, h.tool_description, h.input_json_schema] for h in handoffs],
+        "previous_response_id": previous_response_id,
+        "prompt": prompt,
+    }
+    blob = json.dumps(payload, sort_keys=True, default=_jsonable, separators=(",", ":"))
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+class CachedModel(Model):
+    """Wraps another Model and serves repeated identical calls from `cache`."""
+
+    def __init__(self, model: Model, cache: ResponseCache | None = None, cache_nondeterministic: bool = False):
+        self.model = model
+        self.cache = cache if cache is not None else MemoryCache()
+        self.cache_nondeterministic = cache_nondeterministic
+        self.stats = CacheStats()
+        self.model_name = getattr(model, "model", type(model).__name__)
+
+    def _cacheable(self, model_settings: ModelSettings) -> bool:
+        temperature = model_settings.temperature
+        return self.cache_nondeterministic or temperature is None or temperature <= 0
+
+    async def get_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: str | None,
+        prompt: Any | None = None,
+    ) -> ModelResponse:
+        if not self._cacheable(model_settings):
+            self.stats.bypassed += 1
+            return await self.model.get_response(
+                system_instructions, input, model_settings, tools, output_schema, handoffs, tracing,
+                previous_response_id=previous_response_id, prompt=prompt,
+            )
+
+        key = cache_key(
+            self.model_name, system_instructions, input, model_settings, tools, output_schema, handoffs,
+            previous_response_id, prompt,
+        )
+        output = self.cache.get(key)
+        if output is not None:
+            self.stats.hits += 1
+            return ModelResponse(output=list(output), usage=Usage(), response_id=None)
+
+        self.stats.misses += 1
+        response = await self.model.get_response(
+            system_instructions, input, model_settings, tools, output_schema, handoffs, tracing,
+            previous_response_id=previous_response_id, prompt=prompt,
+        )
+        self.cache.set(key, response.output)
+        return response
+
+    async def stream_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: str | None,
+        prompt: Any | None = None,
+    ) -> AsyncIterator:
+        def stream():
+            return self.model.stream_response(
+                system_instructions, input, model_settings, tools, output_schema, handoffs, tracing,
+                previous_response_id=previous_response_id, prompt=prompt,
+            )
+
+        if not self._cacheable(model_settings):
+            self.stats.bypassed += 1
+            async for event in stream():
+                yield event
+            return
+
+        key = cache_key(
+            self.model_name, system_instructions, input, model_settings, tools, output_schema, handoffs,
+            previous_response_id, prompt,
+        )
+        output = self.cache.get(key)
+        if output is not None:
+            self.stats.hits += 1
+            # replay the cached answer as deltas so streaming UIs still render it
+            for event in response_events(ModelResponse(output=list(output), usage=Usage(), response_id=None)):
+                yield event
+            return
+
+        self.stats.misses += 1
+        async for event in stream():
+            if isinstance(event, ResponseCompletedEvent):
+                self.cache.set(key, event.response.output)
+            yield event
@@ -1,33 +1,18 @@
-import os
-from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel,RunConfig
-from dotenv import load_dotenv
+from agents import Agent, Runner
+from history import ConversationHistory
+from language_router import StickyRouter
+from stream_pipeline import StdoutSink, StreamPipeline
+from provider import get_model, get_run_config
+from rate_limits import INTERACTIVE, request_priority
+from trace_export import configure_tracing
 import asyncio
 
-load_dotenv()
-gemini_api = os.getenv('GEMINI_API_KEY')
-if not gemini_api:
-    raise ValueError("api key not set")
+model = get_model("gemini-2.5-flash")
 
-external_client = AsyncOpenAI(
-    api_key=gemini_api,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-
-model= OpenAIChatCompletionsModel(
-    openai_client=external_client,
-    model="gemini-2.5-flash"
-)
-
-config=RunConfig(
-    model=model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
+config = get_run_config(model, tracing_disabled=True)
 import uuid
 
-from openai.types.responses import ResponseContentPartDoneEvent, ResponseTextDeltaEvent
-
-from agents import Agent, RawResponsesStreamEvent, Runner, TResponseInputItem, trace
+from agents import trace
 
 """
 This example shows the handoffs/routing pattern. The triage agent receives the first message, and
@@ -63,13 +48,30 @@ french_agent.handoffs=[english_agent,spanish_agent]
 english_agent.handoffs=[spanish_agent,french_agent]
 spanish_agent.handoffs=[english_agent,french_agent]
 
+# cheap agent that folds old turns into a running summary, off the hot path
+summary_agent = Agent(
+    name="summary_agent",
+    instructions="Summarize the conversation so far in a few sentences. Keep names, facts and the language used.",
+    model=get_model("gemini-2.0-flash"),
+)
+
+# picks the language agent locally; triage_agent is only used when detection is unsure
+router = StickyRouter(
+    {"en": english_agent, "fr": french_agent, "es": spanish_agent},
+    triage_agent,
+)
+
 async def main():
+    # batched, sampled export when TRACE_EXPORT_JSONL / TRACE_EXPORT_OTLP is set
+    configure_tracing()
     # We'll create an ID for this conversation, so we can link each trace
     conversation_id = str(uuid.uuid4().hex[:16])
 
     msg = input("Hi! We speak French, Spanish and English. How can I help? ")
-    agent = triage_agent
-    inputs: list[TResponseInputItem] = [{"content": msg, "role": "user"}]
+    agent = router.route(conversation_id, msg)
+    # only a bounded window of the transcript is resent each turn
+    history = ConversationHistory(budget_tokens=4000, summarizer=summary_agent)
+    history.append({"content": msg, "role": "user"})
 
     while True:
         # Each conversation turn is a single trace. Normally, each input from the user would be an
@@ -77,28 +79,24 @@ async def main():
         with trace("Routing example", group_id=conversation_id):
             result = Runner.run_streamed(
                 agent,
-                input=inputs,
+                input=history.window(),
                 run_config=config
             )
-            async for event in result.stream_events():
-                if not isinstance(event, RawResponsesStreamEvent):
-                    continue
-                data = event.data
-                if isinstance(data, ResponseTextDeltaEvent):
-                    print(data.delta, end="", flush=True)
-                elif isinstance(data, ResponseContentPartDoneEvent):
-                    print("\n")
-
-        inputs = result.to_input_list()
+            # deltas are batched into a few writes instead of one flush per token
+            await StreamPipeline([StdoutSink()]).consume(result)
+
+        history.extend_from_result(result)
+        router.remember(conversation_id, result.current_agent)
         print("\n")
 
         user_msg = input("Enter a message: ")
         if user_msg in ["exit", "quit", "bye"]:
-            print("Goodbye!")
+            print(f"Goodbye! (triage calls avoided: {router.stats.triage_avoided}, made: {router.stats.triage_calls})")
             break  # stop the while loop here
-        inputs.append({"content": user_msg, "role": "user"})
-        agent = result.current_agent
+        history.append({"content": user_msg, "role": "user"})
+        agent = router.route(conversation_id, user_msg)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    with request_priority(INTERACTIVE):  # interactive turns go ahead of batch work when rate limiting is on
+        asyncio.run(main())
\ No newline at end of file
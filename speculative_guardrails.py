@@ -0,0 +1,222 @@
+"""
+Speculative input guardrails and incremental output guardrails.
+
+`Runner.run` checks input guardrails alongside the first turn, but a tripwire only
+raises: the main agent's model call keeps running in the background. Output
+guardrails only see the finished answer, so an off-topic reply is streamed in full
+before it is rejected.
+
+`run_speculative` starts the main agent's first model call together with the input
+guardrails. The model answer is held back until every guardrail has passed (so no
+tool runs on a blocked request) and the in-flight call is cancelled as soon as one
+trips.
+
+`stream_with_output_guardrails` streams text deltas and re-checks the text so far
+every `check_every` characters, cancelling the run the moment a check trips.
+"""
+import asyncio
+import dataclasses
+from collections.abc import AsyncIterator
+from typing import Any
+
+from agents import (
+    Agent,
+    InputGuardrail,
+    InputGuardrailTripwireTriggered,
+    Model,
+    ModelResponse,
+    ModelSettings,
+    ModelTracing,
+    OutputGuardrail,
+    OutputGuardrailTripwireTriggered,
+    RawResponsesStreamEvent,
+    RunConfig,
+    RunContextWrapper,
+    Runner,
+    RunResult,
+    Tool,
+    TResponseInputItem,
+)
+from agents.agent_output import AgentOutputSchemaBase
+from agents.handoffs import Handoff
+from openai.types.responses import ResponseTextDeltaEvent
+
+
+class _GatedModel(Model):
+    """Lets calls start right away but holds their results until `gate` is set."""
+
+    def __init__(self, model: Model, gate: asyncio.Event):
+        self.model = model
+        self.gate = gate
+
+    async def get_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: str | None,
+        prompt: Any | None = None,
+    ) -> ModelResponse:
+        response = await self.model.get_response(
+            system_instructions, input, model_settings, tools, output_schema, handoffs, tracing,
+            previous_response_id=previous_response_id, prompt=prompt,
+        )
+        await self.gate.wait()
+        return response
+
+    async def stream_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: str | None,
+        prompt: Any | None = None,
+    ) -> AsyncIterator:
+        async for event in self.model.stream_response(
+            system_instructions, input, model_settings, tools, output_schema, handoffs, tracing,
+            previous_response_id=previous_response_id, prompt=prompt,
+        ):
+            await self.gate.wait()
+            yield event
+
+
+def _resolve_model(agent: Agent, run_config: RunConfig) -> Model:
+    # same precedence as the runner: run_config.model, then agent.model
+    if isinstance(run_config.model, Model):
+        return run_config.model
+    if isinstance(run_config.model, str):
+        return run_config.model_provider.get_model(run_config.model)
+    if isinstance(agent.model, Model):
+        return agent.model
+    return run_config.model_provider.get_model(agent.model)
+
+
+async def run_speculative(
+    agent: Agent,
+    input: str | list[TResponseInputItem],
+    *,
+    context: Any = None,
+    run_config: RunConfig | None = None,
+    **kwargs: Any,
+) -> RunResult:
+    """
+    Drop-in for `Runner.run` that overlaps input guardrails with the first model call.
+    Raises InputGuardrailTripwireTriggered like the runner does, after cancelling the
+    main run.
+    """
+    run_config = run_config or RunConfig()
+    guardrails: list[InputGuardrail] = [*agent.input_guardrails, *(run_config.input_guardrails or [])]
+    if not guardrails:
+        return await Runner.run(agent, input, context=context, run_config=run_config, **kwargs)
+
+    gate = asyncio.Event()
+    gated = _GatedModel(_resolve_model(agent, run_config), gate)
+    if run_config.model is not None:
+        run_config = dataclasses.replace(run_config, model=gated, input_guardrails=[])
+        main_agent = agent.clone(input_guardrails=[])
+    else:
+        run_config = dataclasses.replace(run_config, input_guardrails=[])
+        main_agent = agent.clone(model=gated, input_guardrails=[])
+
+    main_task = asyncio.create_task(
+        Runner.run(main_agent, input, context=context, run_config=run_config, **kwargs)
+    )
+    wrapper = RunContextWrapper(context=context)
+    guardrail_tasks = [asyncio.create_task(g.run(agent, input, wrapper)) for g in guardrails]
+    try:
+        for done in asyncio.as_completed(guardrail_tasks):
+            result = await done
+            if result.output.tripwire_triggered:
+                raise InputGuardrailTripwireTriggered(result)
+    except BaseException:
+        main_task.cancel()
+        for task in guardrail_tasks:
+            task.cancel()
+        await asyncio.gather(main_task, *guardrail_tasks, return_exceptions=True)
+        raise
+
+    gate.set()
+    return await main_task
+
+
+async def stream_with_output_guardrails(
+    agent: Agent,
+    input: str | list[TResponseInputItem],
+    guardrails: list[OutputGuardrail],
+    *,
+    check_every: int = 200,
+    context: Any = None,
+    run_config: RunConfig | None = None,
+    **kwargs: Any,
+) -> AsyncIterator[str]:
+    """
+    Stream the agent's text deltas while `guardrails` (output guardrails that accept
+    the partial text as `agent_output`) are re-run every `check_every` new characters.
+    Checks run next to the stream rather than blocking it, one at a time. When a check
+    trips the run is cancelled and OutputGuardrailTripwireTriggered is raised, so the
+    rest of a violating answer is never generated. The agent's own output guardrails
+    still run on the final output as usual.
+    """
+    result = Runner.run_streamed(agent, input, context=context, run_config=run_config, **kwargs)
+    wrapper = RunContextWrapper(context=context)
+    text = ""
+    checked_upto = 0
+    pending: asyncio.Task | None = None
+
+    async def check(partial: str) -> None:
+        results = await asyncio.gather(*(g.run(wrapper, agent, partial) for g in guardrails))
+        for guardrail_result in results:
+            if guardrail_result.output.tripwire_triggered:
+                raise OutputGuardrailTripwireTriggered(guardrail_result)
+
+    stream = result.stream_events().__aiter__()
+    next_event: asyncio.Future | None = None
+    try:
+        while True:
+            if next_event is None:
+                next_event = asyncio.ensure_future(anext(stream))
+            # wake up for whichever comes first, so a tripped check cuts the stream
+            # even while the model is between deltas
+            waiters = {next_event} if pending is None else {next_event, pending}
+            done, _ = await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+            if pending is not None and pending in done:
+                pending.result()  # re-raises a tripwire
+                pending = None
+            if next_event not in done:
+                continue
+            try:
+                event = next_event.result()
+            except StopAsyncIteration:
+                break
+            finally:
+                next_event = None
+            if not isinstance(event, RawResponsesStreamEvent) or not isinstance(event.data, ResponseTextDeltaEvent):
+                continue
+            text += event.data.delta
+            yield event.data.delta
+            if pending is None and len(text) - checked_upto >= check_every:
+                checked_upto = len(text)
+                pending = asyncio.create_task(check(text))
+        if pending is not None:
+            await pending
+            pending = None
+        if len(text) > checked_upto:
+            await check(text)
+    finally:
+        for task in (next_event, pending):
+            if task is not None:
+                task.cancel()
+                # the stream may still end on its own; mark its result as seen
+                task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        if not result.is_complete:
+            result.cancel()
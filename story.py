@@ -2,17 +2,15 @@ from __future__ import annotations
 import asyncio
 from dataclasses import dataclass
 from typing import Literal
-from agents import Agent, ItemHelpers, Runner, TResponseInputItem, trace
-import os
+from agents import Agent, ModelSettings, trace
+from judge_loop import judge_loop
 from dotenv import load_dotenv
-load_dotenv()
-
-openai_key=os.getenv('OPENAI_API_KEY')
 
 story_outline_generator= Agent(
     name="Story outline generator",
     instructions=("you generate a very short story outline based on the user's input," 
-    "If there any feedback provided, use it to improve the outline")
+    "If there any feedback provided, use it to improve the outline"),
+    model_settings=ModelSettings(temperature=0.9)
 )
 
 @dataclass
@@ -32,31 +30,14 @@ evaluator=Agent[None](
 
 async def main():
     msg=input("What kind of story would you like to hear?")
-    input_items:list[TResponseInputItem]=[{"content":msg,"role":"user"}]
-    latest_outline:str|None=None
 
     with trace("LLM as a Judge"):
-        while True:
-            story_outline_result= await Runner.run(
-                story_outline_generator,
-                input_items,
-
-            )
-            input_items=story_outline_result.to_input_list()
-            latest_outline=ItemHelpers.text_message_outputs(story_outline_result.new_items)
-
-            evaluator_result= await Runner.run(evaluator,input_items)
-            result:EvaluationFeedback = evaluator_result.final_output
-
-            print(f"Evaluator Score: {result.score}")
-
-            if result.score == "pass":
-                print("Story outline good enough, exiting")
-                break
-            print("rerunning with feedback")
+        session = await judge_loop(story_outline_generator, evaluator, msg, candidates=3, max_rounds=5)
 
-            input_items.append({"content":f"feedback: {result.feedback}","role":"user"})
-    print(f"final story outline: {latest_outline}")
+    print(f"Evaluator Score: {session.best.score if session.best else None}")
+    print(session.report())
+    print(f"final story outline: {session.outline}")
 
 if __name__ == '__main__':
-    asyncio.run(main())
\ No newline at end of file
+    load_dotenv()
+    asyncio.run(main())
@@ -0,0 +1,203 @@
+"""
+Reusable consumer for `RunResultStreaming.stream_events()`.
+
+routing.py and tracing.py used to `print(delta, flush=True)` once per token, one
+write syscall per delta. `StreamPipeline` coalesces deltas and flushes them to
+its sinks when the buffer reaches `max_chars` or when `max_delay` seconds have
+passed since the first buffered delta, whichever comes first. The producer side
+goes through a bounded queue, so a slow sink slows the stream down instead of
+buffering without limit. Time to first token and the gaps between tokens are
+recorded in `stats`.
+
+    pipeline = StreamPipeline([StdoutSink()])
+    await pipeline.consume(result)
+    print(pipeline.stats.summary())
+"""
+import asyncio
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Protocol, TextIO
+
+from agents import RawResponsesStreamEvent
+from agents.result import RunResultStreaming
+from openai.types.responses import ResponseContentPartDoneEvent, ResponseTextDeltaEvent
+
+
+class Sink(Protocol):
+    async def write(self, text: str) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+class StdoutSink:
+    """Writes to a text stream (stdout by default) and flushes once per batch."""
+
+    def __init__(self, stream: TextIO | None = None):
+        self.stream = stream or sys.stdout
+
+    async def write(self, text: str) -> None:
+        self.stream.write(text)
+        self.stream.flush()
+
+    async def close(self) -> None:
+        self.stream.flush()
+
+
+class FileSink:
+    def __init__(self, path: str):
+        self.file = open(path, "a", encoding="utf-8")
+
+    async def write(self, text: str) -> None:
+        self.file.write(text)
+
+    async def close(self) -> None:
+        self.file.close()
+
+
+class QueueSink:
+    """
+    Hands batches to an asyncio.Queue, e.g. one drained by a WebSocket handler.
+    With a bounded queue, a slow client blocks `write` and so backpressures the stream.
+    """
+
+    def __init__(self, queue: asyncio.Queue | None = None, maxsize: int = 64):
+        self.queue = queue if queue is not None else asyncio.Queue(maxsize)
+
+    async def write(self, text: str) -> None:
+        await self.queue.put(text)
+
+    async def close(self) -> None:
+        await self.queue.put(None)
+
+
+@dataclass
+class StreamStats:
+    deltas: int = 0
+    chars: int = 0
+    flushes: int = 0
+    time_to_first_token: float | None = None
+    gaps: list[float] = field(default_factory=list)
+
+    def summary(self) -> dict[str, Any]:
+        gaps = sorted(self.gaps)
+        return {
+            "deltas": self.deltas,
+            "chars": self.chars,
+            "flushes": self.flushes,
+            "ttft_ms": None if self.time_to_first_token is None else self.time_to_first_token * 1000,
+            "gap_p50_ms": statistics.median(gaps) * 1000 if gaps else None,
+            "gap_p99_ms": gaps[min(len(gaps) - 1, int(len(gaps) * 0.99))] * 1000 if gaps else None,
+        }
+
+
+_DONE = object()
+
+
+class StreamPipeline:
+    def __init__(
+        self,
+        sinks: list[Sink],
+        max_chars: int = 256,
+        max_delay: float = 0.05,
+        queue_size: int = 1024,
+        part_separator: str = "\n\n",
+    ):
+        self.sinks = sinks
+        self.max_chars = max_chars
+        self.max_delay = max_delay
+        self.part_separator = part_separator
+        self.stats = StreamStats()
+        self._queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self._started: float | None = None
+        self._last: float | None = None
+        self._error: Exception | None = None
+
+    def start_clock(self) -> None:
+        """Time to first token is measured from here (defaults to the first `put`)."""
+        self._started = time.perf_counter()
+
+    async def put(self, text: str) -> None:
+        """Producer side: waits when the queue is full (backpressure)."""
+        now = time.perf_counter()
+        if self._started is None:
+            self._started = now
+        if self._last is None:
+            self.stats.time_to_first_token = now - self._started
+        else:
+            self.stats.gaps.append(now - self._last)
+        self._last = now
+        self.stats.deltas += 1
+        self.stats.chars += len(text)
+        await self._queue.put(text)
+
+    async def _flush(self, parts: list[str]) -> None:
+        if not parts:
+            return
+        text = "".join(parts)
+        parts.clear()
+        self.stats.flushes += 1
+        if self._error is not None:
+            return
+        try:
+            for sink in self.sinks:
+                await sink.write(text)
+        except Exception as e:
+            # keep draining so the producer never blocks on a dead consumer; re-raised at the end
+            self._error = e
+
+    async def drain(self) -> None:
+        """Consumer side: batch queued text and flush on size or age until `finish()`."""
+        loop = asyncio.get_running_loop()
+        parts: list[str] = []
+        size = 0
+        deadline: float | None = None
+        try:
+            while True:
+                if deadline is None:
+                    item = await self._queue.get()
+                else:
+                    try:
+                        item = self._queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        try:
+                            item = await asyncio.wait_for(self._queue.get(), max(0.0, deadline - loop.time()))
+                        except asyncio.TimeoutError:
+                            await self._flush(parts)
+                            size, deadline = 0, None
+                            continue
+                if item is _DONE:
+                    break
+                parts.append(item)
+                size += len(item)
+                if deadline is None:
+                    deadline = loop.time() + self.max_delay
+                if size >= self.max_chars:
+                    await self._flush(parts)
+                    size, deadline = 0, None
+            await self._flush(parts)
+        finally:
+            for sink in self.sinks:
+                await sink.close()
+        if self._error is not None:
+            raise self._error
+
+    async def finish(self) -> None:
+        await self._queue.put(_DONE)
+
+    async def consume(self, result: RunResultStreaming) -> None:
+        """Feed a streamed run's text deltas through the pipeline until the run ends."""
+        self.start_clock()
+        drainer = asyncio.create_task(self.drain())
+        try:
+            async for event in result.stream_events():
+                if not isinstance(event, RawResponsesStreamEvent):
+                    continue
+                if isinstance(event.data, ResponseTextDeltaEvent):
+                    await self.put(event.data.delta)
+                elif isinstance(event.data, ResponseContentPartDoneEvent):
+                    await self._queue.put(self.part_separator)
+        finally:
+            await self.finish()
+            await drainer
@@ -0,0 +1,172 @@
+"""
+Chat front end for the routing (triage) and translation flows.
+
+    streamlit run streamlit_app.py
+
+Streamlit reruns this whole script on every interaction, so nothing expensive
+lives at module level:
+
+- `get_runtime()` is one asyncio loop on a background thread, shared by every
+  session (st.cache_resource). Agent runs are submitted to it, so the pooled
+  clients in provider.py stay bound to a single loop across reruns.
+- `get_registry()` imports the flow modules (and with them the agents and
+  clients) once per process, through flows.Registry.
+- Each browser session keeps only its own transcript and the rendered messages
+  in st.session_state. The transcript is a history.ConversationHistory, bounded
+  and summarised like the triage flow's in flows.py, so a long chat does not
+  resend every earlier turn.
+
+Triage answers stream into the page as they arrive: the run's text deltas go
+through a StreamPipeline into a thread-safe queue that st.write_stream drains
+on the script thread. Translations (a fan-out over several agents) are shown
+once complete. MODEL_BACKEND=fake runs it offline.
+"""
+import asyncio
+import queue
+import threading
+import uuid
+from collections.abc import Coroutine, Iterator
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any
+
+import streamlit as st
+
+from flows import Registry
+
+if TYPE_CHECKING:
+    from history import ConversationHistory
+
+FLOWS = {
+    "triage": "Support (French / Spanish / English)",
+    "translate": "Translate",
+}
+
+
+class AsyncRuntime:
+    """An event loop running forever on a daemon thread."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="streamlit-agents", daemon=True)
+        self.thread.start()
+
+    def submit(self, coro: Coroutine[Any, Any, Any]) -> Future:
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+
+@st.cache_resource
+def get_runtime() -> AsyncRuntime:
+    return AsyncRuntime()
+
+
+@st.cache_resource
+def get_registry() -> Registry:
+    registry = Registry()
+    for name in FLOWS:
+        get_runtime().submit(registry.load(name)).result()
+    return registry
+
+
+class _ScriptSink:
+    """StreamPipeline sink handing batches to the script thread; None marks the end."""
+
+    def __init__(self, out: queue.Queue):
+        self.out = out
+
+    async def write(self, text: str) -> None:
+        self.out.put(text)
+
+    async def close(self) -> None:
+        self.out.put(None)
+
+
+async def stream_triage(
+    registry: Registry, conversation_id: str, history: "ConversationHistory | None", text: str, out: queue.Queue
+) -> tuple["ConversationHistory", str]:
+    from agents import Runner
+
+    from history import ConversationHistory
+    from rate_limits import INTERACTIVE, request_priority
+    from stream_pipeline import StreamPipeline
+
+    try:
+        module = await registry.load("triage")
+        if history is None:  # the session's first turn; same budget as flows._triage
+            history = ConversationHistory(budget_tokens=4000, summarizer=module.summary_agent)
+        history.append({"content": text, "role": "user"})
+        agent = module.router.route(conversation_id, text)
+        with request_priority(INTERACTIVE):
+            result = Runner.run_streamed(agent, input=history.window(), run_config=module.config)
+            await StreamPipeline([_ScriptSink(out)], max_delay=0.03).consume(result)
+        history.extend_from_result(result)
+        module.router.remember(conversation_id, result.current_agent)
+        return history, result.current_agent.name
+    finally:
+        out.put(None)  # in case the run failed before the pipeline closed its sink
+
+
+def _deltas(out: queue.Queue) -> Iterator[str]:
+    while (text := out.get()) is not None:
+        yield text
+
+
+def _session() -> Any:
+    state = st.session_state
+    if "conversation_id" not in state:
+        state.conversation_id = uuid.uuid4().hex[:16]
+        state.history = None  # ConversationHistory, built by the first triage turn
+        state.messages = []  # (role, text, caption) as rendered
+    return state
+
+
+def main() -> None:
+    st.set_page_config(page_title="Agents", page_icon="💬")
+    runtime, registry = get_runtime(), get_registry()
+    state = _session()
+
+    with st.sidebar:
+        flow = st.radio("Flow", list(FLOWS), format_func=FLOWS.get, key="flow")
+        if st.button("New conversation"):
+            for key in ("conversation_id", "history", "messages"):
+                del state[key]
+            state = _session()
+
+    for role, text, caption in state.messages:
+        with st.chat_message(role):
+            st.markdown(text)
+            if caption:
+                st.caption(caption)
+
+    text = st.chat_input("Ask in French, Spanish or English" if flow == "triage" else "What should be translated, into which languages?")
+    if not text:
+        return
+    state.messages.append(("user", text, ""))
+    with st.chat_message("user"):
+        st.markdown(text)
+
+    with st.chat_message("assistant"):
+        try:
+            if flow == "triage":
+                out: queue.Queue = queue.Queue()
+                future = runtime.submit(stream_triage(registry, state.conversation_id, state.history, text, out))
+                answer = st.write_stream(_deltas(out))
+                state.history, agent_name = future.result()
+                caption = f"answered by {agent_name}"
+            else:
+                with st.spinner("Translating..."):
+                    response = runtime.submit(registry.handle({"flow": "translate", "input": text})).result()
+                if not response["ok"]:
+                    raise RuntimeError(response["error"])
+                answer = response["output"]
+                st.markdown(answer)
+                caption = f"{response['ms']:.0f} ms"
+        except Exception as e:
+            st.error(f"{type(e).__name__}: {e}")
+            state.messages.append(("assistant", f"⚠️ {type(e).__name__}: {e}", ""))
+            return
+        st.caption(caption)
+    state.messages.append(("assistant", answer if isinstance(answer, str) else "".join(answer), caption))
+
+
+if __name__ == "__main__":  # how streamlit runs the script
+    main()
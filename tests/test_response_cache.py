@@ -0,0 +1,146 @@
+"""
+CachedModel, MemoryCache and SQLiteCache against the offline FakeModel.
+
+    python -m unittest discover tests
+"""
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from agents import ModelSettings
+from agents.models.interface import ModelTracing
+from openai.types.responses import ResponseTextDeltaEvent
+
+from response_cache import CachedModel, MemoryCache, SQLiteCache
+from fake_model import FakeModel
+
+
+def call(model, input="hello", instructions="You are terse.", settings: ModelSettings | None = None):
+    return model.get_response(
+        instructions, input, settings or ModelSettings(), [], None, [], ModelTracing.DISABLED,
+        previous_response_id=None, prompt=None,
+    )
+
+
+def text(response) -> str:
+    return response.output[0].content[0].text
+
+
+class CachedModelTest(unittest.IsolatedAsyncioTestCase):
+    async def test_repeated_call_is_a_hit(self):
+        fake = FakeModel("bonjour")
+        model = CachedModel(fake, MemoryCache())
+        first = await call(model)
+        second = await call(model)
+        self.assertEqual(fake.calls, 1)
+        self.assertEqual((model.stats.hits, model.stats.misses), (1, 1))
+        self.assertEqual(text(second), text(first))
+        self.assertEqual(second.usage.requests, 0)  # hits do not count as model usage
+
+    async def test_key_covers_input_instructions_and_settings(self):
+        fake = FakeModel()
+        model = CachedModel(fake, MemoryCache())
+        await call(model)
+        await call(model, input="hello again")
+        await call(model, instructions="You are verbose.")
+        await call(model, settings=ModelSettings(max_tokens=10))
+        self.assertEqual(fake.calls, 4)
+        self.assertEqual(model.stats.misses, 4)
+        self.assertEqual(model.stats.hits, 0)
+
+    async def test_model_name_separates_entries_in_a_shared_cache(self):
+        cache = MemoryCache()
+        first, second = FakeModel("a"), FakeModel("b")
+        first.model, second.model = "model-a", "model-b"
+        self.assertEqual(text(await call(CachedModel(first, cache))), "a")
+        self.assertEqual(text(await call(CachedModel(second, cache))), "b")
+
+    async def test_sampled_calls_bypass_the_cache(self):
+        fake = FakeModel()
+        model = CachedModel(fake, MemoryCache())
+        hot = ModelSettings(temperature=0.8)
+        await call(model, settings=hot)
+        await call(model, settings=hot)
+        self.assertEqual(fake.calls, 2)
+        self.assertEqual(model.stats.bypassed, 2)
+
+        cached = CachedModel(fake, MemoryCache(), cache_nondeterministic=True)
+        await call(cached, settings=hot)
+        await call(cached, settings=hot)
+        self.assertEqual(fake.calls, 3)
+        self.assertEqual(cached.stats.hits, 1)
+
+    async def test_stream_hit_replays_the_text(self):
+        fake = FakeModel("streamed answer")
+        model = CachedModel(fake, MemoryCache())
+
+        async def deltas() -> str:
+            events = model.stream_response(
+                "You are terse.", "hello", ModelSettings(), [], None, [], ModelTracing.DISABLED,
+                previous_response_id=None, prompt=None,
+            )
+            return "".join([event.delta async for event in events if isinstance(event, ResponseTextDeltaEvent)])
+
+        self.assertEqual(await deltas(), "streamed answer")
+        self.assertEqual(await deltas(), "streamed answer")
+        self.assertEqual(fake.calls, 1)
+        self.assertEqual(model.stats.hits, 1)
+
+
+class MemoryCacheTest(unittest.TestCase):
+    def test_ttl_expires_entries(self):
+        cache = MemoryCache(ttl=10)
+        with mock.patch("response_cache.time.monotonic", return_value=100.0):
+            cache.set("k", ["v"])
+        with mock.patch("response_cache.time.monotonic", return_value=109.0):
+            self.assertEqual(cache.get("k"), ["v"])
+        with mock.patch("response_cache.time.monotonic", return_value=111.0):
+            self.assertIsNone(cache.get("k"))
+        self.assertEqual(len(cache), 0)
+
+    def test_evicts_least_recently_used(self):
+        cache = MemoryCache(maxsize=2)
+        cache.set("a", ["1"])
+        cache.set("b", ["2"])
+        cache.get("a")
+        cache.set("c", ["3"])
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), ["1"])
+        self.assertEqual(cache.get("c"), ["3"])
+
+
+class SQLiteCacheTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "responses.sqlite3")
+
+    def open(self, **kwargs) -> SQLiteCache:
+        cache = SQLiteCache(self.path, **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+
+    async def test_survives_a_restart(self):
+        fake = FakeModel("persisted")
+        await call(CachedModel(fake, self.open()))
+        restarted = CachedModel(fake, self.open())
+        self.assertEqual(text(await call(restarted)), "persisted")
+        self.assertEqual(fake.calls, 1)
+        self.assertEqual(restarted.stats.hits, 1)
+
+    async def test_ttl_expires_rows(self):
+        fake = FakeModel()
+        model = CachedModel(fake, self.open(ttl=10))
+        with mock.patch("response_cache.time.time", return_value=1000.0):
+            await call(model)
+        with mock.patch("response_cache.time.time", return_value=1005.0):
+            await call(model)
+        with mock.patch("response_cache.time.time", return_value=1011.0):
+            await call(model)
+        self.assertEqual(fake.calls, 2)
+        self.assertEqual((model.stats.hits, model.stats.misses), (1, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
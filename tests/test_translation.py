@@ -0,0 +1,85 @@
+"""
+BatchingTranslator against the fake AsyncOpenAI-shaped client from benchmarks/translator.py.
+
+    python -m unittest discover tests
+"""
+import asyncio
+import unittest
+
+from benchmarks.translator import FakeClient
+from translation import BatchingTranslator, translation_key
+
+
+class BatchingTranslatorTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.client = FakeClient(latency=0.01)
+        self.translator = BatchingTranslator(self.client, window=0.01)
+
+    @property
+    def calls(self) -> int:
+        return self.client.chat.completions.calls
+
+    async def test_identical_concurrent_requests_make_one_call(self):
+        results = await asyncio.gather(*(self.translator.translate("English", "French", "good morning") for _ in range(10)))
+        self.assertEqual(results, ["[french] good morning"] * 10)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.translator.stats.coalesced, 9)
+
+    async def test_batch_splits_back_in_order(self):
+        texts = ["good morning", "thank you", "see you tomorrow", "the bill, please"]
+        results = await asyncio.gather(*(self.translator.translate("English", "Spanish", text) for text in texts))
+        self.assertEqual(results, [f"[spanish] {text}" for text in texts])
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.translator.stats.batched_segments, 4)
+
+    async def test_language_pairs_are_batched_separately(self):
+        results = await asyncio.gather(
+            self.translator.translate("English", "French", "hello"),
+            self.translator.translate("English", "German", "hello"),
+            self.translator.translate("English", "French", "goodbye"),
+        )
+        self.assertEqual(results, ["[french] hello", "[german] hello", "[french] goodbye"])
+        self.assertEqual(self.calls, 2)
+
+    async def test_results_are_memoized(self):
+        first = await self.translator.translate("English", "French", "good morning")
+        again = await self.translator.translate(" english", "FRENCH ", "good   morning")  # same normalized key
+        self.assertEqual(again, first)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.translator.stats.cache_hits, 1)
+
+    async def test_max_batch_flushes_early(self):
+        translator = BatchingTranslator(self.client, window=10.0, max_batch=3)
+        texts = ["one", "two", "three"]
+        results = await asyncio.wait_for(
+            asyncio.gather(*(translator.translate("English", "French", text) for text in texts)), timeout=1.0
+        )
+        self.assertEqual(results, [f"[french] {text}" for text in texts])
+
+    async def test_unparseable_batch_falls_back_to_single_calls(self):
+        client = FakeClient(latency=0.01, bad_json_rate=1.0)
+        translator = BatchingTranslator(client, window=0.01)
+        texts = ["good morning", "thank you", "see you tomorrow"]
+        results = await asyncio.gather(*(translator.translate("English", "French", text) for text in texts))
+        self.assertEqual(results, [f"[french] {text}" for text in texts])
+        self.assertEqual(translator.stats.fallbacks, 1)
+        self.assertEqual(client.chat.completions.calls, 1 + len(texts))
+
+    async def test_errors_reach_every_waiter_and_are_not_cached(self):
+        async def fail(**kwargs):
+            raise ConnectionError("down")
+
+        create = self.client.chat.completions.create
+        self.client.chat.completions.create = fail
+        results = await asyncio.gather(
+            *(self.translator.translate("English", "French", "hello") for _ in range(3)), return_exceptions=True
+        )
+        self.assertTrue(all(isinstance(result, ConnectionError) for result in results))
+        self.assertIsNone(self.translator.cache.get(translation_key("English", "French", "hello")))
+
+        self.client.chat.completions.create = create
+        self.assertEqual(await self.translator.translate("English", "French", "hello"), "[french] hello")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,213 @@
+"""
+Tiered guardrail classification: cheap local checks first, LLM judge only when unsure.
+
+Tier 1 is a list of keyword/regex rules, tier 2 an optional logistic-regression
+model over hashed character n-grams (NumPy). Each tier gives a probability that
+the text is positive (e.g. "is math homework"); at or above `high` the answer is
+yes, at or below `low` it is no, anything in between goes to the next tier and
+finally to the LLM judge (the `police`/`guard` agents in guardrail.py).
+
+    tiers = TieredClassifier(MATH_HOMEWORK_RULES)
+    verdict = await tiers.classify(text, judge=ask_police)
+    print(verdict.positive, verdict.tier, tiers.stats)
+"""
+import re
+import time
+import zlib
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+try:
+    import numpy as np
+except ImportError:  # the n-gram tier is optional
+    np = None
+
+
+@dataclass(frozen=True)
+class Rule:
+    pattern: re.Pattern
+    probability: float
+    """Probability that the text is positive when the pattern matches."""
+
+
+def rule(pattern: str, probability: float) -> Rule:
+    return Rule(re.compile(pattern, re.IGNORECASE), probability)
+
+
+class RuleClassifier:
+    """
+    Keyword/regex tier. The most confident matching rule wins (the one furthest
+    from 0.5). Rules pointing both ways cancel out to 0.5 so the text escalates;
+    with no match at all the `default` probability is returned.
+    """
+
+    def __init__(self, rules: list[Rule], default: float = 0.5):
+        self.rules = rules
+        self.default = default
+
+    def predict_proba(self, text: str) -> float:
+        matched = [r.probability for r in self.rules if r.pattern.search(text)]
+        if not matched:
+            return self.default
+        if max(matched) > 0.5 and min(matched) < 0.5:
+            return 0.5
+        return max(matched, key=lambda p: abs(p - 0.5))
+
+
+class HashedNgramModel:
+    """
+    Logistic regression on l2-normalised counts of hashed character n-grams.
+    Small enough to train on a labelled fixture file and evaluate in microseconds.
+    """
+
+    def __init__(self, n_features: int = 2**16, ngram_range: tuple[int, int] = (2, 4)):
+        if np is None:
+            raise ImportError("HashedNgramModel needs numpy: pip install numpy")
+        self.n_features = n_features
+        self.ngram_range = ngram_range
+        self.weights = np.zeros(n_features, dtype=np.float32)
+        self.bias = 0.0
+
+    def features(self, text: str) -> tuple["np.ndarray", "np.ndarray"]:
+        text = f" {text.lower()} "
+        lo, hi = self.ngram_range
+        hashes = [
+            zlib.crc32(text[i:i + n].encode()) % self.n_features
+            for n in range(lo, hi + 1)
+            for i in range(len(text) - n + 1)
+        ]
+        indices, counts = np.unique(np.asarray(hashes, dtype=np.int64), return_counts=True)
+        values = counts.astype(np.float32)
+        values /= np.linalg.norm(values) or 1.0
+        return indices, values
+
+    def predict_proba(self, text: str) -> float:
+        indices, values = self.features(text)
+        z = float(values @ self.weights[indices]) + self.bias
+        return float(1.0 / (1.0 + np.exp(-z)))
+
+    def fit(self, texts: list[str], labels: list[bool], epochs: int = 300, lr: float = 2.0, l2: float = 1e-4) -> "HashedNgramModel":
+        rows = [self.features(t) for t in texts]
+        x = np.zeros((len(texts), self.n_features), dtype=np.float32)
+        for row, (indices, values) in enumerate(rows):
+            x[row, indices] = values
+        y = np.asarray(labels, dtype=np.float32)
+        for _ in range(epochs):
+            p = 1.0 / (1.0 + np.exp(-(x @ self.weights + self.bias)))
+            error = p - y
+            self.weights -= lr * (x.T @ error / len(y) + l2 * self.weights)
+            self.bias -= lr * float(error.mean())
+        return self
+
+    def save(self, path: str) -> None:
+        np.savez_compressed(path, weights=self.weights, bias=self.bias, ngram_range=self.ngram_range)
+
+    @classmethod
+    def load(cls, path: str) -> "HashedNgramModel":
+        data = np.load(path)
+        model = cls(n_features=len(data["weights"]), ngram_range=tuple(int(n) for n in data["ngram_range"]))
+        model.weights = data["weights"]
+        model.bias = float(data["bias"])
+        return model
+
+
+@dataclass
+class Verdict:
+    positive: bool
+    tier: str
+    probability: float
+    output_info: object = None
+
+
+@dataclass
+class TierStats:
+    resolved: dict[str, int] = field(default_factory=lambda: {"rules": 0, "model": 0, "llm": 0})
+    seconds: dict[str, float] = field(default_factory=lambda: {"rules": 0.0, "model": 0.0, "llm": 0.0})
+
+    @property
+    def total(self) -> int:
+        return sum(self.resolved.values())
+
+    def as_dict(self) -> dict:
+        return {
+            tier: {
+                "resolved": count,
+                "share": count / self.total if self.total else 0.0,
+                "avg_ms": self.seconds[tier] / count * 1000 if count else 0.0,
+            }
+            for tier, count in self.resolved.items()
+        }
+
+
+Judge = Callable[[str], Awaitable[tuple[bool, object]]]
+
+
+class TieredClassifier:
+    """Rules, then the optional n-gram model, then `judge` (an async LLM call) for whatever is left."""
+
+    def __init__(self, rules: RuleClassifier, model: HashedNgramModel | None = None, low: float = 0.15, high: float = 0.85):
+        self.rules = rules
+        self.model = model
+        self.low = low
+        self.high = high
+        self.stats = TierStats()
+
+    def _decide(self, tier: str, probability: float, start: float) -> Verdict | None:
+        if self.low < probability < self.high:
+            return None
+        self.stats.resolved[tier] += 1
+        self.stats.seconds[tier] += time.perf_counter() - start
+        return Verdict(probability >= self.high, tier, probability)
+
+    def classify_local(self, text: str) -> Verdict | None:
+        """The local tiers only; None when they are not confident enough."""
+        start = time.perf_counter()
+        verdict = self._decide("rules", self.rules.predict_proba(text), start)
+        if verdict is None and self.model is not None:
+            verdict = self._decide("model", self.model.predict_proba(text), start)
+        return verdict
+
+    async def classify(self, text: str, judge: Judge) -> Verdict:
+        verdict = self.classify_local(text)
+        if verdict is not None:
+            return verdict
+        start = time.perf_counter()
+        positive, output_info = await judge(text)
+        self.stats.resolved["llm"] += 1
+        self.stats.seconds["llm"] += time.perf_counter() - start
+        return Verdict(positive, "llm", 1.0 if positive else 0.0, output_info)
+
+
+# ----------------------------
+# Rule sets for guardrail.py
+# ----------------------------
+MATH_HOMEWORK_RULES = RuleClassifier(
+    [
+        # the verbs alone are everyday support words too ("solve a problem with my printer",
+        # "integrate your API"): only sure with a number, an expression or a math noun after them
+        rule(
+            r"\b(solve|simplify|factori[sz]e|differentiate|integrate|evaluate)\b[^.?!]{0,40}?"
+            r"(\d|\b[a-z]\s*[-+*/^=²(]|\bfor [a-z]\b|\b(equation|expression|system|limit|function|sin|cos|tan|log)\b)",
+            0.95,
+        ),
+        rule(r"\b(solve|simplify|factori[sz]e|differentiate|integrate|evaluate)\b", 0.6),
+        rule(r"\b(equation|derivative|integral|quadratic|polynomial|algebra|calculus|trigonometry|geometry|theorem|fraction)s?\b", 0.9),
+        rule(r"\b(homework|assignment|worksheet)\b.*\b(math|maths|problem)s?\b", 0.95),
+        rule(r"\d+\s*[-+*/^=x×÷]\s*\d+", 0.8),  # dates, phone numbers, sizes look alike: let the LLM decide
+        rule(r"\b[a-z]\s*[\^²]\s*\d?|\b\d+[a-z]\b\s*[-+=]", 0.9),
+        rule(r"\d", 0.5),
+        # support vocabulary that word problems do not use ("order of operations", "a delivery truck")
+        rule(r"\b(refund|password|log(in|ging)|subscription|invoice|tracking number|return policy|opening hours)\b", 0.05),
+        rule(r"\b(my|your) (order|account|package|parcel|delivery|shipping)\b", 0.05),
+    ],
+    default=0.5,
+)
+
+PAKISTAN_RULES = RuleClassifier(
+    [
+        rule(r"\bpakistan(i|is)?\b", 0.95),
+        rule(r"\b(islamabad|karachi|lahore|peshawar|quetta|rawalpindi|multan|faisalabad|punjab|sindh|balochistan|khyber|urdu|jinnah)\b", 0.9),
+        rule(r"\b(india|indian|new delhi|modi|bangladesh|afghanistan|china|iran)\b", 0.1),
+    ],
+    default=0.5,
+)
@@ -0,0 +1,228 @@
+"""
+Run function tools without blocking the event loop.
+
+The SDK's `function_tool` awaits async tools but calls sync ones directly on
+the event loop, so a tool doing blocking I/O or heavy CPU work stalls every
+other run on that loop. `ToolExecutor.tool` is a drop-in replacement for the
+decorator that works out how to run each function:
+
+- async functions are awaited on the loop, as before;
+- sync functions run in the executor's thread pool;
+- sync functions marked `cpu_bound=True` run in its process pool (they must be
+  module-level, take no RunContextWrapper and have picklable arguments).
+
+Every tool can also get a timeout and a concurrency limit, and each call's
+latency goes into a per-tool histogram. A timed-out or failing call raises
+inside the tool, so the SDK's failure_error_function reports it to the model
+like any other tool error (a thread cannot be killed: a timed-out sync call
+keeps its worker until it returns).
+
+    executor = ToolExecutor(max_threads=32)
+
+    @executor.tool(timeout=10, max_concurrency=4)
+    def weather(city: str) -> str: ...
+
+    print(executor.report())
+"""
+import asyncio
+import bisect
+import contextvars
+import functools
+import importlib
+import inspect
+import threading
+import time
+import weakref
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from agents import FunctionTool, function_tool
+from agents.function_schema import function_schema
+
+# latency bucket upper bounds, in seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+@dataclass
+class LatencyHistogram:
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    counts: list[int] = field(default_factory=list)  # one per bucket, plus +Inf
+    count: int = 0
+    sum: float = 0.0
+    errors: int = 0
+    timeouts: int = 0
+
+    def __post_init__(self):
+        if not self.counts:
+            self.counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th quantile (inf past the last bucket)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "calls": self.count,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "mean_ms": round(self.sum / self.count * 1000, 2) if self.count else 0.0,
+            "p50_ms": self.quantile(0.5) * 1000,
+            "p99_ms": self.quantile(0.99) * 1000,
+        }
+
+
+@dataclass
+class ToolPolicy:
+    mode: str  # "async", "thread" or "process"
+    timeout: float | None = None
+    max_concurrency: int | None = None
+    # one semaphore per event loop: a semaphore is bound to the loop it is first used on, and a
+    # tool on the module-level default_executor can be called from several (asyncio.run, threads)
+    _semaphores: weakref.WeakKeyDictionary = field(default_factory=weakref.WeakKeyDictionary)
+
+    def semaphore(self) -> asyncio.Semaphore | None:
+        if not self.max_concurrency:
+            return None
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+
+# process-pool tools, by "module:qualname"; workers re-import the module to fill it in
+_PROCESS_FUNCTIONS: dict[str, Callable] = {}
+
+
+def _call_in_process(key: str, args: tuple, kwargs: dict) -> Any:
+    if key not in _PROCESS_FUNCTIONS:
+        module, qualname = key.split(":", 1)
+        importlib.import_module(module)
+        if module == "__main__" and key not in _PROCESS_FUNCTIONS:
+            key = f"__mp_main__:{qualname}"  # spawned workers import the main script as __mp_main__
+    return _PROCESS_FUNCTIONS[key](*args, **kwargs)
+
+
+class ToolExecutor:
+    def __init__(
+        self,
+        max_threads: int = 32,
+        max_processes: int | None = None,
+        default_timeout: float | None = None,
+    ):
+        self.max_threads = max_threads
+        self.max_processes = max_processes
+        self.default_timeout = default_timeout
+        self.histograms: dict[str, LatencyHistogram] = {}
+        self._threads: ThreadPoolExecutor | None = None
+        self._processes: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def threads(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(self.max_threads, thread_name_prefix="tool")
+            return self._threads
+
+    @property
+    def processes(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._processes is None:
+                self._processes = ProcessPoolExecutor(self.max_processes)
+            return self._processes
+
+    def tool(
+        self,
+        func: Callable | None = None,
+        *,
+        cpu_bound: bool = False,
+        timeout: float | None = None,
+        max_concurrency: int | None = None,
+        **function_tool_kwargs: Any,
+    ) -> FunctionTool | Callable[[Callable], FunctionTool]:
+        """`@function_tool` with sync functions moved off the loop; extra kwargs go to function_tool."""
+
+        def decorate(the_func: Callable) -> FunctionTool:
+            if inspect.iscoroutinefunction(the_func):
+                mode = "async"
+            elif cpu_bound:
+                if function_schema(the_func, use_docstring_info=False).takes_context:
+                    raise TypeError(f"{the_func.__qualname__}: cpu_bound tools cannot take a RunContextWrapper")
+                _PROCESS_FUNCTIONS[f"{the_func.__module__}:{the_func.__qualname__}"] = the_func
+                mode = "process"
+            else:
+                mode = "thread"
+            policy = ToolPolicy(
+                mode,
+                timeout if timeout is not None else self.default_timeout,
+                max_concurrency,
+            )
+            name = function_tool_kwargs.get("name_override") or the_func.__name__
+            histogram = self.histograms.setdefault(name, LatencyHistogram())
+
+            @functools.wraps(the_func)
+            async def run(*args: Any, **kwargs: Any) -> Any:
+                start = time.perf_counter()
+                try:
+                    semaphore = policy.semaphore()
+                    if semaphore is None:
+                        return await self._call(the_func, policy, args, kwargs)
+                    async with semaphore:
+                        return await self._call(the_func, policy, args, kwargs)
+                except asyncio.TimeoutError:
+                    histogram.timeouts += 1
+                    raise TimeoutError(f"tool {name} timed out after {policy.timeout}s") from None
+                except Exception:
+                    histogram.errors += 1
+                    raise
+                finally:
+                    histogram.observe(time.perf_counter() - start)
+
+            return function_tool(run, **function_tool_kwargs)
+
+        return decorate if func is None else decorate(func)
+
+    async def _call(self, func: Callable, policy: ToolPolicy, args: tuple, kwargs: dict) -> Any:
+        if policy.mode == "async":
+            call = func(*args, **kwargs)
+        else:
+            loop = asyncio.get_running_loop()
+            if policy.mode == "process":
+                key = f"{func.__module__}:{func.__qualname__}"
+                call = loop.run_in_executor(self.processes, _call_in_process, key, args, kwargs)
+            else:
+                # like asyncio.to_thread: the tool sees the caller's contextvars (current trace/span)
+                context = contextvars.copy_context()
+                call = loop.run_in_executor(self.threads, functools.partial(context.run, func, *args, **kwargs))
+        if policy.timeout is None:
+            return await call
+        return await asyncio.wait_for(call, policy.timeout)
+
+    def report(self) -> dict[str, dict[str, Any]]:
+        return {name: h.summary() for name, h in self.histograms.items() if h.count}
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            for pool in (self._threads, self._processes):
+                if pool is not None:
+                    pool.shutdown(wait=wait)
+            self._threads = self._processes = None
+
+
+default_executor = ToolExecutor()
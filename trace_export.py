@@ -0,0 +1,328 @@
+"""
+A batching, sampling trace processor for high-volume runs.
+
+`SamplingBatchProcessor` plugs into the SDK's tracing (`set_trace_processors`)
+and keeps the agent's hot path down to a dict lookup and a deque append per
+span. Finished spans go into a bounded ring buffer; a background thread drains
+it in batches when `batch_size` items are waiting or every `flush_interval`
+seconds, and hands each batch to the exporters. When the exporters fall
+behind, the oldest buffered items are overwritten and counted as dropped
+rather than blocking the agents.
+
+Sampling:
+
+- head: `head_rate` of traces are kept, decided when the trace starts; their
+  spans go straight to the buffer;
+- tail: spans of the other traces are held until the trace ends, then kept
+  anyway if a span recorded an error (`keep_errors`) or the trace took at least
+  `slow_threshold` seconds; otherwise they are discarded.
+
+Exporters are SDK `TracingExporter`s: `JsonlExporter` appends each item's
+`export()` dict to a local file, `OTLPHttpExporter` POSTs spans as OTLP/HTTP
+JSON to a collector (benchmarks/stub_server.py can stand in for one).
+
+    processor = SamplingBatchProcessor([JsonlExporter("traces.jsonl")], head_rate=0.1, slow_threshold=5.0)
+    set_trace_processors([processor])
+
+or, from TRACE_EXPORT_JSONL / TRACE_EXPORT_OTLP / TRACE_HEAD_RATE /
+TRACE_SLOW_MS, `configure_tracing()`.
+"""
+import json
+import os
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+import requests
+from agents import set_trace_processors
+from agents.tracing import Span, Trace, TracingProcessor
+from agents.tracing.processor_interface import TracingExporter
+
+
+@dataclass
+class ExportStats:
+    traces: int = 0
+    spans: int = 0
+    head_sampled: int = 0  # traces kept by the head decision
+    tail_kept: int = 0  # traces kept because they errored or were slow
+    sampled_out: int = 0  # traces discarded by sampling
+    dropped: int = 0  # items overwritten in the ring buffer before export
+    late_spans: int = 0  # spans ending after their trace was discarded or forgotten
+    exported: int = 0
+    batches: int = 0
+    export_errors: int = 0
+
+
+@dataclass
+class _PendingTrace:
+    trace: Trace
+    started: float
+    head: bool
+    spans: list[Span] = field(default_factory=list)
+    errored: bool = False
+
+
+class SamplingBatchProcessor(TracingProcessor):
+    def __init__(
+        self,
+        exporters: list[TracingExporter],
+        head_rate: float = 1.0,
+        keep_errors: bool = True,
+        slow_threshold: float | None = None,
+        max_queue: int = 8192,
+        batch_size: int = 512,
+        flush_interval: float = 2.0,
+        max_spans_per_trace: int = 1000,
+        seed: int | None = None,
+    ):
+        self.exporters = exporters
+        self.head_rate = head_rate
+        self.keep_errors = keep_errors
+        self.slow_threshold = slow_threshold
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_spans_per_trace = max_spans_per_trace
+        self.stats = ExportStats()
+        self._buffer: deque[Trace | Span] = deque(maxlen=max_queue)
+        self._pending: dict[str, _PendingTrace] = {}
+        self._kept: OrderedDict[str, None] = OrderedDict()  # recently kept trace ids, for late spans
+        self._random = random.Random(seed)
+        self._wakeup = threading.Event()
+        self._export_lock = threading.Lock()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="trace-export", daemon=True)
+        self._thread.start()
+
+    # hot path: called on the agents' thread
+
+    def _enqueue(self, item: Trace | Span) -> None:
+        if len(self._buffer) == self._buffer.maxlen:
+            self.stats.dropped += 1  # the append below overwrites the oldest item
+        self._buffer.append(item)
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    def on_trace_start(self, trace: Trace) -> None:
+        self.stats.traces += 1
+        self._pending[trace.trace_id] = _PendingTrace(trace, time.monotonic(), self._random.random() < self.head_rate)
+
+    def on_span_start(self, span: Span[Any]) -> None:
+        pass
+
+    def on_span_end(self, span: Span[Any]) -> None:
+        self.stats.spans += 1
+        pending = self._pending.get(span.trace_id)
+        if pending is None:
+            if span.trace_id in self._kept:
+                self._enqueue(span)
+            else:
+                self.stats.late_spans += 1
+        elif pending.head:
+            self._enqueue(span)
+        elif len(pending.spans) < self.max_spans_per_trace:
+            pending.spans.append(span)
+            if span.error is not None:
+                pending.errored = True
+
+    def on_trace_end(self, trace: Trace) -> None:
+        pending = self._pending.pop(trace.trace_id, None)
+        if pending is None:
+            return
+        if pending.head:
+            self.stats.head_sampled += 1
+        elif (self.keep_errors and pending.errored) or (
+            self.slow_threshold is not None and time.monotonic() - pending.started >= self.slow_threshold
+        ):
+            self.stats.tail_kept += 1
+            for span in pending.spans:
+                self._enqueue(span)
+        else:
+            self.stats.sampled_out += 1
+            return
+        self._enqueue(trace)
+        self._kept[trace.trace_id] = None
+        if len(self._kept) > 1024:
+            self._kept.popitem(last=False)
+
+    # background export
+
+    def _run(self) -> None:
+        while not self._stopped:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self._export_batches()
+        self._export_batches()
+
+    def _export_batches(self) -> None:
+        with self._export_lock:
+            while self._buffer:
+                batch = []
+                while self._buffer and len(batch) < self.batch_size:
+                    batch.append(self._buffer.popleft())
+                self.stats.batches += 1
+                for exporter in self.exporters:
+                    try:
+                        exporter.export(batch)
+                    except Exception:
+                        self.stats.export_errors += 1
+                self.stats.exported += len(batch)
+
+    def force_flush(self) -> None:
+        self._export_batches()
+
+    def shutdown(self, timeout: float | None = None) -> None:
+        if self._stopped:
+            return
+        self._stopped = True
+        self._wakeup.set()
+        self._thread.join(timeout)
+        for exporter in self.exporters:
+            close = getattr(exporter, "close", None)
+            if close is not None:
+                close()
+
+
+class JsonlExporter(TracingExporter):
+    """One JSON object per line: the SDK's own export() format for traces and spans."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+
+    def export(self, items: list[Trace | Span[Any]]) -> None:
+        lines = []
+        for item in items:
+            exported = item.export()
+            if exported:
+                lines.append(json.dumps(exported, default=str))
+        self._file.write("\n".join(lines) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _nanos(iso: str | None) -> str:
+    return str(int(datetime.fromisoformat(iso).timestamp() * 1e9)) if iso else "0"
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, str):
+        return {"stringValue": value}
+    return {"stringValue": json.dumps(value, default=str)}
+
+
+def otlp_span(span: dict[str, Any]) -> dict[str, Any]:
+    """An SDK span export() dict as an OTLP JSON span. SDK span ids are 24 hex digits; OTLP wants 16."""
+    data = dict(span.get("span_data") or {})
+    name = data.pop("name", None) or data.get("type", "span")
+    otlp = {
+        "traceId": span["trace_id"].removeprefix("trace_"),
+        "spanId": span["id"].removeprefix("span_")[-16:],
+        "name": str(name),
+        "kind": 1,  # SPAN_KIND_INTERNAL
+        "startTimeUnixNano": _nanos(span.get("started_at")),
+        "endTimeUnixNano": _nanos(span.get("ended_at")),
+        "attributes": [{"key": f"agents.{key}", "value": _otlp_value(value)} for key, value in data.items() if value is not None],
+        "status": {"code": 0},
+    }
+    if span.get("parent_id"):
+        otlp["parentSpanId"] = span["parent_id"].removeprefix("span_")[-16:]
+    if span.get("error"):
+        otlp["status"] = {"code": 2, "message": str(span["error"].get("message", ""))}
+    return otlp
+
+
+class OTLPHttpExporter(TracingExporter):
+    """
+    POST spans to an OTLP/HTTP collector as JSON (`<endpoint>`, e.g.
+    http://localhost:4318/v1/traces). OTLP has no record for a trace itself, so
+    trace items only contribute their workflow name as an attribute to spans in
+    the same batch.
+    """
+
+    def __init__(
+        self,
+        endpoint: str = "http://localhost:4318/v1/traces",
+        service_name: str = "agents",
+        headers: dict[str, str] | None = None,
+        timeout: float = 5.0,
+        max_attempts: int = 3,
+    ):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.session = requests.Session()
+        self.session.headers.update({"Content-Type": "application/json", **(headers or {})})
+
+    def export(self, items: list[Trace | Span[Any]]) -> None:
+        workflows = {item.trace_id: item.name for item in items if isinstance(item, Trace)}
+        spans = []
+        for item in items:
+            if isinstance(item, Trace):
+                continue
+            exported = item.export()
+            if not exported:
+                continue
+            span = otlp_span(exported)
+            if item.trace_id in workflows:
+                span["attributes"].append({"key": "agents.workflow_name", "value": {"stringValue": workflows[item.trace_id]}})
+            spans.append(span)
+        if not spans:
+            return
+        body = json.dumps({
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service_name}}]},
+                "scopeSpans": [{"scope": {"name": "openai-agents"}, "spans": spans}],
+            }],
+        })
+        for attempt in range(self.max_attempts):
+            try:
+                response = self.session.post(self.endpoint, data=body, timeout=self.timeout)
+                if response.status_code < 500 and response.status_code != 429:
+                    response.raise_for_status()
+                    return
+            except requests.ConnectionError:
+                if attempt == self.max_attempts - 1:
+                    raise
+            if attempt < self.max_attempts - 1:
+                time.sleep(0.1 * 2 ** attempt)
+        response.raise_for_status()
+
+    def close(self) -> None:
+        self.session.close()
+
+
+def configure_tracing() -> SamplingBatchProcessor | None:
+    """
+    Replace the SDK's trace processors from TRACE_EXPORT_JSONL (a path) and/or
+    TRACE_EXPORT_OTLP (a collector URL), sampling per TRACE_HEAD_RATE (default 1)
+    and TRACE_SLOW_MS. Returns None, leaving the SDK's default exporter, when
+    neither exporter is set.
+    """
+    exporters: list[TracingExporter] = []
+    if path := os.getenv("TRACE_EXPORT_JSONL"):
+        exporters.append(JsonlExporter(path))
+    if endpoint := os.getenv("TRACE_EXPORT_OTLP"):
+        exporters.append(OTLPHttpExporter(endpoint))
+    if not exporters:
+        return None
+    slow_ms = os.getenv("TRACE_SLOW_MS")
+    processor = SamplingBatchProcessor(
+        exporters,
+        head_rate=float(os.getenv("TRACE_HEAD_RATE", "1")),
+        slow_threshold=float(slow_ms) / 1000 if slow_ms else None,
+    )
+    set_trace_processors([processor])
+    return processor
@@ -1,24 +1,11 @@
-import os
 import asyncio
-from dotenv import load_dotenv
-from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel, RunConfig, trace
-from agents import RawResponsesStreamEvent
-from openai.types.responses import ResponseTextDeltaEvent, ResponseContentPartDoneEvent
+from agents import Agent, Runner, trace
+from provider import get_model, get_run_config
+from stream_pipeline import StdoutSink, StreamPipeline
+from trace_export import configure_tracing
 
-# Load API key from .env
-load_dotenv()
-openai_api_key = os.getenv("OPENAI_API_KEY")
-if not openai_api_key:
-    raise ValueError("OPENAI_API_KEY not set")
-
-# Define the OpenAI client
-openai_client = AsyncOpenAI(api_key=openai_api_key)
-
-# Define the model
-model = OpenAIChatCompletionsModel(
-    openai_client=openai_client,
-    model="gpt-4o-mini"  # change to the model you want
-)
+# Define the model (shared, pooled OpenAI client)
+model = get_model("gpt-4o-mini")  # change to the model you want
 
 # Create the agent
 assistant_agent = Agent(
@@ -28,13 +15,11 @@ assistant_agent = Agent(
 )
 
 # Enable tracing in the config
-config = RunConfig(
-    model=model,
-    model_provider=openai_client,
-    tracing_disabled=False
-)
+config = get_run_config(model, tracing_disabled=False)
 
 async def main():
+    # batched, sampled export when TRACE_EXPORT_JSONL / TRACE_EXPORT_OTLP is set
+    configure_tracing()
     inputs = [{"content": "Hello, can you tell me a fun fact?", "role": "user"}]
 
     with trace("Simple assistant trace"):
@@ -43,14 +28,8 @@ async def main():
             input=inputs,
             run_config=config
         )
-        async for event in result.stream_events():
-            if not isinstance(event, RawResponsesStreamEvent):
-                continue
-            data = event.data
-            if isinstance(data, ResponseTextDeltaEvent):
-                print(data.delta, end="", flush=True)
-            elif isinstance(data, ResponseContentPartDoneEvent):
-                print("\n")
+        # deltas are batched into a few writes instead of one flush per token
+        await StreamPipeline([StdoutSink()]).consume(result)
 
 if __name__ == "__main__":
     asyncio.run(main())
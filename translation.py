@@ -0,0 +1,171 @@
+"""
+Translation backend for the `translator` tool in model_settings.py.
+
+The tool used to make one chat.completions call per (from, to, text) triple.
+`BatchingTranslator` sits in front of the (shared, pooled) client and:
+
+- memoizes results on a normalized (language pair, text hash) key in a bounded
+  LRU (response_cache.MemoryCache);
+- coalesces identical requests that are already in flight onto one future;
+- micro-batches concurrent requests for the same language pair that arrive
+  within `window` seconds into one multi-segment prompt, e.g. when
+  parallel_agent fires several translations in one turn.
+
+If a batched answer cannot be parsed back into segments, each segment is
+translated on its own instead, so batching never loses a translation.
+
+    translator = BatchingTranslator(get_openai_client())
+    text = await translator.translate("english", "french", "good morning")
+    print(translator.stats)
+"""
+import asyncio
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any
+
+from response_cache import MemoryCache
+
+
+@dataclass
+class TranslatorStats:
+    requested: int = 0
+    cache_hits: int = 0
+    coalesced: int = 0
+    api_calls: int = 0
+    batched_segments: int = 0
+    fallbacks: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.cache_hits / self.requested if self.requested else 0.0
+
+    @property
+    def requests_saved(self) -> int:
+        return self.requested - self.api_calls
+
+
+def normalize_language(language: str) -> str:
+    return " ".join(language.lower().split())
+
+
+def translation_key(from_language: str, to_language: str, text: str) -> str:
+    # whitespace differences do not change the translation
+    digest = hashlib.sha256(" ".join(text.split()).encode()).hexdigest()
+    return f"{normalize_language(from_language)}|{normalize_language(to_language)}|{digest}"
+
+
+@dataclass
+class _Batch:
+    items: list[tuple[str, str, asyncio.Future]] = field(default_factory=list)  # (key, text, future)
+    timer: asyncio.TimerHandle | None = None
+
+
+class BatchingTranslator:
+    def __init__(
+        self,
+        client: Any,
+        model: str = "gpt-4o-mini",
+        maxsize: int = 1024,
+        window: float = 0.02,
+        max_batch: int = 16,
+    ):
+        self.client = client
+        self.model = model
+        self.window = window
+        self.max_batch = max_batch
+        self.cache = MemoryCache(maxsize=maxsize)
+        self.stats = TranslatorStats()
+        self._in_flight: dict[str, asyncio.Future] = {}
+        self._batches: dict[tuple[str, str], _Batch] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    async def translate(self, from_language: str, to_language: str, text: str) -> str:
+        self.stats.requested += 1
+        key = translation_key(from_language, to_language, text)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.stats.cache_hits += 1
+            return cached
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self.stats.coalesced += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        self._enqueue((normalize_language(from_language), normalize_language(to_language)), key, text, future)
+        return await asyncio.shield(future)
+
+    def _enqueue(self, pair: tuple[str, str], key: str, text: str, future: asyncio.Future) -> None:
+        batch = self._batches.setdefault(pair, _Batch())
+        batch.items.append((key, text, future))
+        if len(batch.items) >= self.max_batch:
+            self._flush(pair)
+        elif batch.timer is None:
+            batch.timer = asyncio.get_running_loop().call_later(self.window, self._flush, pair)
+
+    def _flush(self, pair: tuple[str, str]) -> None:
+        batch = self._batches.pop(pair, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = asyncio.create_task(self._run_batch(pair, batch.items))
+        self._tasks.add(task)  # the loop only keeps weak references to tasks
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, pair: tuple[str, str], items: list[tuple[str, str, asyncio.Future]]) -> None:
+        try:
+            if len(items) == 1:
+                translations = [await self._translate_one(pair, items[0][1])]
+            else:
+                translations = await self._translate_many(pair, [text for _, text, _ in items])
+        except Exception as e:
+            for key, _, future in items:
+                self._in_flight.pop(key, None)
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (key, _, future), translation in zip(items, translations):
+            self.cache.set(key, translation)
+            self._in_flight.pop(key, None)
+            if not future.done():
+                future.set_result(translation)
+
+    async def _complete(self, messages: list[dict], **kwargs: Any) -> str:
+        self.stats.api_calls += 1
+        response = await self.client.chat.completions.create(model=self.model, messages=messages, **kwargs)
+        return response.choices[0].message.content or ""
+
+    async def _translate_one(self, pair: tuple[str, str], text: str) -> str:
+        from_language, to_language = pair
+        return await self._complete([
+            {"role": "system", "content": f"You are a translator. Translate from {from_language} to {to_language}."},
+            {"role": "user", "content": text},
+        ])
+
+    async def _translate_many(self, pair: tuple[str, str], texts: list[str]) -> list[str]:
+        from_language, to_language = pair
+        self.stats.batched_segments += len(texts)
+        content = await self._complete(
+            [
+                {
+                    "role": "system",
+                    "content": (
+                        f"You are a translator. Translate each segment from {from_language} to {to_language}. "
+                        'Answer with JSON {"translations": [...]}: one string per segment, same order, nothing else.'
+                    ),
+                },
+                {"role": "user", "content": json.dumps({"segments": texts}, ensure_ascii=False)},
+            ],
+            response_format={"type": "json_object"},
+        )
+        try:
+            translations = json.loads(content)["translations"]
+            if len(translations) == len(texts) and all(isinstance(t, str) for t in translations):
+                return translations
+        except (ValueError, KeyError, TypeError):
+            pass
+        self.stats.fallbacks += 1
+        return list(await asyncio.gather(*(self._translate_one(pair, text) for text in texts)))